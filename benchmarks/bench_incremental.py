@@ -0,0 +1,53 @@
+'''
+Benchmark re-reading a EDS file after a one-line change with IncrementalReader vs read_eds.
+
+Usage: python benchmarks/bench_incremental.py
+'''
+
+import os
+import sys
+from time import perf_counter
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from eds_utils.core.file_io.read_eds import read_eds
+from eds_utils.core.file_io.read_eds_incremental import IncrementalReader
+
+from bench_load import make_eds_text
+
+SIZES = [1000, 10000, 30000, 60000]
+
+
+def main():
+    print(f'{"indexes":>8} {"read_eds (s)":>13} {"first read (s)":>15} {"re-read (s)":>12}')
+
+    with TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            file_path = os.path.join(tmp_dir, f'bench_{size}.eds')
+            text = make_eds_text(size)
+            with open(file_path, 'w') as fptr:
+                fptr.write(text)
+
+            start = perf_counter()
+            read_eds(file_path)
+            full = perf_counter() - start
+
+            reader = IncrementalReader(file_path)
+            start = perf_counter()
+            reader.read()
+            first = perf_counter() - start
+
+            with open(file_path, 'w') as fptr:
+                fptr.write(text.replace('ParameterName=Variable 1000', 'ParameterName=Changed'))
+
+            start = perf_counter()
+            eds, _ = reader.read()
+            reread = perf_counter() - start
+
+            assert eds[0x1000].parameter_name == 'Changed'
+            print(f'{size:>8} {full:>13.3f} {first:>15.3f} {reread:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
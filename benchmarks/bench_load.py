@@ -0,0 +1,72 @@
+'''
+Benchmark how long read_eds takes to load EDS files with more and more indexes.
+
+The load time per index should stay flat (linear load time) as the number of indexes grows.
+
+Usage: python benchmarks/bench_load.py
+'''
+
+import os
+import sys
+from time import perf_counter
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from eds_utils.core.eds import EDS
+from eds_utils.core.file_io.read_eds import read_eds
+
+SIZES = [100, 1000, 10000, 30000, 60000]
+START_INDEX = 0x1000
+
+
+def make_eds_text(size: int) -> str:
+    '''Make the text of a EDS file with size indexes (VARs, except for empty PDO mappings).'''
+
+    lines = []
+    for i in range(START_INDEX, START_INDEX + size):
+        if EDS.RPDO_PARA_START <= i < EDS.RPDO_PARA_END \
+                or EDS.TPDO_PARA_START <= i < EDS.TPDO_PARA_END:
+            lines.append(f'[{i:X}]')
+            lines.append('ParameterName=PDO mapping parameter')
+            lines.append('ObjectType=0x09')
+            lines.append('SubNumber=1')
+            lines.append('')
+            lines.append(f'[{i:X}sub0]')
+            lines.append('ParameterName=Highest sub-index supported')
+            lines.append('DataType=0x0005')
+            lines.append('AccessType=const')
+            lines.append('DefaultValue=0x00')
+            lines.append('')
+            continue
+
+        lines.append(f'[{i:X}]')
+        lines.append(f'ParameterName=Variable {i:X}')
+        lines.append('ObjectType=0x07')
+        lines.append('DataType=0x0007')
+        lines.append('AccessType=rw')
+        lines.append('DefaultValue=0')
+        lines.append('')
+
+    return '\n'.join(lines)
+
+
+def main():
+    print(f'{"indexes":>8} {"load (s)":>10} {"per index (us)":>15}')
+
+    with TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            file_path = os.path.join(tmp_dir, f'bench_{size}.eds')
+            with open(file_path, 'w') as fptr:
+                fptr.write(make_eds_text(size))
+
+            start = perf_counter()
+            eds, _ = read_eds(file_path)
+            elapsed = perf_counter() - start
+
+            assert len(eds) == size
+            print(f'{size:>8} {elapsed:>10.3f} {elapsed / size * 1e6:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
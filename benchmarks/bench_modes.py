@@ -0,0 +1,50 @@
+'''
+Benchmark how long read_eds takes to load EDS files in each read mode (raw, fix, and validate).
+
+Usage: python benchmarks/bench_modes.py
+'''
+
+import os
+import sys
+from time import perf_counter
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from eds_utils.core.file_io.read_eds import ReadMode, read_eds
+
+from bench_load import make_eds_text
+
+SIZES = [1000, 10000, 30000, 60000]
+REPEAT = 3
+
+
+def main():
+    columns = ''.join(f' {i.value + " (s)":>14}' for i in ReadMode)
+    print(f'{"indexes":>8}{columns} {"raw speedup":>12}')
+
+    with TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            file_path = os.path.join(tmp_dir, f'bench_{size}.eds')
+            with open(file_path, 'w') as fptr:
+                fptr.write(make_eds_text(size))
+
+            times = {}
+            for mode in ReadMode:
+                best = None
+                for _ in range(REPEAT):
+                    start = perf_counter()
+                    eds, _ = read_eds(file_path, mode=mode)
+                    elapsed = perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+
+                assert len(eds) == size
+                times[mode] = best
+
+            speedup = times[ReadMode.FIX] / times[ReadMode.RAW]
+            columns = ''.join(f' {times[i]:>14.3f}' for i in ReadMode)
+            print(f'{size:>8}{columns} {speedup:>11.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+'''
+Benchmark pickling a EDS (e.g. to send it to worker processes) with its compact pickle vs the
+default pickling of the whole object graph (every object and its slots).
+
+Usage: python benchmarks/bench_pickle.py
+'''
+
+import copyreg
+import io
+import os
+import pickle
+import sys
+from time import perf_counter
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from eds_utils.core.eds import EDS
+from eds_utils.core.objects import Variable, Record, Array
+from eds_utils.core.file_io.read_eds import read_eds
+
+from bench_load import make_eds_text
+
+SIZES = [1000, 10000, 30000, 60000]
+REPEAT = 3
+_SKIP_SLOTS = ('_owner', '_key', '_values')
+
+
+def _default_reduce(obj):
+    '''Reduce a object like pickle does for a class with slots and no pickle methods.'''
+
+    slots = {}
+    for cls in obj.__class__.__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if name not in _SKIP_SLOTS and hasattr(obj, name):
+                slots[name] = getattr(obj, name)
+
+    return _default_new, (obj._BASE, slots)
+
+
+def _default_new(cls, slots: dict):
+    '''Unpickle a object like pickle does for a class with slots and no pickle methods.'''
+
+    obj = cls.__new__(cls)
+    for name in _SKIP_SLOTS:
+        if hasattr(cls, name):
+            object.__setattr__(obj, name, None)
+    for name, value in slots.items():
+        object.__setattr__(obj, name, value)
+
+    return obj
+
+
+def _default_dumps(eds: EDS) -> bytes:
+    '''Pickle a EDS as its __dict__ with every object pickled by _default_reduce.'''
+
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[EDS] = lambda obj: (copyreg.__newobj__, (EDS,), obj.__getstate__())
+    for cls in (Variable, Record, Array):
+        dispatch_table[cls] = dispatch_table[cls._OWNED] = _default_reduce
+
+    file = io.BytesIO()
+    pickler = pickle.Pickler(file, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = dispatch_table
+    pickler.dump(eds)
+    return file.getvalue()
+
+
+def _time(func, *args) -> tuple:
+    '''Get the result of the func and its best time of REPEAT runs.'''
+
+    best = None
+    for _ in range(REPEAT):
+        start = perf_counter()
+        result = func(*args)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return result, best
+
+
+def main():
+    print(f'{"indexes":>8} {"default (KiB)":>14} {"dumps (s)":>10} {"loads (s)":>10} '
+          f'{"compact (KiB)":>14} {"dumps (s)":>10} {"loads (s)":>10}')
+
+    with TemporaryDirectory() as tmp_dir:
+        for size in SIZES:
+            file_path = os.path.join(tmp_dir, f'bench_{size}.eds')
+            with open(file_path, 'w') as fptr:
+                fptr.write(make_eds_text(size))
+            eds, _ = read_eds(file_path)
+
+            default, default_dumps = _time(_default_dumps, eds)
+            copy, default_loads = _time(pickle.loads, default)
+            assert copy == eds
+
+            compact, compact_dumps = _time(pickle.dumps, eds, pickle.HIGHEST_PROTOCOL)
+            copy, compact_loads = _time(pickle.loads, compact)
+            assert copy == eds
+
+            print(f'{size:>8} {len(default) / 1024:>14.0f} {default_dumps:>10.3f} '
+                  f'{default_loads:>10.3f} {len(compact) / 1024:>14.0f} {compact_dumps:>10.3f} '
+                  f'{compact_loads:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
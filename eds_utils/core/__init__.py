@@ -138,15 +138,18 @@ TPDO_TRANSMISSION_TYPES.append('Event-Driven (Manufacture)')
 TPDO_TRANSMISSION_TYPES.append('Event-Driven (Device / App)')
 '''All valid TPDO transmission types'''
 
+_PDO_MAPPING_VALUE = re.compile(r'^0x[\da-fA-F]{8}$')
 
-def pdo_mapping_fields(value: str) -> (int, int, int):
+
+def pdo_mapping_fields(value) -> (int, int, int):
     '''
     Pull out the values from a PDO mapping value.
 
     Parameters
     ----------
-    value: str
-        The PDO mapping value
+    value: str or int
+        The PDO mapping value, either the string from the EDS/DCF or the typed value of the
+        variable (`Variable.value`).
 
     Returns
     -------
@@ -158,11 +161,11 @@ def pdo_mapping_fields(value: str) -> (int, int, int):
         Mapped object size in bits
     '''
 
-    if not re.match(r'^0x[\da-zA-Z]{8}$', value):
+    if isinstance(value, str):
+        if not _PDO_MAPPING_VALUE.match(value):
+            raise ValueError(f'Invalid pdo mapping value {value}')
+        value = int(value, 16)
+    elif not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= 0xFFFFFFFF:
         raise ValueError(f'Invalid pdo mapping value {value}')
 
-    index = str2int(value[:6])
-    subindex = str2int(f'0x{value[6:8]}')
-    size = str2int(f'0x{value[8:]}')
-
-    return index, subindex, size
+    return value >> 16, (value >> 8) & 0xFF, value & 0xFF
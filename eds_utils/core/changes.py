@@ -0,0 +1,60 @@
+'''Change events for the objects in a EDS, see `EDS.subscribe` and `EDS.checkpoint`'''
+
+from enum import Enum, auto
+
+
+class ChangeType(Enum):
+    INSERT = auto()
+    '''A object or subindex was added'''
+    REMOVE = auto()
+    '''A object or subindex was removed'''
+    SET = auto()
+    '''A field of a object or subindex was set'''
+    MOVE = auto()
+    '''A object or subindex was moved'''
+
+
+class Change:
+    '''A change to a EDS's object dictionary.'''
+
+    __slots__ = ('type', 'index', 'subindex', 'field', 'old', 'new')
+
+    def __init__(self, type: ChangeType, index: int, subindex: int = None, field: str = None,
+                 old=None, new=None):
+        '''
+        Parameters
+        ----------
+        type: ChangeType
+            The type of change.
+        index: int
+            The index of the changed object, for a MOVE where it was moved to.
+        subindex: int
+            The subindex of the changed object, None if the change is to a object itself. For a
+            MOVE where it was moved to.
+        field: str
+            The field that was set, for a SET.
+        old:
+            The old value for a SET, the removed object for a REMOVE, or the (index, subindex)
+            the object was moved from for a MOVE.
+        new:
+            The new value for a SET or the added/moved object for a INSERT/MOVE.
+        '''
+
+        self.type = type
+        self.index = index
+        self.subindex = subindex
+        self.field = field
+        self.old = old
+        self.new = new
+
+    def __repr__(self) -> str:
+        subindex = '' if self.subindex is None else f'sub{self.subindex:02X}'
+        field = '' if self.field is None else f'.{self.field}'
+        return f'<Change {self.type.name} {self.index:04X}{subindex}{field}>'
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Change):
+            return NotImplemented
+
+        return (self.type, self.index, self.subindex, self.field, self.old, self.new) == \
+            (other.type, other.index, other.subindex, other.field, other.old, other.new)
@@ -0,0 +1,517 @@
+'''A columnar (struct-of-arrays) object dictionary, for fast whole-OD queries'''
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional, queries fall back to scanning the columns in python
+    np = None
+
+from . import DataType, AccessType, ObjectType
+from .eds import EDS, FileInfo, DeviceInfo, DeviceCommissioning
+from .objects import Variable, Record, Array
+
+_ENUMS = {
+    'object_type': ObjectType,
+    'data_type': DataType,
+    'access_type': AccessType,
+}
+'''Enum columns and their enum, stored as the enum's value'''
+
+_STRINGS = ['comments', 'parameter_name', 'denotation', 'low_limit', 'high_limit',
+            'default_value', 'storage_location']
+'''String columns, stored as the id of the string in the string table'''
+
+_TYPECODES = {
+    'index': 'H',
+    'subindex': 'h',  # -1 for the row of a record or array itself
+    'object_type': 'B',
+    'data_type': 'B',  # 0 for a record or a array without a data type
+    'access_type': 'B',
+    'pdo_mapping': 'B',
+}
+_TYPECODES.update({i: 'I' for i in _STRINGS})
+
+_FIELDS = ['comments', 'parameter_name', 'denotation', 'data_type', 'low_limit', 'high_limit',
+           'default_value', 'access_type', 'pdo_mapping', 'object_type', 'storage_location']
+'''All the attributes of a Variable, in order'''
+
+
+class StringTable:
+    '''Interned strings, each unique string is only stored once and is referenced by its id.'''
+
+    def __init__(self):
+
+        self._strings = []
+        self._ids = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self._strings[string_id]
+
+    def add(self, string: str) -> int:
+        '''Add a string to the table, if it is not already in it, and get its id.'''
+
+        string_id = self._ids.get(string)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(string)
+            self._ids[string] = string_id
+
+        return string_id
+
+    def get_id(self, string: str) -> int:
+        '''Get the id of a string, or None if it is not in the table.'''
+
+        return self._ids.get(string)
+
+
+class _Column:
+    '''A attribute of a `VariableView` that is stored in a column of its `ColumnarEDS`.'''
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+
+        return view._eds._get(self.name, view._row)
+
+    def __set__(self, view, value):
+        view._eds._set(self.name, view._row, value)
+
+
+class VariableView:
+    '''
+    A lightweight view of a row of a `ColumnarEDS` with the same attributes as a `Variable`.
+
+    Setting a attribute changes the row.
+    '''
+
+    __slots__ = ('_eds', '_row')
+
+    comments = _Column()
+    parameter_name = _Column()
+    denotation = _Column()
+    data_type = _Column()
+    low_limit = _Column()
+    high_limit = _Column()
+    default_value = _Column()
+    access_type = _Column()
+    pdo_mapping = _Column()
+    object_type = _Column()
+    storage_location = _Column()
+
+    def __init__(self, eds, row: int):
+        '''
+        Parameters
+        ----------
+        eds: ColumnarEDS
+            The columnar eds the row is in.
+        row: int
+            The row.
+        '''
+
+        self._eds = eds
+        self._row = row
+
+    @property
+    def index(self) -> int:
+        '''int: The index of the row'''
+
+        return self._eds._columns['index'][self._row]
+
+    @property
+    def subindex(self) -> int:
+        '''int: The subindex of the row, None for a VAR or the row of a record or array'''
+
+        subindex = self._eds._columns['subindex'][self._row]
+        return None if subindex < 0 else subindex
+
+    def to_variable(self) -> Variable:
+        '''Make a `Variable` with a copy of the row.'''
+
+        return Variable(**{i: getattr(self, i) for i in _FIELDS})
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Variable, VariableView)):
+            return NotImplemented
+
+        return all(getattr(self, i) == getattr(other, i) for i in _FIELDS)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(0x{self.index:04X}, {self.subindex})'
+
+
+class ColumnarEDS:
+    '''
+    A EDS with the object dictionary stored as parallel typed arrays (columns), with one row for
+    every object and subindex, and all strings in a interned `StringTable`.
+
+    A row takes ~40 bytes (plus its unique strings) instead of a object per variable and queries
+    over the whole OD (e.g. all PDO mappable UNSIGNED16 objects) are scans over the columns,
+    vectorized with numpy if it is installed.
+
+    Records and arrays have a row for the object itself (with a subindex of -1) and a row for
+    each subindex. Variables only have the row for the object itself.
+    '''
+
+    def __init__(self):
+
+        # the rows are sorted by index and subindex, so a row can be found with a binary search
+        self._columns = {name: array(typecode) for name, typecode in _TYPECODES.items()}
+        self.strings = StringTable()
+        self.file_info = FileInfo()
+        self.device_info = DeviceInfo()
+        self.device_commissioning = DeviceCommissioning()
+        self.comment = ''
+        self.canopennode = False
+        self.storage_locations = []
+
+    @classmethod
+    def from_eds(cls, eds: EDS):
+        '''
+        Make a columnar copy of a EDS.
+
+        Parameters
+        ----------
+        eds: EDS
+            The eds to copy.
+        '''
+
+        ceds = cls()
+        ceds.file_info = eds.file_info
+        ceds.device_info = eds.device_info
+        ceds.device_commissioning = eds.device_commissioning
+        ceds.comment = eds.comment
+        ceds.canopennode = eds.canopennode
+        ceds.storage_locations = list(eds.storage_locations)
+
+        for index in eds.indexes:  # the OD is sorted, so the rows will be too
+            obj = eds[index]
+            ceds._add_row(index, -1, obj)
+            if not isinstance(obj, Variable):
+                for subindex in obj.subindexes:
+                    ceds._add_row(index, subindex, obj[subindex])
+
+        return ceds
+
+    def to_eds(self) -> EDS:
+        '''Make a `EDS` with a copy of the OD.'''
+
+        eds = EDS()
+        eds.file_info = self.file_info
+        eds.device_info = self.device_info
+        eds.device_commissioning = self.device_commissioning
+        eds.comment = self.comment
+        eds.canopennode = self.canopennode
+        for i in self.storage_locations:
+            eds.add_storage_location(i)
+
+        objects = {}
+        for row, subindex in enumerate(self._columns['subindex']):
+            view = VariableView(self, row)
+
+            if subindex >= 0:
+                objects[view.index][subindex] = view.to_variable()
+            elif view.object_type == ObjectType.VAR:
+                objects[view.index] = view.to_variable()
+            else:
+                if view.object_type == ObjectType.ARRAY:
+                    obj = Array(view.parameter_name, self._get('data_type', row))
+                else:
+                    obj = Record(view.parameter_name)
+                obj.denotation = view.denotation
+                obj.comments = view.comments
+                obj.storage_location = view.storage_location
+                objects[view.index] = obj
+
+        eds.add_objects(objects)
+
+        return eds
+
+    def _add_row(self, index: int, subindex: int, obj):
+        '''Add a row for a object or a subindex.'''
+
+        columns = self._columns
+
+        columns['index'].append(index)
+        columns['subindex'].append(subindex)
+        columns['object_type'].append(obj.object_type.value)
+        for i in _STRINGS:
+            columns[i].append(self.strings.add(getattr(obj, i, '')))
+
+        if isinstance(obj, Variable):
+            columns['data_type'].append(obj.data_type.value)
+            columns['access_type'].append(obj.access_type.value)
+            columns['pdo_mapping'].append(obj.pdo_mapping)
+        else:
+            data_type = obj.data_type if isinstance(obj, Array) else None
+            columns['data_type'].append(0 if data_type is None else data_type.value)
+            columns['access_type'].append(AccessType.RO.value)
+            columns['pdo_mapping'].append(False)
+
+    def _get(self, name: str, row: int):
+        '''Get the value of a column in a row.'''
+
+        value = self._columns[name][row]
+
+        if name in _ENUMS:
+            return None if value == 0 else _ENUMS[name](value)
+        if name in _STRINGS:
+            return self.strings[value]
+        if name == 'pdo_mapping':
+            return bool(value)
+
+        return value
+
+    def _set(self, name: str, row: int, value):
+        '''Set the value of a column in a row.'''
+
+        self._columns[name][row] = self._encode(name, value)
+
+    def _encode(self, name: str, value) -> int:
+        '''Encode a value as it is stored in a column.'''
+
+        if name in _ENUMS:
+            return 0 if value is None else value.value
+        if name in _STRINGS:
+            return self.strings.add(value)
+
+        return int(value)
+
+    def __len__(self) -> int:
+        return sum(1 for i in self._columns['subindex'] if i < 0)
+
+    def __contains__(self, index: int) -> bool:
+        return self._find(index, -1) is not None
+
+    def _find(self, index: int, subindex: int) -> int:
+        '''Find the row of a object (a subindex of -1) or subindex, or None if there is none.'''
+
+        indexes = self._columns['index']
+        subindexes = self._columns['subindex']
+
+        lo = bisect_left(indexes, index)
+        hi = bisect_left(indexes, index + 1, lo)
+        row = bisect_left(subindexes, subindex, lo, hi)
+
+        return row if row < hi and subindexes[row] == subindex else None
+
+    @property
+    def rows(self) -> int:
+        '''int: The number of rows (objects and subindexes)'''
+
+        return len(self._columns['index'])
+
+    def column(self, name: str) -> array:
+        '''
+        Get a column as is, e.g. to make numpy array from it. Do not modify it.
+
+        Parameters
+        ----------
+        name: str
+            The name of column ("index", "subindex", "pdo_mapping", or the name of a enum or
+            string attribute of a `Variable`).
+        '''
+
+        return self._columns[name]
+
+    def view(self, index: int, subindex: int = None) -> VariableView:
+        '''
+        Get a view of the row of a object or subindex.
+
+        Parameters
+        ----------
+        index: int
+            The index of the object.
+        subindex: int
+            The subindex, None for a VAR or the record or array itself.
+
+        Raises
+        ------
+        KeyError:
+            There is no object at the index or subindex.
+        '''
+
+        row = self._find(index, -1 if subindex is None else subindex)
+        if row is None:
+            raise KeyError((index, subindex))
+
+        return VariableView(self, row)
+
+    @property
+    def indexes(self) -> List[int]:
+        '''The list of indexes in the OD'''
+
+        return self.select(subindex=None)
+
+    def subindexes(self, index: int) -> List[int]:
+        '''Get the list of subindexes of a record or array.'''
+
+        row = self._find(index, -1)
+        if row is None:
+            raise KeyError(index)
+
+        row += 1
+        end = bisect_left(self._columns['index'], index + 1, row)
+
+        return self._columns['subindex'][row:end].tolist()
+
+    def _range(self, start: int = None, stop: int = None) -> Tuple[int, int]:
+        '''Get the range of rows with a index in [start, stop).'''
+
+        lo = 0 if start is None else bisect_left(self._columns['index'], start)
+        hi = self.rows if stop is None else bisect_left(self._columns['index'], stop, lo)
+
+        return lo, hi
+
+    def _conditions(self, conditions: Dict[str, object]) -> List[Tuple[str, int]]:
+        '''Encode query conditions as the column values to match, or None if a string in them
+        is not in any row.'''
+
+        encoded = []
+        for name, value in conditions.items():
+            if name not in self._columns:
+                raise ValueError(f'unknown column {name}')
+            if name == 'subindex':
+                value = -1 if value is None else value
+            elif name in _STRINGS:
+                value = self.strings.get_id(value)
+                if value is None:
+                    return None
+            else:
+                value = self._encode(name, value)
+            encoded.append((name, value))
+
+        return encoded
+
+    def mask(self, start: int = None, stop: int = None, **conditions):
+        '''
+        Get a numpy boolean mask of the rows that match all the conditions. Requires numpy.
+
+        Parameters
+        ----------
+        start: int
+            Optional first index to match.
+        stop: int
+            Optional index to stop matching at (not included).
+        conditions:
+            Column name and the value to match, e.g. `data_type=DataType.UNSIGNED16`. A subindex
+            of None matches the rows of the objects themselves.
+
+        Returns
+        -------
+        numpy.ndarray:
+            The boolean mask, one item per row.
+        '''
+
+        if np is None:
+            raise ImportError('numpy is required for masks')
+
+        mask = np.zeros(self.rows, dtype=bool)
+        encoded = self._conditions(conditions)
+        if encoded is None or not self.rows:
+            return mask
+
+        lo, hi = self._range(start, stop)
+        mask[lo:hi] = True
+
+        for name, value in encoded:
+            column = self._columns[name]
+            mask &= np.frombuffer(column, dtype=memoryview(column).format) == value
+
+        return mask
+
+    def _matches(self, start: int = None, stop: int = None, **conditions) -> List[int]:
+        '''Get the rows that match all the conditions, see `mask`.'''
+
+        if np is not None:
+            return np.flatnonzero(self.mask(start, stop, **conditions)).tolist()
+
+        encoded = self._conditions(conditions)
+        if encoded is None:
+            return []
+
+        rows = range(*self._range(start, stop))
+        for name, value in encoded:
+            column = self._columns[name]
+            rows = [i for i in rows if column[i] == value]
+
+        return list(rows)
+
+    def select(self, start: int = None, stop: int = None, **conditions) -> list:
+        '''
+        Find the objects or subindexes that match all the conditions.
+
+        Parameters
+        ----------
+        start: int
+            Optional first index to match.
+        stop: int
+            Optional index to stop matching at (not included).
+        conditions:
+            Column name and the value to match, e.g. `data_type=DataType.UNSIGNED16`. A subindex
+            of None matches the rows of the objects themselves.
+
+        Returns
+        -------
+        list:
+            The indexes if the subindex condition is None, otherwise (index, subindex) tuples
+            (with a subindex of None for the rows of the objects themselves).
+        '''
+
+        rows = self._matches(start, stop, **conditions)
+        index = self._columns['index']
+
+        if 'subindex' in conditions and conditions['subindex'] is None:
+            return [index[i] for i in rows]
+
+        subindex = self._columns['subindex']
+        return [(index[i], None if subindex[i] < 0 else subindex[i]) for i in rows]
+
+    def count(self, start: int = None, stop: int = None, **conditions) -> int:
+        '''Count the rows that match all the conditions, see `select`.'''
+
+        if np is not None:
+            return int(np.count_nonzero(self.mask(start, stop, **conditions)))
+
+        return len(self._matches(start, stop, **conditions))
+
+    @property
+    def rpdos(self) -> int:
+        '''int: The number of RPDOs'''
+
+        return self.count(EDS.RPDO_COMM_START, EDS.RPDO_PARA_START, subindex=None)
+
+    @property
+    def tpdos(self) -> int:
+        '''int: The number of TPDOs'''
+
+        return self.count(EDS.TPDO_COMM_START, EDS.TPDO_PARA_START, subindex=None)
+
+    @property
+    def mandatory_objects(self) -> List[int]:
+        '''The list of mandatory objects indexes in the OD'''
+
+        return [i for i in EDS.MANDATORY_OBJECTS if i in self]
+
+    @property
+    def optional_objects(self) -> List[int]:
+        '''The list of optional objects indexes in the OD'''
+
+        objects = self.select(0x1000, 0x2000, subindex=None)
+
+        return [i for i in objects if i not in EDS.MANDATORY_OBJECTS] + \
+            self.select(0x6000, subindex=None)
+
+    @property
+    def manufacturer_objects(self) -> List[int]:
+        '''The list of manufacturer objects indexes in the OD'''
+
+        return self.select(0x2000, 0x6000, subindex=None)
@@ -0,0 +1,302 @@
+'''A DCF as the per-node overrides of a shared base EDS'''
+
+from copy import deepcopy
+from typing import Dict, List, Tuple
+
+from .eds import EDS, FileInfo, DeviceInfo, DeviceCommissioning
+from .objects import Variable
+
+_RECORD_FIELDS = ('parameter_name', 'denotation', 'comments', 'storage_location')
+'''The fields of a record or array that can be overridden'''
+
+
+class DCFOverlay:
+    '''
+    A DCF stored as a reference to a base EDS and only the values that differ from it (e.g.
+    the denotations and a few default values), plus its own file info, device info, device
+    commissioning, comment, CANopenNode flag, and storage locations.
+
+    Many DCFs (e.g. a whole fleet of nodes made from a handful of EDSs) can share one base,
+    so memory use and comparisons cost O(overrides) per DCF instead of O(objects). The base is
+    never changed by a overlay and must not be changed while overlays use it (a snapshot of a
+    EDS, see `EDS.snapshot`, is a good base).
+
+    The objects can not be added, removed, or moved in a overlay.
+    '''
+
+    def __init__(self, base, file_info: FileInfo = None,
+                 device_commissioning: DeviceCommissioning = None, device_info: DeviceInfo = None,
+                 comment: str = None):
+        '''
+        Parameters
+        ----------
+        base: EDS or EDSSnapshot
+            The base EDS.
+        file_info: FileInfo
+            The DCF's file info, defaults to a copy of the base's file info.
+        device_commissioning: DeviceCommissioning
+            The DCF's device commissioning, defaults to the default device commissioning.
+        device_info: DeviceInfo
+            The DCF's device info, defaults to a copy of the base's device info.
+        comment: str
+            The DCF's comment, defaults to the base's comment.
+        '''
+
+        self.base = base
+        self.file_info = deepcopy(base.file_info) if file_info is None else file_info
+        self.device_commissioning = DeviceCommissioning() if device_commissioning is None \
+            else device_commissioning
+        self.device_info = deepcopy(base.device_info) if device_info is None else device_info
+        self.comment = base.comment if comment is None else comment
+        self.canopennode = base.canopennode
+        self.storage_locations = list(base.storage_locations)
+        self._overrides = {}  # (index, subindex): {field: value}
+        self._merged = {}  # index: copy of the base object with its overrides, see __getitem__
+
+    @classmethod
+    def from_eds(cls, base, eds: EDS):
+        '''
+        Make a overlay from a full EDS/DCF that only differs from the base in field values.
+
+        Paramters
+        ---------
+        base: EDS or EDSSnapshot
+            The base EDS.
+        eds: EDS
+            The full EDS/DCF, e.g. from `read_eds`.
+
+        Raises
+        ------
+        ValueError
+            The EDS has objects or subindexes that the base does not have or the other way
+            around, or a object is a different type.
+
+        Returns
+        -------
+        DCFOverlay
+            The overlay.
+        '''
+
+        if eds.indexes != base.indexes:
+            raise ValueError('the objects in the EDS do not match the objects in the base')
+
+        dcf = cls(base, deepcopy(eds.file_info), deepcopy(eds.device_commissioning),
+                  deepcopy(eds.device_info), eds.comment)
+        dcf.canopennode = eds.canopennode
+        dcf.storage_locations = list(eds.storage_locations)
+
+        for index in eds.indexes:
+            obj = eds[index]
+            base_obj = base[index]
+            if obj._BASE is not base_obj._BASE:
+                raise ValueError(f'object at 0x{index:X} is not a {base_obj._BASE.__name__}')
+
+            if isinstance(obj, Variable):
+                dcf._diff_variable(index, None, base_obj, obj)
+                continue
+
+            if obj.subindexes != base_obj.subindexes:
+                raise ValueError(f'the subindexes of 0x{index:X} do not match the base')
+
+            fields = {i: getattr(obj, i) for i in _RECORD_FIELDS
+                      if getattr(obj, i) != getattr(base_obj, i)}
+            if fields:
+                dcf._overrides[(index, None)] = fields
+
+            for subindex in obj.subindexes:
+                dcf._diff_variable(index, subindex, base_obj[subindex], obj[subindex])
+
+        return dcf
+
+    def _diff_variable(self, index: int, subindex: int, base: Variable, variable: Variable):
+        '''Add the fields of a variable that differ from the base variable as overrides.'''
+
+        values = variable._fields()
+        base_values = base._fields()
+        if values == base_values:
+            return
+
+        self._overrides[(index, subindex)] = {
+            name: value for name, value, base_value in zip(Variable._FIELDS, values, base_values)
+            if value != base_value
+        }
+
+    def _base_object(self, index: int, subindex: int = None):
+        obj = self.base[index]
+        return obj if subindex is None else obj[subindex]
+
+    def get(self, index: int, subindex: int, field: str):
+        '''
+        Get the value of a field of a object or subindex.
+
+        Paramters
+        ---------
+        index: int
+            The index of the object.
+        subindex: int
+            The subindex or None for the object itself.
+        field: str
+            The field, e.g. "default_value".
+
+        Returns
+        -------
+            The overridden value or the base value.
+        '''
+
+        fields = self._overrides.get((index, subindex))
+        if fields is not None and field in fields:
+            return fields[field]
+
+        return getattr(self._base_object(index, subindex), field)
+
+    def set(self, index: int, subindex: int, field: str, value):
+        '''
+        Override the value of a field of a object or subindex, setting it to the base value
+        removes the override.
+
+        Paramters
+        ---------
+        index: int
+            The index of the object.
+        subindex: int
+            The subindex or None for the object itself.
+        field: str
+            The field, e.g. "default_value".
+        value:
+            The new value.
+
+        Raises
+        ------
+        KeyError
+            There is no object or subindex at the index / subindex in the base.
+        ValueError
+            The field is not a field that can be overridden.
+        '''
+
+        base = self._base_object(index, subindex)
+        if field not in (Variable._FIELDS if isinstance(base, Variable) else _RECORD_FIELDS):
+            raise ValueError(f'cannot override {field} of a {base._BASE.__name__}')
+
+        key = (index, subindex)
+        fields = self._overrides.setdefault(key, {})
+        if value == getattr(base, field):
+            fields.pop(field, None)
+        else:
+            fields[field] = value
+        if not fields:
+            del self._overrides[key]
+
+        self._merged.pop(index, None)
+
+    @property
+    def overrides(self) -> Dict[Tuple[int, int], dict]:
+        '''dict: (index, subindex): {field: value} of all the overrides (a copy)'''
+
+        return {key: dict(fields) for key, fields in self._overrides.items()}
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self.base
+
+    @property
+    def indexes(self) -> List[int]:
+        '''The list of indexes in the OD'''
+
+        return self.base.indexes
+
+    def __getitem__(self, index: int):
+        '''
+        Get a object with its overrides, the base object if it has none. The object must not be
+        changed, use set().
+        '''
+
+        if index in self._merged:
+            return self._merged[index]
+
+        keys = [key for key in self._overrides if key[0] == index] if self._overrides else []
+        if not keys:
+            return self.base[index]
+
+        obj = deepcopy(self.base[index])
+        for key in keys:
+            target = obj if key[1] is None else obj[key[1]]
+            for field, value in self._overrides[key].items():
+                setattr(target, field, value)
+        self._merged[index] = obj
+
+        return obj
+
+    def to_eds(self) -> EDS:
+        '''
+        Get the full DCF as a EDS, e.g. to write it or to edit its objects.
+
+        Returns
+        -------
+        EDS
+            A new EDS with copies of the base objects and the overrides.
+        '''
+
+        base = self.base
+        overridden = {i for i, _ in self._overrides}
+        eds = EDS.from_objects((i, deepcopy(self[i] if i in overridden else base[i]))
+                               for i in base.indexes)
+        eds.file_info = deepcopy(self.file_info)
+        eds.device_info = deepcopy(self.device_info)
+        eds.device_commissioning = deepcopy(self.device_commissioning)
+        eds.comment = self.comment
+        eds.canopennode = self.canopennode
+        for i in self.storage_locations:
+            eds.add_storage_location(i)
+
+        return eds
+
+    def diff(self, other) -> List[Tuple[int, int, str]]:
+        '''
+        Get the fields that differ between two overlays of the same base, costs
+        O(overrides).
+
+        Paramters
+        ---------
+        other: DCFOverlay
+            The other overlay.
+
+        Raises
+        ------
+        ValueError
+            The overlays do not have the same base.
+
+        Returns
+        -------
+        List[Tuple[int, int, str]]
+            The sorted list of (index, subindex, field) that differ, with a subindex of None
+            for the objects themselves. The file info, device info, device commissioning,
+            comment, and storage locations are not included.
+        '''
+
+        if other.base is not self.base:
+            raise ValueError('the overlays do not have the same base')
+
+        fields = set()
+        for overrides in (self._overrides, other._overrides):
+            for (index, subindex), values in overrides.items():
+                fields.update((index, subindex, i) for i in values)
+
+        return sorted((i for i in fields if self.get(*i) != other.get(*i)),
+                      key=lambda i: (i[0], -1 if i[1] is None else i[1], i[2]))
+
+    def _header(self) -> tuple:
+        return (self.file_info, self.device_info, self.device_commissioning, self.comment,
+                self.canopennode, self.storage_locations)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DCFOverlay):
+            return NotImplemented
+
+        if self._header() != other._header():
+            return False
+        if other.base is self.base:
+            return not self.diff(other)
+
+        return self.to_eds() == other.to_eds()
@@ -0,0 +1,149 @@
+'''Structured diagnostics for problems found in eds/dcf files'''
+
+from enum import IntEnum
+
+
+class Severity(IntEnum):
+    INFO = 10
+    AUTO_FIXED = 20
+    ERROR = 30
+
+    @staticmethod
+    def from_str(value: str):
+        return Severity[value.upper().replace('-', '_')]
+
+    def to_str(self):
+        return self.name.replace('_', '-')
+
+
+MESSAGES = {
+    'missing-entry': '{key} was missing from {section}',
+    'misformatted-entry': '{key} was incorrectly formatted in {section}',
+    'missing-entries': '{key} or {other_key} was missing from {section}',
+    'misformatted-entries': '{key} or {other_key} was incorrectly formatted in {section}',
+    'invalid-value': '{key} value of {value} is invalid in {section}',
+    'invalid-baud-rate': '{key} in {section} was not a valid CANopen baud rate',
+    'unknown-entry': 'Unknown entry "{key}" in {section}',
+    'unknown-header': 'Unknown header: {section}',
+    'duplicate-header': 'Duplicate header: {section}, dropping it',
+    'orphan-subindex': '{section} has no matching index, dropping it',
+    'subindex-0-data-type': 'subindex 0 for {section} was not a UNSIGNED8',
+    'storage-location-mismatch': 'StorageLocation of [{index:X}] and {section} did not match',
+    'missing-section': 'Section {section} was missing',
+    'missing-from-list': '0x{index:X} was missing from {section}',
+    'missing-from-od': '0x{index:X} was in {section}, but does not exist',
+    'pdo-mapping-misformatted': '{pdo} mapping value at subindex 0x{subindex:02X} was '
+                                'misformatted, replacing {value} with 0x00000000',
+    'pdo-mapping-size': '{pdo} mapping value at subindex 0x{subindex:02X} had the wrong mapped '
+                        'object size: {value} -> {new_value}',
+    'pdo-mapping-missing-object': '{pdo} mapping value at subindex 0x{subindex:02X} maps '
+                                  '{value}, which does not exist',
+}
+'''Message templates for all diagnostic codes'''
+
+
+class Diagnostic:
+    '''
+    A problem found in a EDS/DCF file.
+
+    The message is only rendered from its template when it is asked for.
+    '''
+
+    __slots__ = ('code', 'severity', 'section', 'key', 'line', 'column', 'args')
+
+    def __init__(self, code: str, severity: Severity, section: str = '', key: str = '',
+                 line: int = 0, column: int = 0, **args):
+        '''
+        Parameters
+        ----------
+        code: str
+            The diagnostic code, a key of `MESSAGES`.
+        severity: Severity
+            The severity of the diagnostic.
+        section: str
+            The section header (e.g. '[1000]') the diagnostic is for, if any.
+        key: str
+            The entry in the section the diagnostic is for, if any.
+        line: int
+            The line number in the file (starting at 1), 0 if unknown.
+        column: int
+            The column in the line (starting at 1), 0 if unknown.
+        args:
+            Extra values for the message template.
+        '''
+
+        self.code = code
+        self.severity = severity
+        self.section = section
+        self.key = key
+        self.line = line
+        self.column = column
+        self.args = args
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Diagnostic):
+            return str(self) == other
+
+        return self.code == other.code \
+            and self.severity == other.severity \
+            and self.section == other.section \
+            and self.key == other.key \
+            and self.line == other.line \
+            and self.column == other.column \
+            and self.args == other.args
+
+    def __repr__(self) -> str:
+        return f'Diagnostic({self.code!r}, {self.severity.to_str()}, line={self.line}, ' \
+               f'message={self.message!r})'
+
+    def __str__(self) -> str:
+        return f'{self.severity.to_str()}: {self.message}'
+
+    def __getstate__(self):
+        return (self.code, int(self.severity), self.section, self.key, self.line, self.column,
+                self.args)
+
+    def __setstate__(self, state):
+        self.code, severity, self.section, self.key, self.line, self.column, self.args = state
+        self.severity = Severity(severity)
+
+    @property
+    def message(self) -> str:
+        '''str: The rendered message.'''
+
+        return MESSAGES[self.code].format(section=self.section, key=self.key, **self.args)
+
+    def to_dict(self) -> dict:
+        '''Get the diagnostic as a JSON serializable dictionary.'''
+
+        return {
+            'code': self.code,
+            'severity': self.severity.to_str(),
+            'section': self.section,
+            'key': self.key,
+            'line': self.line,
+            'column': self.column,
+            'message': self.message,
+        }
+
+
+class Diagnostics(list):
+    '''A list of `Diagnostic` that only records the ones at or above a minimum severity.'''
+
+    def __init__(self, min_severity: Severity = Severity.INFO):
+        '''
+        Parameters
+        ----------
+        min_severity: Severity
+            Diagnostics below this severity are not recorded.
+        '''
+
+        super().__init__()
+        self.min_severity = min_severity
+
+    def add(self, code: str, severity: Severity, section: str = '', key: str = '',
+            line: int = 0, column: int = 0, **args):
+        '''Record a new diagnostic, if it is at or above the minimum severity.'''
+
+        if severity >= self.min_severity:
+            self.append(Diagnostic(code, severity, section, key, line, column, **args))
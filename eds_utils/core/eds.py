@@ -1,10 +1,22 @@
+from bisect import bisect_left
+from contextlib import contextmanager
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Dict, List
+from hashlib import blake2b
+from typing import Callable, Dict, List, Tuple
 from copy import deepcopy
+from weakref import ref
 
 from . import DataType
-from .objects import Variable, Record
+from .objects import Variable, Record, _digest, pack_objects, unpack_objects
+from .changes import ChangeType, Change
+from .snapshot import EDSSnapshot
+from .od_index import ODIndex, normalize_name, sorted_keys
+
+_DIGEST_MOD = 1 << 128
+_INSERT_REMOVE = (ChangeType.INSERT, ChangeType.REMOVE)
+_UNPICKLED = ('_digests', '_digests_sum', '_dirty', '_sorted_indexes', '_partitions')
+'''Caches that are not pickled, they are remade when needed'''
 
 
 class EDSError(Exception):
@@ -25,17 +37,13 @@ class FileInfo:
     modification_dt: datetime = datetime.now()
     modified_by: str = ''
 
-    def __eq__(self, other) -> bool:
+    def _key(self) -> tuple:
         # ignore file_name, modification_dt, and modified_by
+        return (self.file_version, self.file_revision, self.description, self.creation_dt,
+                self.created_by)
 
-        if self.file_version != other.file_version \
-                or self.file_revision != other.file_revision \
-                or self.description != other.description \
-                or self.creation_dt != other.creation_dt \
-                or self.created_by != other.created_by:
-            return False
-
-        return True
+    def __eq__(self, other) -> bool:
+        return self._key() == other._key()
 
 
 @dataclass
@@ -66,24 +74,14 @@ class DeviceInfo:
     num_of_tpdo: int = 0
     lss_supported: bool = False
 
+    def _key(self) -> tuple:
+        return (self.vendor_name, self.vendor_number, self.product_name, self.product_number,
+                self.order_code, tuple(sorted(self.baud_rate.items())), self.simple_boot_up_master,
+                self.simple_boot_up_slave, self.grandularity, self.dynamic_channel_supperted,
+                self.group_messaging, self.num_of_rpdo, self.num_of_tpdo, self.lss_supported)
+
     def __eq__(self, other) -> bool:
-        if self.vendor_name != other.vendor_name \
-                or self.vendor_number != other.vendor_number \
-                or self.product_name != other.product_name \
-                or self.product_number != other.product_number \
-                or self.order_code != other.order_code \
-                or self.baud_rate != other.baud_rate \
-                or self.simple_boot_up_master != other.simple_boot_up_master \
-                or self.simple_boot_up_slave != other.simple_boot_up_slave \
-                or self.grandularity != other.grandularity \
-                or self.dynamic_channel_supperted != other.dynamic_channel_supperted \
-                or self.group_messaging != other.group_messaging \
-                or self.num_of_rpdo != other.num_of_rpdo \
-                or self.num_of_tpdo != other.num_of_tpdo \
-                or self.lss_supported != other.lss_supported:
-            return False
-
-        return True
+        return self._key() == other._key()
 
 
 @dataclass
@@ -97,17 +95,12 @@ class DeviceCommissioning:
     canopen_manager: bool = False
     lss_serialnumber: int = 0
 
-    def __eq__(self, other) -> bool:
-        if self.node_id != other.node_id \
-                or self.node_name != other.node_name \
-                or self.baud_rate != other.baud_rate \
-                or self.net_number != other.net_number \
-                or self.network_name != other.network_name \
-                or self.canopen_manager != other.canopen_manager \
-                or self.lss_serialnumber != other.lss_serialnumber:
-            return False
+    def _key(self) -> tuple:
+        return (self.node_id, self.node_name, self.baud_rate, self.net_number, self.network_name,
+                self.canopen_manager, self.lss_serialnumber)
 
-        return True
+    def __eq__(self, other) -> bool:
+        return self._key() == other._key()
 
 
 class EDS:
@@ -135,21 +128,371 @@ class EDS:
         self.comment = ''
         self.canopennode = False  # flag for canopennode eds/dcf
         self._storage_locations = []
+        self._last_index = -1  # the last index in the OD, to skip sorting on appends
+        self._digests = {}  # index: digest of the index and its object, as a int
+        self._digests_sum = 0  # sum of _digests, mod 2^128
+        self._dirty = set()  # indexes changed since _digests was updated
+        self._observers = []  # callbacks for changes, see subscribe()
+        self._journal = None  # changes since the oldest checkpoint, None if not journaling
+        self._journal_start = 0  # the checkpoint of the first change in _journal
+        self._muted = False  # don't emit changes, for changes made of other changes
+        self._snapshots = []  # weak references to the snapshots of the EDS
+        self._shared = set()  # indexes of objects shared with a snapshot, see _will_change()
+        self._od_index = None  # the secondary indexes, only made on the first query
+        self._sorted_indexes = None  # cached list of indexes, reset on inserts and removes
+        self._partitions = None  # cached category: indexes, see _partition()
+        self._batch_depth = 0  # number of nested batch() calls
+        self._deferred = {}  # (id(obj), group): (obj, update) to do at the end of the batch
+        self._unsorted = False  # the OD needs sorting at the end of the batch
+
+    def __getstate__(self) -> dict:
+        # observers and the journal belong to this EDS, not to its copies
+        state = self.__dict__.copy()
+        state['_observers'] = []
+        state['_journal'] = None
+        state['_journal_start'] = 0
+        state['_muted'] = False
+        state['_snapshots'] = []
+        state['_shared'] = set()
+        state['_od_index'] = None
+        state['_batch_depth'] = 0
+        state['_deferred'] = {}
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+
+        # the objects do not pickle/copy their owner, the cached digests are still valid
+        for index, obj in self._data.items():
+            obj._own(self, index)
+
+    def __deepcopy__(self, memo: dict):
+        copy = self.__class__.__new__(self.__class__)
+        memo[id(self)] = copy
+        copy.__setstate__(deepcopy(self.__getstate__(), memo))
+        return copy
+
+    def __reduce__(self):
+        # pickles have the objects packed into columns of small ints and a table of the unique
+        # strings (see `pack_objects`), a lot smaller and faster than pickling every object
+        # the objects are read through _data, subclasses (e.g. LazyEDS) may keep them elsewhere
+        state = self.__getstate__()
+        objects = pack_objects(self._data)
+        for name in ('_data',) + _UNPICKLED:
+            state.pop(name, None)
+        return _unpickle_eds, (self.__class__, objects, state)
+
+    @classmethod
+    def from_objects(cls, objects):
+        '''
+        Make a EDS from many objects at once, the OD is only sorted once.
+
+        Parameters
+        ----------
+        objects: dict or iterable
+            The objects to add as a dict of index to object or as (index, object) pairs.
+        '''
+
+        eds = cls()
+        eds.add_objects(objects)
+
+        return eds
 
     def __eq__(self, other) -> bool:
-        if self.indexes != other.indexes \
-                or self.file_info != other.file_info \
-                or self.device_info != other.device_info \
-                or self.device_commissioning != other.device_commissioning \
-                or self.comment != other.comment \
-                or self.canopennode != other.canopennode:
-            return False
+        if not isinstance(other, EDS):
+            return NotImplemented
+
+        return self.fingerprint() == other.fingerprint()
+
+    def fingerprint(self) -> str:
+        '''
+        Get a fingerprint of the EDS, equal EDSs have equal fingerprints.
+
+        Each object's digest is cached and the cached digests are combined by adding them (mod
+        2^128), so only the objects changed since the last call are rehashed and a call costs
+        O(changed objects). Not meant to be used for security.
+
+        Returns
+        -------
+        str
+            The fingerprint as a 32 character hex str.
+        '''
+
+        data = self._data
+        digests = self._digests
+        total = self._digests_sum
+
+        for index in self._dirty:
+            total -= digests.pop(index, 0)
+            if index in data:
+                digest = blake2b(index.to_bytes(2, 'little') + data[index].digest(),
+                                 digest_size=16).digest()
+                digests[index] = int.from_bytes(digest, 'little')
+                total += digests[index]
+
+        self._digests_sum = total % _DIGEST_MOD
+        self._dirty.clear()
+
+        header = self.file_info._key() + self.device_info._key() + self.device_commissioning._key()
+        return _digest((self._digests_sum, self.comment, self.canopennode) + header).hex()
+
+    def _adopt(self, index: int, obj):
+        '''Make the EDS the owner of a object, so the EDS is told when the object changes.'''
+
+        obj._own(self, index)
+        self._changed(index)
+
+    def _release(self, obj):
+        '''Stop being the owner of a removed object.'''
+
+        if obj._owner is self:
+            obj._disown()
+
+    def _will_change(self, index: int):
+        '''
+        Called before the object at a index is changed, gives the snapshots sharing the object a
+        copy of it first.
+        '''
+
+        if index not in self._shared:
+            return
+        self._shared.discard(index)
+
+        obj = self._data[index]
+        copy = None
+        for snapshot in self._snapshots:
+            snapshot = snapshot()
+            if snapshot is not None and snapshot._data.get(index) is obj:
+                if copy is None:
+                    copy = deepcopy(obj)
+                snapshot._data[index] = copy
+
+    def snapshot(self) -> EDSSnapshot:
+        '''
+        Get a immutable snapshot of the EDS, e.g. for a backup or a undo.
+
+        The snapshot shares all objects with the EDS, a object is only copied for the snapshot
+        when it is changed in the EDS. Making a snapshot costs O(objects) references, not a copy
+        of the OD.
+
+        Returns
+        -------
+        EDSSnapshot
+            The snapshot.
+        '''
+
+        return self._snapshot(self.fingerprint())
+
+    def _snapshot(self, fingerprint: str) -> EDSSnapshot:
+        '''Make a snapshot, with a given fingerprint (fingerprints are not free).'''
+
+        data = self._data
+        snapshot = EDSSnapshot(dict(data), deepcopy(self.file_info), deepcopy(self.device_info),
+                               deepcopy(self.device_commissioning), self.comment,
+                               self.canopennode, tuple(self._storage_locations), fingerprint)
+        self._snapshots = [i for i in self._snapshots if i() is not None]
+        self._snapshots.append(ref(snapshot))
+        self._shared = set(data)
+
+        return snapshot
+
+    def restore(self, snapshot: EDSSnapshot):
+        '''
+        Undo all changes made since a snapshot of the EDS, only the objects that changed are
+        replaced (with copies, the snapshot is not changed).
+
+        Paramters
+        ---------
+        snapshot: EDSSnapshot
+            A snapshot from snapshot().
+        '''
+
+        old_data = snapshot._data
+
+        for index in [i for i in self._data if i not in old_data]:
+            del self[index]
+
+        data = self._data
+        added = False
+        for index, old in old_data.items():
+            obj = data.get(index)
+            if obj is old:
+                continue
+            if obj is None:
+                added = True
+            else:
+                self._will_change(index)
+                self._release(obj)
+                self._changed(index, ChangeType.REMOVE, old=obj)
+
+            obj = deepcopy(old)
+            data[index] = obj
+            self._adopt(index, obj)
+            self._changed(index, ChangeType.INSERT, new=obj)
+
+        if added:
+            self._sort()
+
+        self.file_info = deepcopy(snapshot.file_info)
+        self.device_info = deepcopy(snapshot.device_info)
+        self.device_commissioning = deepcopy(snapshot.device_commissioning)
+        self.comment = snapshot.comment
+        self.canopennode = snapshot.canopennode
+        self._storage_locations = list(snapshot.storage_locations)
+
+    @contextmanager
+    def batch(self):
+        '''
+        Context manager for making many changes at once, e.g. adding thousands of objects or
+        changing the data type of whole arrays.
+
+        Work done after each change is deferred to the end of the batch and only done once:
+        sorting the OD, updating subindex 0 of records and arrays, and setting the storage
+        location of subindexes and the data type of array subindexes. Until then `indexes` may
+        not be sorted and those subindexes may be out of date.
+
+        If a exception is raised in the batch, all changes made in the batch are undone (the
+        changed objects are replaced by copies of the originals, see restore()). Batches can be
+        nested, only the outermost batch is undone.
+
+        Example
+        -------
+        >>> with eds.batch():
+        ...     for i in range(1000):
+        ...         eds[0x2000 + i] = Variable()
+        '''
+
+        outer = self._batch_depth == 0
+        snapshot = self._snapshot(None) if outer else None
+
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if outer:
+                self._deferred.clear()
+                self.restore(snapshot)
+            raise
+        finally:
+            self._batch_depth -= 1
+            if outer:
+                self._end_batch()
+
+    def _end_batch(self):
+        '''Do all the work deferred to the end of the batch.'''
+
+        deferred = self._deferred
+        self._deferred = {}
+        for obj, update in deferred.values():
+            update(obj)
+
+        if self._unsorted:
+            self._unsorted = False
+            self._sort()
+
+    def _sort(self):
+        '''Sort the OD, at the end of the batch if in one.'''
+
+        if self._batch_depth:
+            self._unsorted = True
+            return
+
+        self._data = dict(sorted(self._data.items()))
+        self._last_index = max(self._data, default=-1)
+
+    def _changed(self, index: int, change_type: ChangeType = None, field: str = None, old=None,
+                 new=None, subindex: int = None):
+        '''Called when the object at a index is changed.'''
+
+        self._dirty.add(index)
+        if self._od_index is not None:
+            self._od_index.dirty.add(index)
+        if subindex is None and change_type in _INSERT_REMOVE:
+            self._sorted_indexes = None
+            self._partitions = None
+
+        if change_type is not None and not self._muted \
+                and (self._observers or self._journal is not None):
+            self._emit(Change(change_type, index, subindex, field, old, new))
+
+    def _emit(self, change: Change):
+        '''Add a change to the journal and tell all the observers about it.'''
+
+        if self._journal is not None:
+            self._journal.append(change)
+
+        for callback in list(self._observers):
+            callback(change)
+
+    def subscribe(self, callback: Callable[[Change], None]):
+        '''
+        Call a callback on every change to the OD.
+
+        The callback is called after the change was made with a `Change` as its only argument.
+        Changes made while loading objects (e.g. by a LazyEDS) are not changes.
+
+        Paramters
+        ---------
+        callback: Callable[[Change], None]
+            The function to call.
+        '''
+
+        if callback not in self._observers:
+            self._observers.append(callback)
 
-        for i in self.indexes:
-            if self[i] != other[i]:
-                return False
+    def unsubscribe(self, callback: Callable[[Change], None]):
+        '''Stop calling a callback given to subscribe(), does nothing if it was never given.'''
 
-        return True
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def checkpoint(self) -> int:
+        '''
+        Start (or continue) journaling changes to the OD and get a checkpoint for now.
+
+        Returns
+        -------
+        int
+            The checkpoint, to give to changes_since().
+        '''
+
+        if self._journal is None:
+            self._journal = []
+
+        return self._journal_start + len(self._journal)
+
+    def changes_since(self, checkpoint: int) -> List[Change]:
+        '''
+        Get the changes to the OD since a checkpoint, oldest first.
+
+        Paramters
+        ---------
+        checkpoint: int
+            A checkpoint from checkpoint().
+
+        Raises
+        ------
+        ValueError
+            The checkpoint is from before the journal was last cleared.
+
+        Returns
+        -------
+        List[Change]
+            The changes.
+        '''
+
+        journal = self._journal if self._journal is not None else []
+        if not self._journal_start <= checkpoint <= self._journal_start + len(journal):
+            raise ValueError(f'checkpoint {checkpoint} is not in the journal')
+
+        return journal[checkpoint - self._journal_start:]
+
+    def clear_journal(self):
+        '''Stop journaling and drop the journal, all existing checkpoints become invalid.'''
+
+        if self._journal is not None:
+            self._journal_start += len(self._journal)
+        self._journal = None
 
     def __len__(self):
         return len(self._data)
@@ -157,6 +500,9 @@ class EDS:
     def __getitem__(self, item):
         return self._data[item]
 
+    def __contains__(self, index: int) -> bool:
+        return index in self._data
+
     def __setitem__(self, index: int, item):
         if index in self._data:
             raise EDSError(f'index 0x{index:X} already exist')
@@ -164,12 +510,64 @@ class EDS:
         if item.storage_location == '' and self._storage_locations:
             item.storage_location = self._storage_locations[0]
 
+        self._add(index, item)
+
+    def __delitem__(self, index: int):
+        self._will_change(index)
+        obj = self._data.pop(index)
+        self._release(obj)
+        self._changed(index, ChangeType.REMOVE, old=obj)
+
+    def _add(self, index: int, item):
+        '''Add a object to the OD, the OD is only re-sorted if the index is not the last one.'''
+
         self._data[index] = item
+        self._adopt(index, item)
+        self._changed(index, ChangeType.INSERT, new=item)
 
-        self._data = dict(sorted(self._data.items()))
+        if index < self._last_index:
+            self._sort()
+        else:
+            self._last_index = index
+
+    def add_objects(self, objects, replace: bool = False):
+        '''
+        Add many objects to the OD at once, the OD is only sorted once at the end (and only if
+        there are new indexes).
+
+        Parameters
+        ----------
+        objects: dict or iterable
+            The objects to add as a dict of index to object or as (index, object) pairs.
+        replace: bool
+            Replace objects that already exist instead of raising a EDSError.
+        '''
+
+        if isinstance(objects, dict):
+            objects = objects.items()
+
+        data = self._data
+        added = False
+        for index, item in objects:
+            if index in data:
+                if not replace:
+                    raise EDSError(f'index 0x{index:X} already exist')
+                self._will_change(index)
+                old = data[index]
+                self._release(old)
+                self._changed(index, ChangeType.REMOVE, old=old)
+            else:
+                added = True
 
-    def __delitem__(self, index: int):
-        del self._data[index]
+            if item.storage_location == '' and self._storage_locations:
+                item.storage_location = self._storage_locations[0]
+
+            data[index] = item
+            self._adopt(index, item)
+            self._changed(index, ChangeType.INSERT, new=item)
+
+        if added:
+            self._sort()
 
     def insert(self, index: int, subindex: int, item):
         '''Insert a object into the object dictionary'''
@@ -177,13 +575,13 @@ class EDS:
         if subindex is None:
             if index in self._data:
                 raise EDSError(f'index 0x{index:X} already exist')
-            self._data[index] = item
+            self._add(index, item)
         elif index not in self._data:
             raise EDSError(f'cannot insert subindex 0x{subindex:X} for index 0x{index:X}, as that '
                            'index does not exist')
         elif isinstance(self._data[index], Variable):
             raise EDSError('cannot insert a subindex into a Variable')
-        elif subindex in self._data[index].subindexes:
+        elif subindex in self._data[index]:
             raise EDSError(f'subindex 0x{subindex:X} already exist for index 0x{index:X}')
         elif not isinstance(item, Variable):
             raise EDSError('cannot insert non-Variable into subindex')
@@ -194,7 +592,7 @@ class EDS:
         '''Remove a object from the object dictionary'''
 
         if subindex is None:  # use only index
-            del self._data[index]
+            del self[index]
         else:  # use index and subindex
             del self._data[index][subindex]
 
@@ -229,13 +627,13 @@ class EDS:
         # subindex 4 is reserved in CiA 301
         comm_rec[5] = Variable(parameter_name='Event timer')
         comm_rec[6] = Variable(parameter_name='SYNC start value', data_type=DataType.UNSIGNED8)
-        self._data[self.RPDO_COMM_START + next_rpdo] = comm_rec
+        self._add(self.RPDO_COMM_START + next_rpdo, comm_rec)
 
         # mapping object
         para_rec = Record('RPDO mapping parameter')
         for i in range(1, 9):
             para_rec[i] = Variable(parameter_name=f'Application object {i}')
-        self._data[self.RPDO_PARA_START + next_rpdo] = para_rec
+        self._add(self.RPDO_PARA_START + next_rpdo, para_rec)
 
     def add_tpdo(self):
         '''Add TPDO to the object dictionary'''
@@ -268,35 +666,66 @@ class EDS:
         # subindex 4 is reserved in CiA 301
         comm_rec[5] = Variable(parameter_name='Event timer')
         comm_rec[6] = Variable(parameter_name='SYNC start value', data_type=DataType.UNSIGNED8)
-        self._data[self.TPDO_COMM_START + next_tpdo] = comm_rec
+        self._add(self.TPDO_COMM_START + next_tpdo, comm_rec)
 
         # mapping object
         para_rec = Record('TPDO mapping parameter')
         for i in range(1, 9):
             para_rec[i] = Variable(parameter_name=f'Application object {i}')
-        self._data[self.TPDO_PARA_START + next_tpdo] = para_rec
+        self._add(self.TPDO_PARA_START + next_tpdo, para_rec)
+
+    def range(self, start: int, stop: int = 0x10000) -> List[int]:
+        '''
+        Get the indexes in a range, without going through the whole OD.
+
+        Paramters
+        ---------
+        start: int
+            The first index.
+        stop: int
+            The index to stop at (not included).
+
+        Returns
+        -------
+        List[int]
+            The sorted list of indexes in the OD from start to stop.
+        '''
+
+        indexes = self._sorted_indexes
+        if indexes is None:
+            indexes = self._sorted_indexes = self.indexes
+            if self._unsorted:  # in a batch
+                indexes.sort()
+
+        return indexes[bisect_left(indexes, start):bisect_left(indexes, stop)]
+
+    def _partition(self, category: str) -> List[int]:
+        '''Get the cached list of indexes for a category of objects (do not modify it).'''
+
+        if self._partitions is None:
+            optional = [i for i in self.range(0x1000, 0x2000) if i not in self.MANDATORY_OBJECTS]
+            self._partitions = {
+                'mandatory': [i for i in self.range(0x1000, 0x2000)
+                              if i in self.MANDATORY_OBJECTS],
+                'optional': optional + self.range(0x6000),
+                'manufacturer': self.range(0x2000, 0x6000),
+                'rpdo': self.range(self.RPDO_COMM_START, self.RPDO_PARA_START),
+                'tpdo': self.range(self.TPDO_COMM_START, self.TPDO_PARA_START),
+            }
+
+        return self._partitions[category]
 
     @property
     def rpdos(self) -> int:
         '''int: The number of RPDOs'''
 
-        count = 0
-        for i in range(self.RPDO_COMM_START, self.RPDO_PARA_START):
-            if i in self._data:
-                count += 1
-
-        return count
+        return len(self._partition('rpdo'))
 
     @property
     def tpdos(self) -> int:
         '''int: The number of TPDOs'''
 
-        count = 0
-        for i in range(self.TPDO_COMM_START, self.TPDO_PARA_START):
-            if i in self._data:
-                count += 1
-
-        return count
+        return len(self._partition('tpdo'))
 
     @property
     def indexes(self) -> List[int]:
@@ -308,38 +737,115 @@ class EDS:
     def mandatory_objects(self) -> List[int]:
         '''The list of mandatory objects indexes in the OD'''
 
-        objects = []
-
-        for i in self.MANDATORY_OBJECTS:
-            if i in self._data:
-                objects.append(i)
-
-        return objects
+        return list(self._partition('mandatory'))
 
     @property
     def optional_objects(self) -> list:
         '''The list of optional objects indexes in the OD'''
 
-        objects = []
-
-        for i in self._data:
-            if (i >= 0x1000 and i <= 0x1FFF and i not in self.MANDATORY_OBJECTS) \
-                    or (i >= 0x6000 and i <= 0xFFFF):
-                objects.append(i)
-
-        return objects
+        return list(self._partition('optional'))
 
     @property
     def manufacturer_objects(self) -> List[int]:
         '''The list of manufacturer objects indexes in the OD'''
 
-        objects = []
+        return list(self._partition('manufacturer'))
+
+    def _index(self) -> ODIndex:
+        '''Get the secondary indexes, up to date.'''
+
+        if self._od_index is None:
+            self._od_index = ODIndex()
+            self._od_index.dirty.update(self._data)
+
+        self._od_index.update(self._data)
+        return self._od_index
+
+    def objects_in(self, storage_location: str) -> List[int]:
+        '''
+        Get the indexes of the objects in a storage location.
+
+        Paramters
+        ---------
+        storage_location: str
+            The storage location.
+
+        Returns
+        -------
+        List[int]
+            The sorted list of indexes.
+        '''
+
+        return sorted(self._index().storage_locations.get(storage_location, ()))
+
+    def of_data_type(self, data_type: DataType) -> List[Tuple[int, int]]:
+        '''
+        Get all variables (objects and subindexes) with a data type.
+
+        Paramters
+        ---------
+        data_type: DataType
+            The data type.
 
-        for i in self._data:
-            if i >= 0x2000 and i <= 0x5FFF:
-                objects.append(i)
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The sorted list of (index, subindex), with a subindex of None for objects.
+        '''
 
-        return objects
+        return sorted_keys(self._index().data_types.get(data_type, ()))
+
+    def pdo_mappable(self, max_size: int = None) -> List[Tuple[int, int]]:
+        '''
+        Get all the PDO mappable variables (objects and subindexes).
+
+        Paramters
+        ---------
+        max_size: int
+            Optional max size in bits, only variables that fit are included.
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The sorted list of (index, subindex), with a subindex of None for objects.
+        '''
+
+        keys = []
+        for size, items in self._index().pdo_mappable.items():
+            if max_size is None or size <= max_size:
+                keys += items
+
+        return sorted_keys(keys)
+
+    def find(self, name: str, partial: bool = False) -> List[Tuple[int, int]]:
+        '''
+        Find objects and subindexes by parameter name, case and repeated whitespace are ignored.
+
+        Paramters
+        ---------
+        name: str
+            The parameter name to find.
+        partial: bool
+            Also find parameter names that contain the name.
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The sorted list of (index, subindex), with a subindex of None for objects.
+        '''
+
+        names = self._index().names
+        name = normalize_name(name)
+
+        if not partial:
+            return sorted_keys(names.get(name, ()))
+
+        keys = []
+        for i, items in names.items():
+            if name in i:
+                keys += items
+
+        return sorted_keys(keys)
 
     @property
     def storage_locations(self) -> List[str]:
@@ -358,7 +864,7 @@ class EDS:
 
         if index not in self.indexes:
             raise EDSError(f'no object exists at index 0x{index:X}')
-        if subindex is not None and subindex not in self._data[index].subindexes:
+        if subindex is not None and subindex not in self._data[index]:
             raise EDSError(f'no object exists at index 0x{index:X} subindex 0x{subindex:02X}')
 
         if new_subindex is None and new_index in self._data:
@@ -366,7 +872,7 @@ class EDS:
         if new_subindex is not None:
             if isinstance(self._data[new_index], Variable):
                 raise EDSError('cannot move an object to a subindex of an Variable')
-            if new_subindex in self._data[new_index].subindexes:
+            if new_subindex in self._data[new_index]:
                 raise EDSError(f'object already exist at index 0x{new_index:X} subindex '
                                f'0x{new_subindex:02X}')
 
@@ -375,13 +881,40 @@ class EDS:
 
         obj = self._data[index] if subindex is None else self._data[index][subindex]
 
-        if new_subindex is None:
-            self._data[new_index] = deepcopy(obj)
-        else:
-            self._data[new_index][new_subindex] = deepcopy(obj)
+        if not move:
+            if new_subindex is None:
+                self._add(new_index, deepcopy(obj))
+            else:
+                self._data[new_index][new_subindex] = deepcopy(obj)
+            return
 
-        if move:
+        # a move is one change, not a remove and a insert
+        muted = self._muted
+        self._muted = True
+        try:
             if subindex is None:
-                del self._data[index]
+                del self[index]
             else:
                 del self._data[index][subindex]
+
+            if new_subindex is None:
+                self._add(new_index, obj)
+            else:
+                self._data[new_index][new_subindex] = obj
+        finally:
+            self._muted = muted
+
+        if not muted and (self._observers or self._journal is not None):
+            self._emit(Change(ChangeType.MOVE, new_index, new_subindex, old=(index, subindex),
+                              new=obj))
+
+
+def _unpickle_eds(cls, objects: tuple, state: dict) -> EDS:
+    '''Make a EDS from a pickle, see `EDS.__reduce__`.'''
+
+    eds = cls.__new__(cls)
+    data = unpack_objects(*objects)
+    state.update(_data=data, _digests={}, _digests_sum=0, _dirty=set(data),
+                 _sorted_indexes=None, _partitions=None)
+    eds.__setstate__(state)
+    return eds
@@ -0,0 +1,163 @@
+'''Streaming access to compressed (gzip, xz, or bzip2) and zip archived eds/dcf files'''
+
+import io
+import os
+import re
+import bz2
+import sys
+import gzip
+import lzma
+import zipfile
+from contextlib import contextmanager
+from typing import Iterable, List
+
+COMPRESSORS = {
+    '.gz': gzip.open,
+    '.xz': lzma.open,
+    '.bz2': bz2.open,
+}
+'''Open functions for compressed files by file extension'''
+
+EDS_EXTENSIONS = ('.eds', '.dcf')
+'''File extensions of EDS/DCF files'''
+
+XDD_EXTENSIONS = ('.xdd', '.xdc')
+'''File extensions of XDD/XDC (CiA 311 XML) files'''
+
+_EXTENSIONS = EDS_EXTENSIONS + XDD_EXTENSIONS
+_MEMBER_PATH = re.compile(r'^(.+?\.zip)[/\\](.+)$', re.IGNORECASE)
+
+
+def split_member(file_path: str) -> (str, str):
+    '''
+    Split a zip member path (e.g. "bundle.zip/device.eds") into the archive path and the member
+    name.
+
+    Paramters
+    ---------
+    file_path: str
+        The path to split.
+
+    Returns
+    -------
+    str:
+        The path to the zip archive or `file_path` if it is not a zip member path.
+    str:
+        The name of the member in the archive or None if it is not a zip member path.
+    '''
+
+    if not isinstance(file_path, str) or os.path.exists(file_path):
+        return file_path, None
+
+    match = _MEMBER_PATH.match(file_path)
+    if match is None or os.path.isdir(match[1]):
+        return file_path, None
+
+    return match[1], match[2].replace('\\', '/')
+
+
+def strip_compression(file_path: str) -> str:
+    '''Remove a compression file extension (e.g. ".gz") from a path, if it has one.'''
+
+    root, ext = os.path.splitext(file_path)
+
+    return root if ext.lower() in COMPRESSORS else file_path
+
+
+def plain_path(file_path: str) -> str:
+    '''Get the path (or member name) of a file without any compression extension or zip archive
+    path, e.g. "bundle.zip/device.eds.gz" -> "device.eds".'''
+
+    return strip_compression(split_member(file_path)[1] or file_path)
+
+
+def is_xdd(file_path) -> bool:
+    '''Check if a path is to a XDD/XDC file (possibly compressed or in a zip archive).'''
+
+    return isinstance(file_path, str) and plain_path(file_path).lower().endswith(XDD_EXTENSIONS)
+
+
+def expand_archives(file_paths: Iterable[str]) -> List[str]:
+    '''
+    Replace every zip archive path with the paths to all the EDS/DCF/XDD/XDC members in it.
+
+    Paramters
+    ---------
+    file_paths: iterable of str
+        Paths to EDS/DCF/XDD/XDC files and/or zip archives.
+
+    Returns
+    -------
+    list:
+        The paths with each zip archive replaced by its member paths.
+    '''
+
+    expanded = []
+
+    for file_path in file_paths:
+        if isinstance(file_path, str) and file_path.lower().endswith('.zip') \
+                and os.path.isfile(file_path):
+            with zipfile.ZipFile(file_path) as archive:
+                expanded += [f'{file_path}/{i.filename}' for i in archive.infolist()
+                             if not i.is_dir() and i.filename.lower().endswith(_EXTENSIONS)]
+        else:
+            expanded.append(file_path)
+
+    return expanded
+
+
+@contextmanager
+def open_eds(file_path, mode: str = 'r'):
+    '''
+    Open a EDS/DCF file as a text stream, transparently (de)compressing it.
+
+    Paths ending in ".gz", ".xz", or ".bz2" are (de)compressed while streaming. A zip member path
+    (e.g. "bundle.zip/device.eds") is streamed directly from/to the archive without extracting
+    it. When writing, the member is appended to the archive (which is made if it does not exist);
+    existing members cannot be overwritten.
+
+    Paramters
+    ---------
+    file_path: str or file object
+        Path to EDS/DCF file, an already opened (text) file object, or '-' for stdin/stdout.
+    mode: str
+        'r' to read or 'w' to write.
+
+    Raises
+    ------
+    FileExistsError:
+        Writing to a zip member that already exists.
+
+    Yields
+    ------
+    file object:
+        The text stream.
+    '''
+
+    if hasattr(file_path, 'read') or hasattr(file_path, 'write'):
+        yield file_path
+        return
+
+    if file_path == '-':
+        yield sys.stdin if mode == 'r' else sys.stdout
+        return
+
+    archive_path, member = split_member(file_path)
+    if member is not None:
+        with zipfile.ZipFile(archive_path, 'a' if mode == 'w' else 'r',
+                             zipfile.ZIP_DEFLATED) as archive:
+            if mode == 'w' and member in archive.namelist():
+                raise FileExistsError(f'{member} already exists in {archive_path}')
+
+            with archive.open(member, mode) as raw, io.TextIOWrapper(raw) as fptr:
+                yield fptr
+        return
+
+    compressor = COMPRESSORS.get(os.path.splitext(file_path)[1].lower())
+    if compressor is not None:
+        with compressor(file_path, mode + 't') as fptr:
+            yield fptr
+        return
+
+    with open(file_path, mode) as fptr:
+        yield fptr
@@ -0,0 +1,214 @@
+'''asyncio counterparts of read_eds and write_eds, for services that cannot block the event loop'''
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from ..diagnostic import Severity, Diagnostics
+from ..eds import EDS
+from .archive import open_eds, is_xdd
+from .read_eds import ReadMode, read_eds
+from .write_eds import write_eds
+
+DEFAULT_MAX_WORKERS = 4
+'''Default max number of reads/writes running at once'''
+
+_CHECK_EVERY = 1024  # lines between checks for a cancelled read
+
+
+class _Stopped(Exception):
+    '''Raised in a worker thread to stop a read that was cancelled.'''
+
+
+class _StoppableFile:
+    '''Wraps a text file object to stop iterating over its lines once a event is set.'''
+
+    def __init__(self, fptr, stop: threading.Event):
+        self._fptr = fptr
+        self._stop = stop
+
+    def read(self, *args):
+        return self._fptr.read(*args)
+
+    def __iter__(self):
+        for i, line in enumerate(self._fptr):
+            if i % _CHECK_EVERY == 0 and self._stop.is_set():
+                raise _Stopped()
+            yield line
+
+
+class AsyncEDSIO:
+    '''
+    Reads and writes EDS/DCF files in a bounded thread pool, so the event loop is never blocked.
+
+    At most `max_workers` reads/writes run at once, any more wait (without being queued in the
+    thread pool) until one finishes. A cancelled read/write that has not started yet is dropped
+    and a cancelled read that has started is stopped; a write that has started is finished, so
+    no partially written files are left behind. Either way the cancelled call only returns once
+    its thread is done with it, so the limit is never exceeded.
+
+    NOTE: Reading holds the GIL, the thread pool keeps the event loop responsive but does not
+    parse in parallel. Use `read_many` for that.
+    '''
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        '''
+        Parameters
+        ----------
+        max_workers: int
+            Max number of reads/writes running at once.
+        '''
+
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='eds-io')
+        self._semaphores = weakref.WeakKeyDictionary()  # by event loop
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''Shutdown the thread pool, reads/writes that are running are finished.'''
+
+        self._executor.shutdown(wait=False)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        '''Get the semaphore for the running event loop.'''
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_workers)
+            self._semaphores[loop] = semaphore
+
+        return semaphore
+
+    async def _run(self, func, *args, stop: threading.Event = None):
+        '''Run a function in the thread pool, once there is room for it.'''
+
+        async with self._semaphore():
+            future = self._executor.submit(func, *args)
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if not future.cancel():  # already running
+                    if stop is not None:
+                        stop.set()
+                    try:
+                        await asyncio.wrap_future(future)
+                    except Exception:
+                        pass  # it was cancelled, the result does not matter
+                raise
+
+    async def read_eds(self, file_path, min_severity: Severity = Severity.INFO,
+                       mode: ReadMode = ReadMode.FIX) -> (EDS, Diagnostics):
+        '''
+        Read a EDS/DCF file without blocking the event loop.
+
+        Paramters
+        ---------
+        file_path: str or file object
+            Path to EDS/DCF/XDD/XDC file or an already opened (text) file object, see `read_eds`.
+        min_severity: Severity
+            Diagnostics below this severity are not recorded.
+        mode: ReadMode or str
+            How much checking and fixing to do, see `ReadMode`.
+
+        Returns
+        -------
+        EDS:
+            The eds object.
+        Diagnostics:
+            List of diagnostics for the errors that occured when reading in the EDS/DCF.
+        '''
+
+        stop = threading.Event()
+
+        def read():
+            if is_xdd(file_path):  # read_eds hands the path to read_xdd, it can't be stopped
+                return read_eds(file_path, min_severity, mode)
+
+            with open_eds(file_path) as fptr:
+                try:
+                    return read_eds(_StoppableFile(fptr, stop), min_severity, mode)
+                except _Stopped:
+                    return None
+
+        return await self._run(read, stop=stop)
+
+    async def write_eds(self, eds: EDS, file_path: str = '', dcf: bool = False):
+        '''
+        Write a EDS/DCF file without blocking the event loop.
+
+        Do not change the eds while it is being written.
+
+        Paramters
+        ---------
+        eds: EDS
+            eds data structure to save as file
+        file_path: str
+            File path of eds/dcf to save, see `write_eds`.
+        dcf: bool
+            Force the file save to be to a dcf file reguardless if the file_path ends with ".dcf"
+        '''
+
+        await self._run(write_eds, eds, file_path, dcf)
+
+
+_default = None
+
+
+def _default_io() -> AsyncEDSIO:
+    '''Get the shared `AsyncEDSIO` used by `aread_eds` and `awrite_eds`.'''
+
+    global _default
+
+    if _default is None:
+        _default = AsyncEDSIO()
+
+    return _default
+
+
+async def aread_eds(file_path, min_severity: Severity = Severity.INFO,
+                    mode: ReadMode = ReadMode.FIX) -> (EDS, Diagnostics):
+    '''
+    Read a EDS/DCF file without blocking the event loop, using a shared `AsyncEDSIO`.
+
+    Paramters
+    ---------
+    file_path: str or file object
+        Path to EDS/DCF/XDD/XDC file or an already opened (text) file object, see `read_eds`.
+    min_severity: Severity
+        Diagnostics below this severity are not recorded.
+    mode: ReadMode or str
+        How much checking and fixing to do, see `ReadMode`.
+
+    Returns
+    -------
+    EDS:
+        The eds object.
+    Diagnostics:
+        List of diagnostics for the errors that occured when reading in the EDS/DCF.
+    '''
+
+    return await _default_io().read_eds(file_path, min_severity, mode)
+
+
+async def awrite_eds(eds: EDS, file_path: str = '', dcf: bool = False):
+    '''
+    Write a EDS/DCF file without blocking the event loop, using a shared `AsyncEDSIO`.
+
+    Paramters
+    ---------
+    eds: EDS
+        eds data structure to save as file
+    file_path: str
+        File path of eds/dcf to save, see `write_eds`.
+    dcf: bool
+        Force the file save to be to a dcf file reguardless if the file_path ends with ".dcf"
+    '''
+
+    await _default_io().write_eds(eds, file_path, dcf)
@@ -0,0 +1,57 @@
+'''Everything to read and write a DCF as a overlay of a base EDS'''
+
+from ..diagnostic import Severity, Diagnostics
+from ..dcf import DCFOverlay
+from .read_eds import read_eds, ReadMode
+from .write_eds import write_eds
+
+
+def read_dcf_overlay(file_path, base, min_severity: Severity = Severity.INFO,
+                     mode: ReadMode = ReadMode.FIX) -> (DCFOverlay, Diagnostics):
+    '''
+    Read a DCF file as a overlay of a base EDS, only the values that differ from the base are
+    kept.
+
+    Paramters
+    ---------
+    file_path: str or file object
+        Path to DCF file, see `read_eds`.
+    base: EDS or EDSSnapshot
+        The base EDS, shared by all the overlays read with it.
+    min_severity: Severity
+        Diagnostics below this severity are not recorded.
+    mode: ReadMode or str
+        How much checking and fixing to do, see `ReadMode`.
+
+    Raises
+    ------
+    ValueError
+        The DCF has different objects than the base, see `DCFOverlay.from_eds`.
+
+    Returns
+    -------
+    DCFOverlay:
+        The overlay.
+    Diagnostics:
+        List of diagnostics for the errors that occured when reading in the DCF.
+    '''
+
+    eds, diags = read_eds(file_path, min_severity, mode)
+
+    return DCFOverlay.from_eds(base, eds), diags
+
+
+def write_dcf_overlay(dcf: DCFOverlay, file_path: str = ''):
+    '''
+    Write a overlay as a normal DCF file.
+
+    Paramters
+    ---------
+    dcf: DCFOverlay
+        The overlay to write.
+    file_path: str
+        File path of the DCF, see `write_eds`. If empty the file name from the overlay's file
+        info.
+    '''
+
+    write_eds(dcf.to_eds(), file_path, dcf=True)
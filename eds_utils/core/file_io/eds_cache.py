@@ -0,0 +1,190 @@
+'''An on-disk cache of parsed eds/dcf files, so unchanged files do not have to be parsed again'''
+
+import os
+import zlib
+import pickle
+import hashlib
+
+from ... import __version__
+from ..diagnostic import Severity, Diagnostics
+from ..eds import EDS
+from .read_eds import ReadMode, read_eds
+from .archive import split_member
+
+CACHE_DIR_ENV = 'EDS_UTILS_CACHE_DIR'
+'''Environment variable to opt-in the CLIs to the parse cache'''
+
+CACHE_MAX_SIZE_ENV = 'EDS_UTILS_CACHE_MAX_SIZE'
+'''Environment variable to override the max size of the parse cache in bytes'''
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+'''Default max size of the parse cache in bytes'''
+
+_SUFFIX = '.edscache'
+_CHUNK_SIZE = 1024 * 1024
+
+
+class EDSCache:
+    '''
+    A size-bounded LRU cache of parsed EDS/DCF files in a directory.
+
+    Entries are keyed by the file's path, size, modification time, content hash, read mode,
+    and the eds-utils version, and hold the `EDS` and all diagnostics from `read_eds` as a
+    compressed pickle.
+    '''
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE):
+        '''
+        Parameters
+        ----------
+        cache_dir: str
+            Directory to store the cache in. Will be made if it does not exist.
+        max_size: int
+            Max size of all cache entries in bytes. The least recently used entries are removed
+            when it is exceeded.
+        '''
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, file_path: str, mode: ReadMode = ReadMode.FIX) -> str:
+        '''Get the cache key for a EDS/DCF file read in a mode.'''
+
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+
+        content_hash = hashlib.sha256()
+        with open(file_path, 'rb') as fptr:
+            for chunk in iter(lambda: fptr.read(_CHUNK_SIZE), b''):
+                content_hash.update(chunk)
+
+        key = hashlib.sha256()
+        for i in [file_path, stat.st_size, stat.st_mtime_ns, content_hash.hexdigest(),
+                  ReadMode(mode).value, __version__]:
+            key.update(f'{i}\0'.encode())
+
+        return key.hexdigest()
+
+    def read_eds(self, file_path: str, min_severity: Severity = Severity.INFO,
+                 mode: ReadMode = ReadMode.FIX) -> (EDS, Diagnostics):
+        '''
+        Read a EDS/DCF file from the cache or parse it and add it to the cache.
+
+        Paramters
+        ---------
+        file_path: str
+            Path to EDS/DCF file
+        min_severity: Severity
+            Diagnostics below this severity are not returned.
+        mode: ReadMode or str
+            How much checking and fixing to do, see `ReadMode`.
+
+        Returns
+        -------
+        EDS:
+            The eds object.
+        Diagnostics:
+            List of diagnostics for the errors that occured when reading in the EDS/DCF.
+        '''
+
+        entry_path = os.path.join(self.cache_dir, self.key(file_path, mode) + _SUFFIX)
+
+        try:
+            with open(entry_path, 'rb') as fptr:
+                eds, errors = pickle.loads(zlib.decompress(fptr.read()))
+            os.utime(entry_path)  # mark as most recently used
+            return eds, _filter(errors, min_severity)
+        except Exception:
+            pass  # missing or unreadable entry, (re)parse the file
+
+        eds, errors = read_eds(file_path, mode=mode)  # cache everything, filter on the way out
+
+        tmp_path = f'{entry_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as fptr:
+            fptr.write(zlib.compress(pickle.dumps((eds, errors), pickle.HIGHEST_PROTOCOL)))
+        os.replace(tmp_path, entry_path)
+
+        self.evict()
+
+        return eds, _filter(errors, min_severity)
+
+    def evict(self):
+        '''Remove the least recently used entries until the cache is within its max size.'''
+
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        '''Remove all entries from the cache.'''
+
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(_SUFFIX):
+                os.remove(entry.path)
+
+
+def _filter(errors: list, min_severity: Severity) -> Diagnostics:
+    '''Get the diagnostics at or above a minimum severity.'''
+
+    diags = Diagnostics(min_severity)
+    diags += [i for i in errors if i.severity >= min_severity]
+
+    return diags
+
+
+def read_eds_cached(file_path, cache_dir: str = None, max_size: int = None,
+                    min_severity: Severity = Severity.INFO,
+                    mode: ReadMode = ReadMode.FIX) -> (EDS, Diagnostics):
+    '''
+    Read a EDS/DCF file using the parse cache.
+
+    The cache is opt-in: if no cache_dir is given the `EDS_UTILS_CACHE_DIR` environment variable
+    is used and if that is not set either the file is just read with `read_eds`.
+
+    Paramters
+    ---------
+    file_path: str or file object
+        Path to EDS/DCF file. Only paths are cached, not zip member paths.
+    cache_dir: str
+        Optional directory to store the cache in.
+    max_size: int
+        Optional max size of the cache in bytes. Defaults to the `EDS_UTILS_CACHE_MAX_SIZE`
+        environment variable or `DEFAULT_MAX_SIZE`.
+    min_severity: Severity
+        Diagnostics below this severity are not returned.
+    mode: ReadMode or str
+        How much checking and fixing to do, see `ReadMode`.
+
+    Returns
+    -------
+    EDS:
+        The eds object.
+    Diagnostics:
+        List of diagnostics for the errors that occured when reading in the EDS/DCF.
+    '''
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+
+    if not cache_dir or not isinstance(file_path, str) or file_path == '-' \
+            or split_member(file_path)[1] is not None:
+        return read_eds(file_path, min_severity, mode)
+
+    if max_size is None:
+        max_size = int(os.environ.get(CACHE_MAX_SIZE_ENV, DEFAULT_MAX_SIZE))
+
+    return EDSCache(cache_dir, max_size).read_eds(file_path, min_severity, mode)
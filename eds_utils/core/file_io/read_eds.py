@@ -1,11 +1,18 @@
 '''Everything to read an eds/dcf file'''
 
 import re
+from enum import Enum
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Tuple
 
 from .. import DataType, ObjectType, AccessType, BAUD_RATE, str2int, pdo_mapping_fields
+from ..diagnostic import Severity, Diagnostics
 from ..eds import EDS, FileInfo, DeviceInfo, DeviceCommissioning
 from ..objects import Variable, Array, Record
+from .archive import open_eds, expand_archives, is_xdd
+from .read_xdd import read_xdd
 
 VARIABLE_ENTRIES = [
     'ParameterName',
@@ -30,179 +37,316 @@ ARRAY_RECORD_ENTRIES = [
 ]
 '''All valid entries in an array and record'''
 
-_LEVEL = 'AUTO-FIXED'
+_INDEX_HEADER = re.compile(r'^\[([0-9a-fA-F]{4})\]$')
+_SUBINDEX_HEADER = re.compile(r'^\[([0-9a-fA-F]{4})sub([0-9a-fA-F]{1,2})\]$')
+_OCTET_STRING = re.compile(r'^([\da-fA-F]{2} *)*$')
+_PDO_MAPPING_VALUE = re.compile(r'^0x[\da-fA-F]{8}$')
 
+_OBJECT_LISTS = ['[MandatoryObjects]', '[OptionalObjects]', '[ManufacturerObjects]']
 
-def read_eds(file_path: str) -> (EDS, list):
+_LIST_DATA_TYPES = [DataType.VISIBLE_STRING, DataType.OCTET_STRING, DataType.UNICODE_STRING,
+                    DataType.DOMAIN]
+
+
+class ReadMode(Enum):
+    '''How much checking and fixing `read_eds` does while reading a EDS/DCF file.'''
+
+    RAW = 'raw'
+    '''Just load the data as is, nothing is checked or fixed and no diagnostics are reported.
+    The fastest mode, for tools that only read the data.'''
+    FIX = 'fix'
+    '''Check everything and auto-fix what can be fixed (the default).'''
+    VALIDATE = 'validate'
+    '''Check everything and report the same diagnostics as `FIX`, but do not fix anything.'''
+
+
+class _Entries(dict):
+    '''The entries of a section, with the line numbers of the header and each entry.'''
+
+    def __init__(self, line: int):
+        super().__init__()
+        self.line = line
+        self.lines = {}
+
+
+def read_eds(file_path, min_severity: Severity = Severity.INFO,
+             mode: ReadMode = ReadMode.FIX) -> (EDS, Diagnostics):
     '''
     Read a EDS/DCF file.
 
     Paramters
     ---------
-    file_path: str
-        Path to EDS/DCF file
+    file_path: str or file object
+        Path to EDS/DCF file, an already opened (text) file object, or '-' for stdin. Paths
+        ending in ".gz", ".xz", or ".bz2" are decompressed while reading and zip member paths
+        (e.g. "bundle.zip/device.eds") are read directly from the archive. Paths to XDD/XDC
+        files are read with `read_xdd`.
+    min_severity: Severity
+        Diagnostics below this severity are not recorded.
+    mode: ReadMode or str
+        How much checking and fixing to do, see `ReadMode`.
 
     Returns
     -------
     EDS:
         The eds object.
-    list:
-        List of errors that occured when reading in the EDS/DCF.
+    Diagnostics:
+        List of diagnostics for the errors that occured when reading in the EDS/DCF.
     '''
 
-    errors = []
-    var = Variable()
+    mode = ReadMode(mode)
+    fix = mode == ReadMode.FIX
+
+    if is_xdd(file_path):
+        eds, diags = read_xdd(file_path, min_severity)
+        if mode == ReadMode.RAW:
+            diags.clear()
+        else:
+            _fix_pdo_mappings(eds, diags, fix=fix)
+        return eds, diags
 
     eds = EDS()
-    errors = []
+    diags = Diagnostics(min_severity)
+    objects = {}
+    object_lists = {}
 
-    with open(file_path, 'r') as fptr:
-        raw = fptr.read()
+    with open_eds(file_path) as fptr:
+        if mode == ReadMode.RAW:
+            _read_raw(fptr, eds)
+            return eds, diags
 
-    # check for CANopenNode eds/dcf
-    for line in raw.split('\n'):
-        if line.startswith(';StorageLocation'):
-            eds.canopennode = True
-            break
+        for header, raw, comments in _read_sections(fptr):
+            if ';StorageLocation' in raw:  # CANopenNode eds/dcf
+                eds.canopennode = True
 
-    mandatory_objs = []
-    manufacturer_objs = []
-    optional_objs = []
+            match = _INDEX_HEADER.match(header)
+            if match:  # index
+                obj = _read_object(header, raw, comments, diags, fix)
 
-    for section_lines in raw.split('\n\n'):
-        if section_lines == '':
-            continue  # handle new line at EOF
+                eds.add_storage_location(obj.storage_location)
 
-        lines = section_lines.split('\n')
-        header_index = [lines.index(i) for i in lines if i.startswith('[')][0]
-        header = lines[header_index]
+                index = int(match[1], 16)
+                if index in objects:
+                    _diag(diags, 'duplicate-header', header, raw)
+                    continue
 
-        comments = ''
-        for i in lines[:header_index]:
-            comments += i[1:] + '\n'
-        comments = comments[:-1]  # remove trailing '\n'
+                # the default storage location, before its subindexes are checked against it
+                if obj.storage_location == '' and eds.storage_locations:
+                    obj.storage_location = eds.storage_locations[0]
 
-        # read in all seciton entries/values
-        raw = {}
-        for i in lines[header_index + 1:]:
-            if i == '':  # to handle eds with no trailing empty line
+                objects[index] = obj
                 continue
-            entry, value = i.split('=')
-            raw[entry] = value
-
-        if re.match(r'^\[[0-9a-fA-F]{4}\]$', header):  # index
-            if 'ObjectType' in raw:
-                object_type = raw['ObjectType']
-                object_type = ObjectType.from_str(object_type)
-            else:  # if ObjectType is missing it is a VAR
-                object_type = None
 
-            if object_type in [None, ObjectType.VAR]:
-                obj, err = _read_variable(header, raw, comments)
-
-            elif object_type == ObjectType.ARRAY:
-                obj, err = _read_array(header, raw, comments)
-            elif object_type == ObjectType.RECORD:
-                obj, err = _read_record(header, raw, comments)
-
-            sl = obj.storage_location
-            if sl not in eds.storage_locations and sl != '':
-                eds.add_storage_location(sl)
+            match = _SUBINDEX_HEADER.match(header)
+            if match:  # subindex
+                index = int(match[1], 16)
+                subindex = int(match[2], 16)
+
+                parent = objects.get(index)
+                if parent is None or isinstance(parent, Variable):
+                    _diag(diags, 'orphan-subindex', header, raw)
+                    continue
+
+                _read_subindex(parent, index, subindex, header, raw, comments, diags, fix)
+            elif header == '[FileInfo]':
+                eds.file_info = _read_file_info(header, raw, diags)
+            elif header == '[DeviceInfo]':
+                eds.device_info = _read_device_info(header, raw, diags)
+            elif header == '[DeviceComissioning]':  # only in DCFs, only one 'm' in header
+                eds.device_commissioning = _read_device_commissioning(header, raw, diags)
+            elif header == '[DummyUsage]':
+                continue  # TODO
+            elif header == '[Comments]':
+                continue  # TODO
+            elif header in _OBJECT_LISTS:
+                object_lists[header] = _read_object_list(raw)
+            else:
+                _diag(diags, 'unknown-header', header, raw)
 
-            errors += err
+    eds.add_objects(objects)  # only sort the OD once
 
-            index = int(header[1:5], 16)
+    _check_object_lists(eds, object_lists, diags)
+    _fix_pdo_mappings(eds, diags, fix=fix)
 
-            eds[index] = obj
-        elif re.match(r'^\[[0-9a-fA-F]{4}sub[0-9a-fA-F]{1,2}\]$', header):  # subindex
-            var, err = _read_variable(header, raw, comments)
+    return eds, diags
 
-            errors += err
 
-            # subindex 0 is the length of the array or record and must be a uint8
-            if header.endswith('sub0]') and var.data_type != DataType.UNSIGNED8:
-                errors.append(f'{_LEVEL}: subindex 0 for {header} was not a UNSIGNED8')
-                var.data_type = DataType.UNSIGNED8
+def _read_raw(fptr, eds: EDS):
+    '''
+    Load the objects and info sections of a EDS/DCF file as is, for `ReadMode.RAW`.
 
-            # set subindex 0's storage_location
-            sl = eds[index].storage_location
-            if eds[index][0].storage_location == '':
-                eds[index][0].storage_location = sl
+    Nothing is checked or fixed, so this skips the unknown entry checks, the OCTET_STRING
+    reformatting, the subindex checks, the object list cross-checks, and the PDO mapping fixes.
+    Duplicate indexes, orphan subindexes, and unknown sections are silently dropped.
 
-            if sl not in eds.storage_locations and sl != '':
-                eds.add_storage_location(sl)
+    Paramters
+    ---------
+    fptr:
+        Text file object to read lines from.
+    eds: EDS
+        The eds object to load the data into.
+    '''
 
-            index = int(header[1:5], 16)
-            subindex = int(header[8:-1], 16)
+    objects = {}
+    ignored = Diagnostics(Severity.ERROR)  # the info section readers report here, it's dropped
 
-            if eds[index].storage_location != var.storage_location:
-                errors.append(f'{_LEVEL}: StorageLocation of [{index:X}] and {header} did not '
-                              'match')
-                var.storage_location = eds[index].storage_location
+    for header, raw, comments in _read_sections(fptr, entry_lines=False):
+        if ';StorageLocation' in raw:  # CANopenNode eds/dcf
+            eds.canopennode = True
 
-            eds[index][subindex] = var
+        match = _INDEX_HEADER.match(header)
+        if match:  # index
+            index = int(match[1], 16)
+            if index not in objects:
+                objects[index] = obj = _read_object_raw(raw, comments)
+                eds.add_storage_location(obj.storage_location)
+            continue
+
+        match = _SUBINDEX_HEADER.match(header)
+        if match:  # subindex
+            parent = objects.get(int(match[1], 16))
+            if parent is not None and not isinstance(parent, Variable):
+                parent[int(match[2], 16)] = _read_variable_raw(raw, comments)
         elif header == '[FileInfo]':
-            eds.file_info, err = _read_file_info(header, raw)
-            errors += err
+            eds.file_info = _read_file_info(header, raw, ignored)
         elif header == '[DeviceInfo]':
-            eds.device_info, err = _read_device_info(header, raw)
-            errors += err
+            eds.device_info = _read_device_info(header, raw, ignored)
         elif header == '[DeviceComissioning]':  # only in DCFs, only one 'm' in header
-            eds.device_commissioning, err = _read_device_commissioning(header, raw)
-            errors += err
-        elif header == '[DummyUsage]':
-            continue  # TODO
-        elif header == '[Comments]':
-            continue  # TODO
-        elif header == '[MandatoryObjects]':
-            keys = list(raw.keys())
-            keys.remove('SupportedObjects')
-            mandatory_objs = [str2int(raw[i]) for i in keys]
-        elif header == '[OptionalObjects]':
-            keys = list(raw.keys())
-            keys.remove('SupportedObjects')
-            optional_objs = [str2int(raw[i]) for i in keys]
-        elif header == '[ManufacturerObjects]':
-            keys = list(raw.keys())
-            keys.remove('SupportedObjects')
-            manufacturer_objs = [str2int(raw[i]) for i in keys]
-        else:
-            errors.append(f'{_LEVEL}: Unknown header: {header}')
-
-    if mandatory_objs:
-        a = set(mandatory_objs)
-        b = set(eds.mandatory_objects)
-        for i in list(a - b):
-            errors.append(f'{_LEVEL}: 0x{i:X} was missing from [MandatoryObjects]')
-        for i in list(b - a):
-            errors.append(f'{_LEVEL}: 0x{i:X} was in [MandatoryObjects], but does not exist')
-    else:
-        errors.append(f'{_LEVEL}: Section [MandatoryObjects] was missing')
-
-    if optional_objs:
-        a = set(optional_objs)
-        b = set(eds.optional_objects)
-        for i in list(a - b):
-            errors.append(f'{_LEVEL}: 0x{i:X} was missing from [OptionalObjects]')
-        for i in list(b - a):
-            errors.append(f'{_LEVEL}: 0x{i:X} was in [OptionalObjects], but does not exist')
-    else:
-        errors.append(f'{_LEVEL}: Section [OptionalObjects] was missing')
-
-    if manufacturer_objs:
-        a = set(manufacturer_objs)
-        b = set(eds.manufacturer_objects)
-        for i in list(a - b):
-            errors.append(f'{_LEVEL}: 0x{i:X} was missing from [ManufacturerObjects]')
-        for i in list(b - a):
-            errors.append(f'{_LEVEL}: 0x{i:X} was in [ManufacturerObjects], but does not exist')
+            eds.device_commissioning = _read_device_commissioning(header, raw, ignored)
+
+    eds.add_objects(objects)  # only sort the OD once
+
+
+@lru_cache(maxsize=256)
+def _raw_enum(enum_type, value: str, default):
+    '''Convert a enum entry value, for `ReadMode.RAW`. Missing or invalid values are the default.
+
+    The same few values are in every section of a file, so the conversions are cached.
+    '''
+
+    if value is None:
+        return default
+
+    try:
+        return enum_type.from_str(value)
+    except (KeyError, ValueError):
+        return default
+
+
+def _read_object_raw(lines: dict, comments: str) -> Variable:
+    '''Read a index section as is, as a Variable, Array, or Record, for `ReadMode.RAW`.'''
+
+    object_type = _raw_enum(ObjectType, lines.get('ObjectType'), ObjectType.VAR)
+
+    if object_type == ObjectType.ARRAY:
+        obj = Array(lines.get('ParameterName', 'Unknown array name'))
+    elif object_type == ObjectType.RECORD:
+        obj = Record(lines.get('ParameterName', 'Unknown record name'))
     else:
-        errors.append(f'{_LEVEL}: Section [ManufacturerObjects] was missing')
+        return _read_variable_raw(lines, comments)
+
+    obj.comments = comments
+    obj.denotation = lines.get('Denotation', '')
+    if ';StorageLocation' in lines:  # optional, for CANopenNode support
+        obj.storage_location = lines[';StorageLocation']
+
+    return obj
+
+
+def _read_variable_raw(lines: dict, comments: str) -> Variable:
+    '''Read a variable section as is, for `ReadMode.RAW`.'''
+
+    get = lines.get
+    data_type = _raw_enum(DataType, get('DataType'), DataType.UNSIGNED32)
+
+    default_value = get('DefaultValue')
+    if default_value is None:
+        default_value = '' if data_type in _LIST_DATA_TYPES else '0'
+
+    pdo_mapping = get('PDOMapping', '0')
+    try:
+        pdo_mapping = bool(int(pdo_mapping))
+    except ValueError:
+        pdo_mapping = False
+
+    return Variable(
+        comments=comments,
+        parameter_name=get('ParameterName', 'New Variable'),
+        denotation=get('Denotation', ''),
+        data_type=data_type,
+        low_limit=get('LowLimit', ''),
+        high_limit=get('HighLimit', ''),
+        default_value=default_value,
+        access_type=_raw_enum(AccessType, get('AccessType'), AccessType.RW),
+        pdo_mapping=pdo_mapping,
+        storage_location=get(';StorageLocation', ''),
+    )
+
+
+def _check_object_lists(eds: EDS, object_lists: dict, diags: Diagnostics):
+    '''
+    Cross-check the [MandatoryObjects], [OptionalObjects], and [ManufacturerObjects] sections
+    with the objects in the OD.
+
+    Paramters
+    ---------
+    eds: EDS
+        The eds object.
+    object_lists: dict
+        The indexes in each of the object list sections, by section header.
+    diags: Diagnostics
+        List to add diagnostics to.
+    '''
+
+    od_objects = {
+        '[MandatoryObjects]': eds.mandatory_objects,
+        '[OptionalObjects]': eds.optional_objects,
+        '[ManufacturerObjects]': eds.manufacturer_objects,
+    }
+
+    for header in _OBJECT_LISTS:
+        listed = object_lists.get(header)
+        if not listed:
+            diags.add('missing-section', Severity.AUTO_FIXED, header)
+            continue
+
+        a = set(listed)
+        b = set(od_objects[header])
+        for i in sorted(a - b):
+            diags.add('missing-from-list', Severity.AUTO_FIXED, header, index=i)
+        for i in sorted(b - a):
+            diags.add('missing-from-od', Severity.AUTO_FIXED, header, index=i)
 
-    rpdo_para_ind = [i for i in eds.indexes if i >= EDS.RPDO_PARA_START and i < EDS.RPDO_PARA_END]
-    tpdo_para_ind = [i for i in eds.indexes if i >= EDS.TPDO_PARA_START and i < EDS.TPDO_PARA_END]
 
-    for i in rpdo_para_ind + tpdo_para_ind:
+def _is_pdo_mapping_para(index: int) -> bool:
+    '''Check if a index is a RPDO or TPDO mapping parameter.'''
+
+    return EDS.RPDO_PARA_START <= index < EDS.RPDO_PARA_END \
+        or EDS.TPDO_PARA_START <= index < EDS.TPDO_PARA_END
+
+
+def _fix_pdo_mappings(eds: EDS, diags: Diagnostics, indexes: List[int] = None,
+                      fix: bool = True):
+    '''
+    Fix misformatted PDO mapping values and mapping values with the wrong mapped object size.
+
+    Paramters
+    ---------
+    eds: EDS
+        The eds object.
+    diags: Diagnostics
+        List to add diagnostics to.
+    indexes: list
+        Optional list of PDO mapping parameter indexes to check, defaults to all of them.
+    fix: bool
+        If False, only report the problems.
+    '''
+
+    if indexes is None:
+        indexes = [i for i in eds.indexes if _is_pdo_mapping_para(i)]
+
+    for i in indexes:
+        header = f'[{i:X}]'
 
         if i < EDS.TPDO_PARA_START:
             pdo = f'RPDO {i - EDS.RPDO_PARA_START}'
@@ -213,35 +357,257 @@ def read_eds(file_path: str) -> (EDS, list):
             if j == 0:
                 continue
 
-            try:
-                obj_index, obj_subindex, obj_size = pdo_mapping_fields(eds[i][j].default_value)
-            except ValueError:
-                errors.append(f'{_LEVEL}: {pdo} mapping value at subindex 0x{j:02X} was '
-                              f'misformatted, replacing {eds[i][j].default_value} with 0x00000000')
-                eds[i][j].default_value = '0x00000000'
+            map_obj = eds[i][j]
+
+            if not _PDO_MAPPING_VALUE.match(map_obj.default_value):
+                diags.add('pdo-mapping-misformatted', Severity.AUTO_FIXED, header,
+                          'DefaultValue', pdo=pdo, subindex=j, value=map_obj.default_value)
+                if fix:
+                    map_obj.default_value = '0x00000000'
                 continue
 
+            value = map_obj.value
+            if not isinstance(value, int):  # not a integer data type, use the (valid) string
+                value = map_obj.default_value
+
+            obj_index, obj_subindex, obj_size = pdo_mapping_fields(value)
             if obj_index == 0 and obj_subindex == 0 and obj_size == 0:
                 continue
 
-            if isinstance(eds[obj_index], Variable):
-                obj = eds[obj_index]
-            else:
-                obj = eds[obj_index][obj_subindex]
+            obj = eds[obj_index] if obj_index in eds else None
+            if obj is not None and not isinstance(obj, Variable):
+                obj = obj[obj_subindex] if obj_subindex in obj else None
+            if obj is None:
+                diags.add('pdo-mapping-missing-object', Severity.ERROR, header, 'DefaultValue',
+                          pdo=pdo, subindex=j, value=map_obj.default_value)
+                continue
 
             if obj.data_type.size != obj_size:
-                map_obj = eds[i][j]
                 old = map_obj.default_value
-                map_obj.default_value = map_obj.default_value[:-2] + f'{obj.data_type.size:02X}'
-                new = map_obj.default_value
+                new = old[:-2] + f'{obj.data_type.size:02X}'
+                if fix:
+                    map_obj.default_value = new
+
+                diags.add('pdo-mapping-size', Severity.AUTO_FIXED, header, 'DefaultValue',
+                          pdo=pdo, subindex=j, value=old, new_value=new)
+
+
+def read_many(file_paths: Iterable[str], workers: int = None,
+              reader: Callable = None) -> Iterator[Tuple[str, EDS, list]]:
+    '''
+    Read many EDS/DCF files in parallel with a process pool.
+
+    Paramters
+    ---------
+    file_paths: iterable of str
+        Paths to EDS/DCF files. Zip archives are replaced by all of their EDS/DCF members,
+        which are read directly from the archive.
+    workers: int
+        Max number of worker processes. Defaults to the number of CPUs. With 1 worker (or 1
+        file) the files are read in this process.
+    reader: callable
+        Optional function to read a file with, must be a top-level function so it can be
+        pickled (e.g. `read_eds_cached`). Defaults to `read_eds`.
+
+    Yields
+    ------
+    str:
+        The path to the EDS/DCF file, the files are yielded as they finish being read.
+    EDS:
+        The eds object.
+    list:
+        List of errors that occured when reading in the EDS/DCF.
+    '''
+
+    file_paths = expand_archives(file_paths)
+    if reader is None:
+        reader = read_eds
+
+    if workers == 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            eds, errors = reader(file_path)
+            yield file_path, eds, errors
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(reader, i): i for i in file_paths}
+        for future in as_completed(futures):
+            eds, errors = future.result()
+            yield futures[future], eds, errors
+
+
+def _read_sections(fptr, first_line: int = 1,
+                   entry_lines: bool = True) -> Iterator[Tuple[str, _Entries, str]]:
+    '''
+    Tokenize a EDS/DCF file line by line in a single pass.
+
+    Sections can be separated by any number of empty lines (including none) and CRLF line
+    endings are accepted. Comment lines (lines starting with ';') before a header are the
+    comments for that section, except for ';' lines with a '=' inside a section (like
+    ';StorageLocation=...'), which are entries.
+
+    Paramters
+    ---------
+    fptr:
+        Text file object to read lines from.
+    first_line: int
+        The line number of the first line.
+    entry_lines: bool
+        Record the line number of each entry, not just the header. Only needed for diagnostics.
+
+    Yields
+    ------
+    str:
+        The header for the section.
+    _Entries:
+        The entries for the section as dictionary (with their line numbers).
+    str:
+        The comments for the section.
+    '''
+
+    header = None
+    entries = None
+    comments = ''
+    pending_comments = []
+
+    for line_num, line in enumerate(fptr, first_line):
+        line = line.rstrip('\r\n')
+
+        if not line.strip():  # end of section
+            if header is not None:
+                yield header, entries, comments
+                header = None
+        elif line[0] == '[':
+            if header is not None:
+                yield header, entries, comments
+            header = line.strip()
+            entries = _Entries(line_num)
+            comments = '\n'.join(pending_comments)
+            pending_comments = []
+        elif line[0] == ';' and (header is None or pending_comments or '=' not in line):
+            pending_comments.append(line[1:])
+        elif header is not None:
+            entry, _, value = line.partition('=')  # values can contain '='
+            entries[entry] = value
+            if entry_lines:
+                entries.lines[entry] = line_num
+
+    if header is not None:  # handle no new line at EOF
+        yield header, entries, comments
+
+
+def _diag(diags: Diagnostics, code: str, header: str, lines: _Entries, key: str = '',
+          severity: Severity = Severity.AUTO_FIXED, **args):
+    '''
+    Add a diagnostic for a section, with the line and column of the entry (or the header if the
+    entry is missing).
+    '''
+
+    if severity < diags.min_severity:
+        return  # don't bother finding the line and column
+
+    if key in lines.lines:
+        line = lines.lines[key]
+        column = 1 if code == 'unknown-entry' else len(key) + 2  # the start of the value
+    else:
+        line = lines.line
+        column = 1
+
+    diags.add(code, severity, header, key, line, column, **args)
+
+
+def _read_object_list(lines: dict) -> List[int]:
+    '''Read the indexes from a [MandatoryObjects], [OptionalObjects], or [ManufacturerObjects]
+    section.'''
+
+    return [str2int(value) for entry, value in lines.items() if entry != 'SupportedObjects']
+
+
+def _read_object(header: str, lines: _Entries, comments: str, diags: Diagnostics,
+                 fix: bool = True) -> Variable:
+    '''
+    Read a index section as a Variable, Array, or Record depending on its ObjectType.
+
+    Paramters
+    ---------
+    header: str
+        The header for the section.
+    lines: _Entries
+        The entries for the section as dictionary.
+    comments: str
+        The comments for the section.
+    diags: Diagnostics
+        List to add diagnostics to.
+    fix: bool
+        If False, only report the problems.
+
+    Returns
+    -------
+    Variable, Array, or Record:
+        The object pulled from the section lines.
+    '''
 
-                errors.append(f'{_LEVEL}: {pdo} mapping value at subindex 0x{j:02X} had the wrong '
-                              f'mapped object size: {old} -> {new}')
+    if 'ObjectType' in lines:
+        object_type = ObjectType.from_str(lines['ObjectType'])
+    else:  # if ObjectType is missing it is a VAR
+        object_type = ObjectType.VAR
 
-    return eds, errors
+    if object_type == ObjectType.ARRAY:
+        return _read_array(header, lines, comments, diags)
+    elif object_type == ObjectType.RECORD:
+        return _read_record(header, lines, comments, diags)
 
+    return _read_variable(header, lines, comments, diags, fix)
 
-def _read_variable(header: str, lines: dict, comments: str) -> (Variable, list):
+
+def _read_subindex(parent: Record, index: int, subindex: int, header: str, lines: _Entries,
+                   comments: str, diags: Diagnostics, fix: bool = True):
+    '''
+    Read a subindex section and add it to its array or record.
+
+    Paramters
+    ---------
+    parent: Record
+        The array or record the subindex belongs to.
+    index: int
+        The index of the parent object.
+    subindex: int
+        The subindex of the section.
+    header: str
+        The header for the section.
+    lines: _Entries
+        The entries for the section as dictionary.
+    comments: str
+        The comments for the section.
+    diags: Diagnostics
+        List to add diagnostics to.
+    fix: bool
+        If False, only report the problems.
+    '''
+
+    var = _read_variable(header, lines, comments, diags, fix)
+
+    # subindex 0 is the length of the array or record and must be a uint8
+    if subindex == 0 and var.data_type != DataType.UNSIGNED8:
+        _diag(diags, 'subindex-0-data-type', header, lines, 'DataType')
+        if fix:
+            var.data_type = DataType.UNSIGNED8
+
+    # set subindex 0's storage_location
+    sl = parent.storage_location
+    if parent[0].storage_location == '':
+        parent[0].storage_location = sl
+
+    if sl != var.storage_location:
+        _diag(diags, 'storage-location-mismatch', header, lines, ';StorageLocation', index=index)
+        if fix:
+            var.storage_location = sl
+
+    parent[subindex] = var
+
+
+def _read_variable(header: str, lines: _Entries, comments: str, diags: Diagnostics,
+                   fix: bool = True) -> Variable:
     '''
     Read a variable section.
 
@@ -249,25 +615,28 @@ def _read_variable(header: str, lines: dict, comments: str) -> (Variable, list):
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    comments: str
+        The comments for the section.
+    diags: Diagnostics
+        List to add diagnostics to.
+    fix: bool
+        If False, only report the problems and keep the values as is.
 
     Returns
     -------
     Variable:
         The variable pulled from the section lines.
-    list:
-        List of errors that occured when reading in the section lines.
     '''
 
-    errors = []
     var = Variable()
     var.comments = comments
 
     try:
         var.parameter_name = lines['ParameterName']
     except KeyError:
-        errors.append(f'{_LEVEL}: ParameterName was missing from {header}')
+        _diag(diags, 'missing-entry', header, lines, 'ParameterName')
 
     if 'Denotation' in lines:
         var.denotation = lines['Denotation']
@@ -276,35 +645,31 @@ def _read_variable(header: str, lines: dict, comments: str) -> (Variable, list):
         data_type = lines['DataType']
         var.data_type = DataType.from_str(data_type)
     except KeyError:
-        errors.append(f'{_LEVEL}: DataType was missing from {header}')
+        _diag(diags, 'missing-entry', header, lines, 'DataType')
     except ValueError:
-        errors.append(f'{_LEVEL}: DataType value of {data_type} is invalid in {header}')
+        _diag(diags, 'invalid-value', header, lines, 'DataType', value=data_type)
 
     try:
         access_type = lines['AccessType']
         var.access_type = AccessType.from_str(access_type)
     except KeyError:
-        errors.append(f'{_LEVEL}: AccessType was missing from {header}')
+        _diag(diags, 'missing-entry', header, lines, 'AccessType')
     except ValueError:
-        errors.append(f'{_LEVEL}: AccessType value of {access_type} is invalid in {header}')
-
-    list_data_types = [DataType.VISIBLE_STRING, DataType.OCTET_STRING, DataType.UNICODE_STRING,
-                       DataType.DOMAIN]
+        _diag(diags, 'invalid-value', header, lines, 'AccessType', value=access_type)
 
     if 'DefaultValue' in lines:  # optional
-        if var.data_type == DataType.OCTET_STRING:
-            value = lines['DefaultValue']
-            value_ns = value.replace(' ', '')
+        value = lines['DefaultValue']
+        var.default_value = value
 
-            # format OCTET_STRING's default value
-            if re.match(r'^([\da-fA-F]{2} *)*$', value):
-                tmp = [value_ns[i: i + 2] for i in range(0, len(value_ns), 2)]
-                var.default_value = ' '.join(tmp)
-            else:
-                errors.append(f'Octect\'s DefaultValue value of {value} is invalid in {header}')
-        else:
-            var.default_value = lines['DefaultValue']
-    elif var.data_type in list_data_types:
+        if var.data_type == DataType.OCTET_STRING:
+            if not _OCTET_STRING.match(value):
+                _diag(diags, 'invalid-value', header, lines, 'DefaultValue', Severity.ERROR,
+                      value=value)
+                if fix:
+                    var.default_value = ''
+            elif fix and value:  # store OCTET_STRING's default value as bytes
+                var.default_value = bytes.fromhex(value)
+    elif var.data_type in _LIST_DATA_TYPES:
         var.default_value = ''
     else:
         var.default_value = '0'
@@ -315,7 +680,7 @@ def _read_variable(header: str, lines: dict, comments: str) -> (Variable, list):
     except KeyError:
         pass  # optional
     except ValueError:
-        errors.append(f'{_LEVEL}: PDOMapping value of {pdo_mapping} is invalid in {header}')
+        _diag(diags, 'invalid-value', header, lines, 'PDOMapping', value=pdo_mapping)
 
     if 'LowLimit' in lines:  # optional
         var.low_limit = lines['LowLimit']
@@ -328,12 +693,12 @@ def _read_variable(header: str, lines: dict, comments: str) -> (Variable, list):
 
     for i in lines:
         if i not in VARIABLE_ENTRIES:
-            errors.append(f'{_LEVEL}: Unknown entry "{i}" in {header}')
+            _diag(diags, 'unknown-entry', header, lines, i)
 
-    return var, errors
+    return var
 
 
-def _read_array(header: str, lines: dict, comments: str) -> (Array, list):
+def _read_array(header: str, lines: _Entries, comments: str, diags: Diagnostics) -> Array:
     '''
     Read a array section.
 
@@ -341,25 +706,26 @@ def _read_array(header: str, lines: dict, comments: str) -> (Array, list):
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    comments: str
+        The comments for the section.
+    diags: Diagnostics
+        List to add diagnostics to.
 
     Returns
     -------
     Array:
         The array pulled from the section lines.
-    list:
-        List of errors that occured when reading in the section lines.
     '''
 
-    errors = []
     arr = Array('')
     arr.comments = comments
 
     try:
         arr.parameter_name = lines['ParameterName']
     except KeyError:
-        errors.append(f'{_LEVEL}: ParameterName was missing from {header}')
+        _diag(diags, 'missing-entry', header, lines, 'ParameterName')
         arr.parameter_name = 'Unknown array name'
 
     if 'Denotation' in lines:
@@ -372,12 +738,12 @@ def _read_array(header: str, lines: dict, comments: str) -> (Array, list):
 
     for i in lines:
         if i not in ARRAY_RECORD_ENTRIES:
-            errors.append(f'{_LEVEL}: Unknown entry "{i}" in {header}')
+            _diag(diags, 'unknown-entry', header, lines, i)
 
-    return arr, errors
+    return arr
 
 
-def _read_record(header: str, lines: dict, comments: str) -> (Record, list):
+def _read_record(header: str, lines: _Entries, comments: str, diags: Diagnostics) -> Record:
     '''
     Read a record section.
 
@@ -385,25 +751,26 @@ def _read_record(header: str, lines: dict, comments: str) -> (Record, list):
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    comments: str
+        The comments for the section.
+    diags: Diagnostics
+        List to add diagnostics to.
 
     Returns
     -------
     Record:
         The record pulled from the section lines.
-    list:
-        List of errors that occured when reading in the section lines.
     '''
 
-    errors = []
     rec = Record('')
     rec.comments = comments
 
     try:
         rec.parameter_name = lines['ParameterName']
     except KeyError:
-        errors.append(f'{_LEVEL}: ParameterName was missing from {header}')
+        _diag(diags, 'missing-entry', header, lines, 'ParameterName')
         rec.parameter_name = 'Unknown record name'
 
     if 'Denotation' in lines:
@@ -416,12 +783,24 @@ def _read_record(header: str, lines: dict, comments: str) -> (Record, list):
 
     for i in lines:
         if i not in ARRAY_RECORD_ENTRIES:
-            errors.append(f'{_LEVEL}: Unknown entry "{i}" in {header}')
+            _diag(diags, 'unknown-entry', header, lines, i)
+
+    return rec
+
+
+def _read_str_value(header: str, lines: _Entries, diags: Diagnostics, name: str,
+                    default: str) -> str:
+    '''Read the named value from the section or add a diagnostic and use the default.'''
+
+    try:
+        return lines[name]
+    except KeyError:
+        _diag(diags, 'missing-entry', header, lines, name)
 
-    return rec, errors
+    return default
 
 
-def _read_file_info(header: str, lines: dict) -> (FileInfo, list):
+def _read_file_info(header: str, lines: _Entries, diags: Diagnostics) -> FileInfo:
     '''
     Read the device info section.
 
@@ -429,78 +808,42 @@ def _read_file_info(header: str, lines: dict) -> (FileInfo, list):
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    diags: Diagnostics
+        List to add diagnostics to.
 
     Returns
     -------
     FileInfo:
         The file info pulled from the section lines.
-    list:
-        List of errors that occured when reading in the section lines.
     '''
 
-    errors = []
     file_info = FileInfo()
+    args = (header, lines, diags)
 
-    try:
-        file_info.file_name = lines['FileName']
-    except KeyError:
-        errors.append(f'{_LEVEL}: FileName was missing from {header}')
-
-    try:
-        file_info.file_version = _read_int_value(header, lines, 'FileVersion')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        file_info.file_revision = _read_int_value(header, lines, 'FileRevision')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
+    file_info.file_name = _read_str_value(*args, 'FileName', file_info.file_name)
+    file_info.file_version = _read_int_value(*args, 'FileVersion', file_info.file_version)
+    file_info.file_revision = _read_int_value(*args, 'FileRevision', file_info.file_revision)
 
     if file_info.file_name.endswith('.dcf'):  # only in DCFs
-        try:
-            file_info.last_eds = lines['LastEDS']
-        except KeyError:
-            errors.append(f'{_LEVEL}: LastEDS was missing from {header}')
-
-    try:
-        file_info.eds_version = lines['EDSVersion']
-    except KeyError:
-        # optional, if missing it's v3.0
-        file_info.eds_version = '3.0'
-
-    try:
-        file_info.description = lines['Description']
-    except KeyError:
-        errors.append(f'{_LEVEL}: Description was missing from {header}')
+        file_info.last_eds = _read_str_value(*args, 'LastEDS', file_info.last_eds)
 
-    try:
-        file_info.creation_dt = _read_datetime_value(header, lines, 'CreationTime',
-                                                     'CreationDate')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
+    # optional, if missing it's v3.0
+    file_info.eds_version = lines.get('EDSVersion', '3.0')
 
-    try:
-        file_info.created_by = lines['CreatedBy']
-    except KeyError:
-        errors.append(f'{_LEVEL}: CreatedBy was missing from {header}')
+    file_info.description = _read_str_value(*args, 'Description', file_info.description)
+    file_info.creation_dt = _read_datetime_value(*args, 'CreationTime', 'CreationDate',
+                                                 file_info.creation_dt)
+    file_info.created_by = _read_str_value(*args, 'CreatedBy', file_info.created_by)
+    file_info.modification_dt = _read_datetime_value(*args, 'ModificationTime',
+                                                     'ModificationDate', file_info.modification_dt)
+    file_info.modified_by = _read_str_value(*args, 'ModifiedBy', file_info.modified_by)
 
-    try:
-        file_info.modification_dt = _read_datetime_value(header, lines, 'ModificationTime',
-                                                         'ModificationDate')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
+    return file_info
 
-    try:
-        file_info.modified_by = lines['ModifiedBy']
-    except KeyError:
-        errors.append(f'{_LEVEL}: ModifiedBy was missing from {header}')
 
-    return file_info, errors
-
-
-def _read_device_info(header: str, lines: dict) -> (DeviceInfo, list):
+def _read_device_info(header: str, lines: _Entries, diags: Diagnostics) -> DeviceInfo:
     '''
     Read the device info section.
 
@@ -508,98 +851,50 @@ def _read_device_info(header: str, lines: dict) -> (DeviceInfo, list):
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    diags: Diagnostics
+        List to add diagnostics to.
 
     Returns
     -------
     DeviceInfo:
         The device info pulled from the section lines.
-    list:
-        List of errors that occured when reading in the section lines.
     '''
 
-    errors = []
     device_info = DeviceInfo()
+    args = (header, lines, diags)
 
-    try:
-        device_info.vendor_name = lines['VendorName']
-    except KeyError:
-        errors.append(f'{_LEVEL}: VendorName was missing from {header}')
-
-    try:
-        device_info.vendor_number = _read_int_value(header, lines, 'VendorNumber')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.product_name = lines['ProductName']
-    except KeyError:
-        errors.append(f'{_LEVEL}: ProductName was missing from {header}')
-
-    try:
-        device_info.product_number = _read_int_value(header, lines, 'ProductNumber')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.revision_number = _read_int_value(header, lines, 'RevisionNumber')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.order_code = lines['OrderCode']
-    except KeyError:
-        errors.append(f'{_LEVEL}: OrderCode was missing from {header}')
+    device_info.vendor_name = _read_str_value(*args, 'VendorName', device_info.vendor_name)
+    device_info.vendor_number = _read_int_value(*args, 'VendorNumber', device_info.vendor_number)
+    device_info.product_name = _read_str_value(*args, 'ProductName', device_info.product_name)
+    device_info.product_number = _read_int_value(*args, 'ProductNumber',
+                                                 device_info.product_number)
+    device_info.revision_number = _read_int_value(*args, 'RevisionNumber',
+                                                  device_info.revision_number)
+    device_info.order_code = _read_str_value(*args, 'OrderCode', device_info.order_code)
 
     for i in BAUD_RATE:
-        try:
-            device_info.baud_rate[i] = _read_bool_value(header, lines, f'BaudRate_{i}')
-        except ValueError as exc:
-            errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.simple_boot_up_master = _read_bool_value(header, lines,
-                                                             'SimpleBootUpMaster')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.simple_boot_up_slave = _read_bool_value(header, lines,
-                                                            'SimpleBootUpSlave')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.grandularity = _read_int_value(header, lines, 'Granularity')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.dynamic_channel_supperted = _read_bool_value(header, lines,
-                                                                 'DynamicChannelsSupported')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.num_of_rpdo = _read_int_value(header, lines, 'NrOfRXPDO')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.num_of_tpdo = _read_int_value(header, lines, 'NrOfTXPDO')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_info.lss_supported = _read_bool_value(header, lines, 'LSS_Supported')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    return device_info, errors
-
-
-def _read_device_commissioning(header: str, lines: dict) -> (DeviceCommissioning, list):
+        device_info.baud_rate[i] = _read_bool_value(*args, f'BaudRate_{i}',
+                                                    device_info.baud_rate[i])
+
+    device_info.simple_boot_up_master = _read_bool_value(*args, 'SimpleBootUpMaster',
+                                                         device_info.simple_boot_up_master)
+    device_info.simple_boot_up_slave = _read_bool_value(*args, 'SimpleBootUpSlave',
+                                                        device_info.simple_boot_up_slave)
+    device_info.grandularity = _read_int_value(*args, 'Granularity', device_info.grandularity)
+    device_info.dynamic_channel_supperted = _read_bool_value(
+        *args, 'DynamicChannelsSupported', device_info.dynamic_channel_supperted)
+    device_info.num_of_rpdo = _read_int_value(*args, 'NrOfRXPDO', device_info.num_of_rpdo)
+    device_info.num_of_tpdo = _read_int_value(*args, 'NrOfTXPDO', device_info.num_of_tpdo)
+    device_info.lss_supported = _read_bool_value(*args, 'LSS_Supported',
+                                                 device_info.lss_supported)
+
+    return device_info
+
+
+def _read_device_commissioning(header: str, lines: _Entries,
+                               diags: Diagnostics) -> DeviceCommissioning:
     '''
     Read the device commissioning section.
 
@@ -607,66 +902,42 @@ def _read_device_commissioning(header: str, lines: dict) -> (DeviceCommissioning
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    diags: Diagnostics
+        List to add diagnostics to.
 
     Returns
     -------
     DeviceCommissioning:
         The device commissioning info pulled from the section lines.
-    list:
-        List of errors that occured when reading in the section lines.
     '''
 
-    errors = []
     device_comm = DeviceCommissioning()
+    args = (header, lines, diags)
 
-    try:
-        device_comm.node_id = _read_int_value(header, lines, 'NodeID')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_comm.node_name = lines['NodeName']
-    except KeyError:
-        errors.append(f'{_LEVEL}: NodeName was missing from {header}')
-
-    try:
-        try:
-            temp = _read_int_value(header, lines, 'Baudrate')
-        except Exception:
-            temp = _read_int_value(header, lines, 'BaudRate')
-        if temp in BAUD_RATE:
-            device_comm.baud_rate = temp
-        else:
-            errors.append(f'{_LEVEL}: Baudrate in {header} was not a valid CANopen baud rate')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_comm.net_number = _read_int_value(header, lines, 'NetNumber')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
+    device_comm.node_id = _read_int_value(*args, 'NodeID', device_comm.node_id)
+    device_comm.node_name = _read_str_value(*args, 'NodeName', device_comm.node_name)
 
-    try:
-        device_comm.network_name = lines['NetworkName']
-    except KeyError:
-        errors.append(f'{_LEVEL}: NetworkName was missing from {header}')
+    name = 'Baudrate' if 'Baudrate' in lines else 'BaudRate'
+    baud_rate = _read_int_value(*args, name, None)
+    if baud_rate in BAUD_RATE:
+        device_comm.baud_rate = baud_rate
+    elif baud_rate is not None:
+        _diag(diags, 'invalid-baud-rate', header, lines, name)
 
-    try:
-        device_comm.canopen_manager = _read_bool_value(header, lines, 'CANopenManager')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
-
-    try:
-        device_comm.lss_serialnumber = _read_bool_value(header, lines, 'LSS_SerialNumber')
-    except ValueError as exc:
-        errors.append(f'{_LEVEL}: {exc}')
+    device_comm.net_number = _read_int_value(*args, 'NetNumber', device_comm.net_number)
+    device_comm.network_name = _read_str_value(*args, 'NetworkName', device_comm.network_name)
+    device_comm.canopen_manager = _read_bool_value(*args, 'CANopenManager',
+                                                   device_comm.canopen_manager)
+    device_comm.lss_serialnumber = _read_bool_value(*args, 'LSS_SerialNumber',
+                                                    device_comm.lss_serialnumber)
 
-    return device_comm, errors
+    return device_comm
 
 
-def _read_bool_value(header: str, lines: dict, name: str) -> bool:
+def _read_bool_value(header: str, lines: _Entries, diags: Diagnostics, name: str,
+                     default: bool) -> bool:
     '''
     Read the named value from the section and convert value to a boolean.
 
@@ -674,15 +945,14 @@ def _read_bool_value(header: str, lines: dict, name: str) -> bool:
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    diags: Diagnostics
+        List to add diagnostics to if the value is missing or misformatted.
     name: str
         The name of the int value.
-
-    Raises
-    ------
-    ValueError:
-        Values were missing or misformatted.
+    default: bool
+        The value to use if the value is missing or misformatted.
 
     Returns
     -------
@@ -690,10 +960,13 @@ def _read_bool_value(header: str, lines: dict, name: str) -> bool:
         The value as a bool.
     '''
 
-    return bool(_read_int_value(header, lines, name))
+    value = _read_int_value(header, lines, diags, name, None)
 
+    return default if value is None else bool(value)
 
-def _read_int_value(header: str, lines: dict, name: str) -> int:
+
+def _read_int_value(header: str, lines: _Entries, diags: Diagnostics, name: str,
+                    default: int) -> int:
     '''
     Read the named value from the section and convert value to a integer.
 
@@ -701,15 +974,14 @@ def _read_int_value(header: str, lines: dict, name: str) -> int:
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    diags: Diagnostics
+        List to add diagnostics to if the value is missing or misformatted.
     name: str
         The name of the int value.
-
-    Raises
-    ------
-    ValueError:
-        Value were missing or misformatted.
+    default: int
+        The value to use if the value is missing or misformatted.
 
     Returns
     -------
@@ -718,17 +990,17 @@ def _read_int_value(header: str, lines: dict, name: str) -> int:
     '''
 
     try:
-        temp = lines[name]
-        value = str2int(temp)
+        return str2int(lines[name])
     except KeyError:
-        raise ValueError(f'{name} was missing from {header}')
+        _diag(diags, 'missing-entry', header, lines, name)
     except ValueError:
-        raise ValueError(f'{name} was incorrectly formatted in {header}')
+        _diag(diags, 'misformatted-entry', header, lines, name)
 
-    return value
+    return default
 
 
-def _read_datetime_value(header: str, lines: dict, time_name: str, date_name: str) -> datetime:
+def _read_datetime_value(header: str, lines: _Entries, diags: Diagnostics, time_name: str,
+                         date_name: str, default: datetime) -> datetime:
     '''
     Read the time and date values from the section and convert values to a `datetime` object.
 
@@ -736,17 +1008,16 @@ def _read_datetime_value(header: str, lines: dict, time_name: str, date_name: st
     ---------
     header: str
         The header for the section.
-    lines: dict
+    lines: _Entries
         The entries for the section as dictionary.
+    diags: Diagnostics
+        List to add diagnostics to if the values are missing or misformatted.
     time_name: str
         The name of the time value.
     time_name: str
         The name of the date value.
-
-    Raises
-    ------
-    ValueError:
-        Values were missing or misformatted.
+    default: datetime
+        The value to use if the values are missing or misformatted.
 
     Returns
     -------
@@ -757,10 +1028,10 @@ def _read_datetime_value(header: str, lines: dict, time_name: str, date_name: st
     try:
         time = lines[time_name]
         date = lines[date_name]
-        value = datetime.now().strptime(f'{date} {time}', '%m-%d-%Y %I:%M%p')
+        return datetime.now().strptime(f'{date} {time}', '%m-%d-%Y %I:%M%p')
     except KeyError:
-        raise ValueError(f'{time_name} or {date_name} was missing from {header}')
+        _diag(diags, 'missing-entries', header, lines, time_name, other_key=date_name)
     except ValueError:
-        raise ValueError(f'{time_name} or {date_name} was incorrectly formatted in {header}')
+        _diag(diags, 'misformatted-entries', header, lines, time_name, other_key=date_name)
 
-    return value
+    return default
@@ -0,0 +1,506 @@
+'''Everything to re-read an eds/dcf file, only the sections that changed are read in again'''
+
+import io
+import re
+import hashlib
+from bisect import bisect_left, bisect_right
+
+from .. import pdo_mapping_fields
+from ..diagnostic import Severity, Diagnostics
+from ..eds import EDS
+from ..objects import Variable
+from .archive import open_eds
+from .read_eds import read_eds, _INDEX_HEADER, _SUBINDEX_HEADER, _OBJECT_LISTS, _read_sections, \
+    _read_object, _read_subindex, _read_object_list, _read_file_info, _read_device_info, \
+    _read_device_commissioning, _check_object_lists, _fix_pdo_mappings, _diag
+
+_HEADER = re.compile(r'^\[.*$', re.MULTILINE)
+_COMMENT = re.compile(r'^;', re.MULTILINE)
+
+_SKIPPED_HEADERS = ['[DummyUsage]', '[Comments]']
+'''Headers that are not read in'''
+
+_INFO_HEADERS = {
+    '[FileInfo]': 'file_info',
+    '[DeviceInfo]': 'device_info',
+    '[DeviceComissioning]': 'device_commissioning',  # only in DCFs, only one 'm' in header
+}
+'''The EDS attribute for each info section'''
+
+_PDO_MAPPING_RANGES = [(EDS.RPDO_PARA_START, EDS.RPDO_PARA_END),
+                       (EDS.TPDO_PARA_START, EDS.TPDO_PARA_END)]
+
+# a section is a (header, key, pos, start, end, line, hash) tuple, where the key is the index for
+# index and subindex sections or the header for all others and the pos is the position of the
+# section in all the sections with the same key
+_KEY = 1
+_POS = 2
+_START = 3
+_END = 4
+_LINE = 5
+_HASH = 6
+
+
+class _Unit:
+    '''
+    All the sections with the same key (a index and its subindexes or another header) and
+    everything read in from them.
+    '''
+
+    __slots__ = ('signature', 'lines', 'diags', 'value', 'storage_locations', 'canopennode',
+                 'default', 'pdo_diags', 'refs')
+
+    def __init__(self, signature: tuple):
+        self.signature = signature  # the hashes of the sections
+        self.lines = []  # the line each section started on when it was read in
+        self.diags = []  # the diagnostics for each section
+        self.value = None  # the object, info, or object list read in
+        self.storage_locations = []  # the storage location of each section
+        self.canopennode = False
+        self.default = ''  # for objects, the default storage location it was read with
+        self.pdo_diags = []  # for PDO mapping parameters, the diagnostics of the fixes
+        self.refs = set()  # for PDO mapping parameters, the indexes they map
+
+
+class IncrementalReader:
+    '''
+    Reads a EDS/DCF file and then re-reads it after it is changed, only reading in the sections
+    whose content changed since the last read.
+
+    On a re-read the new text is compared with the text of the last read to find the region that
+    changed and only the sections around that region are split out and hashed again. The objects
+    (a index and its subindexes) and other sections whose hashes changed are read in again and
+    patched into the same `EDS`. Only the auto-fixes the changes can affect are re-done: the
+    [MandatoryObjects], [OptionalObjects], and [ManufacturerObjects] cross-checks if one of the
+    lists or the set of indexes changed and the PDO mapping fixes for the PDO mapping parameters
+    that changed or map a changed object.
+
+    The result of each read is the same as `read_eds` on the file.
+    '''
+
+    def __init__(self, file_path, min_severity: Severity = Severity.INFO):
+        '''
+        Parameters
+        ----------
+        file_path: str
+            Path to EDS/DCF file.
+        min_severity: Severity
+            Diagnostics below this severity are not recorded.
+        '''
+
+        self.file_path = file_path
+        self.min_severity = min_severity
+        self.eds = None
+        self._reset()
+
+    def _reset(self):
+        '''Forget everything from the last read, so the next read reads in the whole file.'''
+
+        self.eds = None
+        self._text = ''
+        self._sections = []
+        self._units = {}
+        self._storage_locations = []
+        self._list_diags = Diagnostics(self.min_severity)
+
+    def read(self) -> (EDS, Diagnostics):
+        '''
+        Read the EDS/DCF file, only reading in the sections that changed since the last read.
+
+        Objects that changed are replaced in the `EDS`, all other objects are left as is.
+
+        Returns
+        -------
+        EDS:
+            The eds object, the same object for every read (unless a change to the storage
+            locations or to the layout of the file needed a full read).
+        Diagnostics:
+            List of diagnostics for the errors that occured when reading in the EDS/DCF.
+        '''
+
+        with open_eds(self.file_path) as fptr:
+            text = fptr.read()
+
+        return self._read_text(text)
+
+    def _read_text(self, text: str) -> (EDS, Diagnostics):
+        '''Read the text of the EDS/DCF, only reading in the sections that changed.'''
+
+        affected = self._split(text)
+        if affected is None:  # cannot be split into sections, read in the whole file
+            self._reset()
+            return read_eds(io.StringIO(text), self.min_severity)
+
+        units = self._units
+        sections = self._sections
+
+        # find all the sections of the affected keys
+        grouped = {key: [] for key in affected}
+        for i, section in enumerate(sections):
+            group = grouped.get(section[_KEY])
+            if group is not None:
+                if section[_POS] != len(group):
+                    section = section[:_POS] + (len(group),) + section[_POS + 1:]
+                    sections[i] = section
+                group.append(section)
+
+        changed = set()
+        removed = set()
+        for key, group in grouped.items():
+            signature = tuple(i[_HASH] for i in group)
+            if not group:
+                if units.pop(key, None) is not None:
+                    removed.add(key)
+            elif key not in units or units[key].signature != signature:
+                units[key] = _Unit(signature)
+                changed.add(key)
+
+        parsed = {key: _parse_sections(text, grouped[key]) for key in changed}
+
+        # like read_eds, the first storage location above a object is applied to it (if it has
+        # none) before its subindexes are checked against it
+        storage_locations = []
+        defaults = {}
+        for section in sections:
+            key = section[_KEY]
+            if not isinstance(key, int) or not _INDEX_HEADER.match(section[0]):
+                continue
+            if key not in defaults:
+                defaults[key] = storage_locations[0] if storage_locations else ''
+            if key in parsed:
+                sl = parsed[key][section[_POS]][1].get(';StorageLocation', '')
+            else:
+                sl = units[key].storage_locations[section[_POS]]
+            if sl and sl not in storage_locations:
+                storage_locations.append(sl)
+
+        if self.eds is not None and storage_locations != self._storage_locations:
+            # default storage locations were applied to the unchanged objects, read them again
+            self._reset()
+            return self._read_text(text)
+
+        # objects that now have a different default storage location must be read in again
+        for key, default in defaults.items():
+            if key not in changed and units[key].default != default:
+                units[key] = _Unit(units[key].signature)
+                changed.add(key)
+                grouped[key] = [i for i in sections if i[_KEY] == key]
+
+        # PDO mapping parameters that map a changed object must be read in and fixed again
+        moved = {i for i in changed | removed if isinstance(i, int)}
+        if moved and self.eds is not None:
+            for index in self._pdo_mapping_indexes():
+                unit = units[index]
+                if index not in changed and unit.refs & moved:
+                    units[index] = _Unit(unit.signature)
+                    changed.add(index)
+                    grouped[index] = [i for i in sections if i[_KEY] == index]
+
+        for key in changed:
+            if key not in parsed:
+                parsed[key] = _parse_sections(text, grouped[key])
+            self._read_unit(key, grouped[key], parsed[key], defaults.get(key, ''))
+
+        self._text = text
+        self._storage_locations = storage_locations
+        self._patch(changed, removed)
+
+        return self.eds, self._diagnostics()
+
+    def _split(self, text: str) -> set:
+        '''
+        Split the text into sections, only splitting the region that changed since the last read.
+
+        Returns the keys of all the sections that were split again or None if the text cannot be
+        split into sections.
+        '''
+
+        old_text = self._text
+        old_sections = self._sections
+
+        if self.eds is None:
+            sections = _section_ranges(text, 0, len(text), 1)
+            if sections is None:
+                return None
+            self._sections = sections
+            return {i[_KEY] for i in sections}
+
+        if old_text == text:
+            return set()
+
+        # the region that changed is old_text[prefix:old_end] / text[prefix:new_end]
+        prefix = _common_prefix(old_text, text)
+        suffix = _common_suffix(old_text, text, min(len(old_text), len(text)) - prefix)
+        old_end = len(old_text) - suffix
+
+        # re-split from the section before the change to the section after the change, as
+        # changes can move lines between sections
+        starts = [i[_START] for i in old_sections]
+        first = max(bisect_right(starts, prefix) - 2, 0)
+        last = min(bisect_left(starts, old_end) + 1, len(old_sections))
+
+        start = old_sections[first][_START] if first > 0 else 0
+        line = old_sections[first][_LINE] if first > 0 else 1
+        old_stop = old_sections[last][_START] if last < len(old_sections) else len(old_text)
+        shift = len(text) - len(old_text)
+        stop = old_stop + shift
+
+        resplit = _section_ranges(text, start, stop, line)
+        if resplit is None:
+            return None
+
+        line_shift = text.count('\n', start, stop) - old_text.count('\n', start, old_stop)
+        after = old_sections[last:]
+        if shift or line_shift:
+            after = [i[:_START] + (i[_START] + shift, i[_END] + shift, i[_LINE] + line_shift,
+                                   i[_HASH]) for i in after]
+
+        self._sections = old_sections[:first] + resplit + after
+
+        return {i[_KEY] for i in old_sections[first:last]} | {i[_KEY] for i in resplit}
+
+    def _read_unit(self, key, sections: list, parsed: list, default: str):
+        '''Read in all the sections for a key, from the header, entries, and comments of each.'''
+
+        unit = self._units[key]
+        unit.default = default
+
+        for section, (header, lines, comments) in zip(sections, parsed):
+            diags = Diagnostics(self.min_severity)
+            sl = None
+
+            if isinstance(key, int):
+                sl = self._read_object_section(unit, key, header, lines, comments, diags)
+            elif header == '[FileInfo]':
+                unit.value = _read_file_info(header, lines, diags)
+            elif header == '[DeviceInfo]':
+                unit.value = _read_device_info(header, lines, diags)
+            elif header == '[DeviceComissioning]':  # only in DCFs, only one 'm' in header
+                unit.value = _read_device_commissioning(header, lines, diags)
+            elif header in _OBJECT_LISTS:
+                unit.value = _read_object_list(lines)
+            elif header not in _SKIPPED_HEADERS:
+                _diag(diags, 'unknown-header', header, lines)
+
+            unit.lines.append(section[_LINE])
+            unit.diags.append(diags)
+            unit.storage_locations.append(sl)
+            unit.canopennode |= ';StorageLocation' in lines
+
+    def _read_object_section(self, unit: _Unit, index: int, header: str, lines: dict,
+                             comments: str, diags: Diagnostics) -> str:
+        '''
+        Read a index or subindex section into a unit, like `read_eds` does. Returns the storage
+        location of a index section (before the default is applied).
+        '''
+
+        match = _SUBINDEX_HEADER.match(header)
+        if match is None:  # index
+            obj = _read_object(header, lines, comments, diags)
+            sl = obj.storage_location
+            if unit.value is not None:
+                _diag(diags, 'duplicate-header', header, lines)
+            else:
+                if sl == '' and unit.default:
+                    obj.storage_location = unit.default
+                unit.value = obj
+            return sl
+
+        if unit.value is None or isinstance(unit.value, Variable):
+            _diag(diags, 'orphan-subindex', header, lines)
+        else:
+            _read_subindex(unit.value, index, int(match[2], 16), header, lines, comments, diags)
+
+        return None
+
+    def _patch(self, changed: set, removed: set):
+        '''Patch the changes into the EDS (or make it) and re-do the auto-fixes they affect.'''
+
+        units = self._units
+        full = self.eds is None
+
+        if full:
+            self.eds = EDS()
+            for i in self._storage_locations:
+                self.eds.add_storage_location(i)
+
+        eds = self.eds
+        old_indexes = set(eds.indexes)
+
+        objects = {}
+        for key in changed | removed:
+            if not isinstance(key, int):
+                continue
+            if key in units and units[key].value is not None:
+                objects[key] = units[key].value
+            elif key in old_indexes:
+                del eds[key]
+        eds.add_objects(objects, replace=True)
+
+        for header, attr in _INFO_HEADERS.items():
+            if header in changed or header in removed:
+                unit = units.get(header)
+                setattr(eds, attr, type(getattr(eds, attr))() if unit is None else unit.value)
+
+        if changed or removed:
+            eds.canopennode = any(i.canopennode for i in units.values())
+
+        if full or len(eds) != len(old_indexes) or set(eds.indexes) != old_indexes \
+                or any(i in changed or i in removed for i in _OBJECT_LISTS):
+            object_lists = {i: units[i].value for i in _OBJECT_LISTS if i in units}
+            self._list_diags = Diagnostics(self.min_severity)
+            _check_object_lists(eds, object_lists, self._list_diags)
+
+        for index in self._pdo_mapping_indexes():
+            if index in changed:
+                unit = units[index]
+                unit.pdo_diags = Diagnostics(self.min_severity)
+                _fix_pdo_mappings(eds, unit.pdo_diags, [index])
+                unit.refs = {pdo_mapping_fields(eds[index][i].default_value)[0]
+                             for i in eds[index].subindexes if i != 0} - {0}
+
+    def _pdo_mapping_indexes(self) -> list:
+        '''Get the indexes of all PDO mapping parameters in the OD.'''
+
+        indexes = self.eds.indexes
+
+        return [i for start, end in _PDO_MAPPING_RANGES
+                for i in indexes[bisect_left(indexes, start):bisect_left(indexes, end)]]
+
+    def _diagnostics(self) -> Diagnostics:
+        '''Collect the diagnostics of all sections in the same order as `read_eds`.'''
+
+        diags = Diagnostics(self.min_severity)
+        units = self._units
+
+        for section in self._sections:
+            unit = units[section[_KEY]]
+            pos = section[_POS]
+            if unit.diags[pos]:
+                shift = section[_LINE] - unit.lines[pos]
+                if shift:  # unchanged, but moved
+                    for i in unit.diags[pos]:
+                        if i.line:
+                            i.line += shift
+                    unit.lines[pos] = section[_LINE]
+                diags += unit.diags[pos]
+
+        diags += self._list_diags
+        for index in self._pdo_mapping_indexes():
+            diags += units[index].pdo_diags
+
+        return diags
+
+
+def _common_prefix(a: str, b: str) -> int:
+    '''Get the length of the common prefix of two strings.'''
+
+    low = 0
+    high = min(len(a), len(b))
+
+    while low < high:  # a[:low] == b[:low]
+        mid = (low + high + 1) // 2
+        if a[low:mid] == b[low:mid]:
+            low = mid
+        else:
+            high = mid - 1
+
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    '''Get the length of the common suffix of two strings, up to a limit.'''
+
+    low = 0
+    high = limit
+    len_a = len(a)
+    len_b = len(b)
+
+    while low < high:  # a[len_a - low:] == b[len_b - low:]
+        mid = (low + high + 1) // 2
+        if a[len_a - mid:len_a - low] == b[len_b - mid:len_b - low]:
+            low = mid
+        else:
+            high = mid - 1
+
+    return low
+
+
+def _parse_sections(text: str, sections: list) -> list:
+    '''Get the header, entries, and comments of each section.'''
+
+    return [next(_read_sections(io.StringIO(text[i[_START]:i[_END]]), i[_LINE]))
+            for i in sections]
+
+
+def _hash(text: str) -> bytes:
+    '''Hash the content of a section.'''
+
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def _section_ranges(text: str, start: int, stop: int, line: int) -> list:
+    '''
+    Split a region of the text of a EDS/DCF into sections. The region must start at the start
+    of a section (or the file) and stop at the start of a section (or the end of the file).
+
+    The lines are classified the same way `_read_sections` does, so reading in the text of a
+    section gives the same section. Returns None if a section is not one continuous range (an entry
+    after comment lines that belong to the next section), which can only be read in as a whole
+    file.
+    '''
+
+    ranges = []
+    prev = start  # where the line count is up to
+    gap_start = start  # the start of the line after the previous header
+    is_open = False  # entries are still added to the previous section
+
+    for match in _HEADER.finditer(text, start, stop):
+        section_start = match.start()
+
+        if _COMMENT.search(text, gap_start, section_start):  # only look at comment lines
+            section_start = _comment_start(text, gap_start, section_start, is_open)
+            if section_start is None:
+                return None
+
+        line += text.count('\n', prev, section_start)
+        prev = section_start
+        ranges.append((match.group().strip(), section_start, line))
+
+        gap_start = match.end() + 1
+        is_open = True
+
+    sections = []
+    ends = [i[1] for i in ranges[1:]] + [stop]
+    for (header, section_start, line), end in zip(ranges, ends):
+        match = _INDEX_HEADER.match(header) or _SUBINDEX_HEADER.match(header)
+        key = int(match[1], 16) if match else header
+        sections.append((header, key, -1, section_start, end, line,
+                         _hash(text[section_start:end])))
+
+    return sections
+
+
+def _comment_start(text: str, start: int, end: int, is_open: bool) -> int:
+    '''
+    Find where the comments for the header at end start, classifying the lines between start and
+    end like `_read_sections` does. Returns None if there is a entry for the previous section after
+    those comments.
+    '''
+
+    comments = None
+
+    for line in text[start:end].splitlines(True):
+        stripped = line.rstrip('\r\n')
+
+        if not stripped.strip():
+            is_open = False
+        elif stripped[0] == ';' and (not is_open or comments is not None or '=' not in stripped):
+            if comments is None:
+                comments = start
+        elif is_open and comments is not None:
+            return None
+
+        start += len(line)
+
+    return end if comments is None else comments
@@ -0,0 +1,285 @@
+'''Everything to lazily read an eds/dcf file, objects are only read in when they are accessed'''
+
+import io
+import os
+import re
+import mmap
+import locale
+from typing import List
+
+from ..diagnostic import Severity, Diagnostics
+from ..eds import EDS
+from ..objects import Variable
+from .archive import COMPRESSORS, split_member
+from .read_eds import _INDEX_HEADER, _SUBINDEX_HEADER, _read_sections, _read_object, \
+    _read_subindex, _read_file_info, _read_device_info, _read_device_commissioning, _diag
+
+_HEADER = re.compile(rb'^\[[^\]\r\n]*\][ \t]*\r?$', re.MULTILINE)
+_STORAGE_LOCATION = re.compile(rb'^;StorageLocation=([^\r\n]*)', re.MULTILINE)
+
+_SKIPPED_HEADERS = [
+    '[DummyUsage]',
+    '[Comments]',
+    '[MandatoryObjects]',
+    '[OptionalObjects]',
+    '[ManufacturerObjects]',
+]
+'''Headers the lazy reader does not need to read in'''
+
+
+class LazyEDS(EDS):
+    '''
+    A EDS that memory-maps its EDS/DCF file and only indexes where each object's sections are.
+
+    Objects are read in the first time they are accessed with `[]`. Anything that needs the
+    whole object dictionary (adding, removing, or moving objects, comparisons, queries, etc)
+    will read in all remaining objects first, the object lists and `range` only need the
+    indexes.
+
+    The OD wide auto-fixes of `read_eds` (the [MandatoryObjects], [OptionalObjects], and
+    [ManufacturerObjects] cross-checks and the PDO mapping fixes) are not done.
+    '''
+
+    def __init__(self, file_path: str, min_severity: Severity = Severity.INFO):
+        '''
+        Parameters
+        ----------
+        file_path: str
+            Path to EDS/DCF file.
+        min_severity: Severity
+            Diagnostics below this severity are not recorded.
+
+        Raises
+        ------
+        ValueError:
+            The file is compressed or in a zip archive, which cannot be memory-mapped.
+        '''
+
+        if os.path.splitext(file_path)[1].lower() in COMPRESSORS \
+                or split_member(file_path)[1] is not None:
+            raise ValueError(f'cannot memory-map {file_path}, use read_eds instead')
+
+        super().__init__()
+
+        self.errors = Diagnostics(min_severity)
+        self._pending = {}
+        self._order = []
+        self._encoding = locale.getpreferredencoding(False)
+
+        self._fptr = open(file_path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._fptr.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file, nothing to index
+            self._fptr.close()
+            self._fptr = None
+            self._mm = None
+            return
+
+        self._index_sections()
+
+    def __getstate__(self) -> dict:
+        # the file can not be copied or pickled, so read in everything and release it first
+        self.load_all()
+        state = super().__getstate__()
+        state['_data'] = state.pop('_objects')
+        state['_fptr'] = None
+        state['_mm'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        state = dict(state)
+        state['_objects'] = state.pop('_data')
+        super().__setstate__(state)
+
+    def _index_sections(self):
+        '''
+        Find the byte range (and the line number it starts on) of every section and read in the
+        non-object sections.
+        '''
+
+        mm = self._mm
+
+        if mm.find(b'\n;StorageLocation') != -1 or mm[:16] == b';StorageLocation':
+            self.canopennode = True
+            for match in _STORAGE_LOCATION.finditer(mm):
+                self.add_storage_location(match[1].decode(self._encoding).strip())
+
+        headers = [(m.group().decode(self._encoding).strip(), _comment_start(mm, m.start()))
+                   for m in _HEADER.finditer(mm)]
+        ends = [start for _, start in headers[1:]] + [len(mm)]
+
+        subindexes = {}
+        line = 1
+        prev = 0
+        for (header, start), end in zip(headers, ends):
+            line += mm[prev:start].count(b'\n')  # only count each byte once
+            prev = start
+            section = (start, end, line)
+
+            match = _INDEX_HEADER.match(header)
+            if match:
+                index = int(match[1], 16)
+                if index in self._pending:  # keep the first one, like read_eds
+                    _diag(self.errors, 'duplicate-header', header, self._read_range(*section))
+                else:
+                    self._pending[index] = [section]
+                continue
+
+            match = _SUBINDEX_HEADER.match(header)
+            if match:
+                subindexes.setdefault(int(match[1], 16), []).append(section)
+            elif header == '[FileInfo]':
+                self.file_info = _read_file_info(header, self._read_range(*section),
+                                                 self.errors)
+            elif header == '[DeviceInfo]':
+                self.device_info = _read_device_info(header, self._read_range(*section),
+                                                     self.errors)
+            elif header == '[DeviceComissioning]':  # only in DCFs, only one 'm' in header
+                self.device_commissioning = _read_device_commissioning(
+                    header, self._read_range(*section), self.errors)
+            elif header not in _SKIPPED_HEADERS:
+                _diag(self.errors, 'unknown-header', header, self._read_range(*section))
+
+        for index, sections in subindexes.items():
+            if index in self._pending:
+                self._pending[index] += sections
+                continue
+
+            for section in sections:
+                header, lines, _ = self._read_section(*section)
+                _diag(self.errors, 'orphan-subindex', header, lines)
+
+        self._order = sorted(self._pending)
+
+        if not self._pending:
+            self._close()
+
+    def _read_section(self, start: int, end: int, line: int) -> tuple:
+        '''Read the header, entries, and comments of the single section in a byte range.'''
+
+        text = self._mm[start:end].decode(self._encoding)
+
+        return next(_read_sections(io.StringIO(text), line))
+
+    def _read_range(self, start: int, end: int, line: int) -> dict:
+        '''Read the entries of the single section in a byte range.'''
+
+        _, lines, _ = self._read_section(start, end, line)
+
+        return lines
+
+    def _load(self, index: int):
+        '''Read in the object at a index from its sections.'''
+
+        sections = [self._read_section(*i) for i in self._pending.pop(index)]
+
+        header, lines, comments = sections[0]
+        obj = _read_object(header, lines, comments, self.errors)
+
+        # the default storage location, before its subindexes are checked against it
+        if obj.storage_location == '' and self._storage_locations:
+            obj.storage_location = self._storage_locations[0]
+
+        for header, lines, comments in sections[1:]:
+            if isinstance(obj, Variable):
+                _diag(self.errors, 'orphan-subindex', header, lines)
+                continue
+
+            subindex = int(_SUBINDEX_HEADER.match(header)[2], 16)
+            _read_subindex(obj, index, subindex, header, lines, comments, self.errors)
+
+        self._objects[index] = obj
+        self._adopt(index, obj)
+
+        if not self._pending:  # everything is read in, keep the OD sorted and release the file
+            self._sort()
+            self._close()
+
+    def _close(self):
+        '''Release the memory-map and file.'''
+
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fptr is not None:
+            self._fptr.close()
+            self._fptr = None
+
+    def load_all(self):
+        '''Read in all objects that have not been accessed yet and release the file.'''
+
+        for index in list(self._pending):
+            self._load(index)
+
+    @property
+    def _data(self) -> dict:
+        self.load_all()
+        return self._objects
+
+    @_data.setter
+    def _data(self, data: dict):
+        self._objects = data
+
+    def __len__(self) -> int:
+        if self._pending:
+            return len(self._order)
+
+        return super().__len__()
+
+    def __getitem__(self, index: int):
+        if index in self._pending:
+            self._load(index)
+
+        return self._objects[index]
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._pending or index in self._objects
+
+    @property
+    def indexes(self) -> List[int]:
+        '''The list of indexes in the OD'''
+
+        if self._pending:
+            return list(self._order)
+
+        return super().indexes
+
+
+def _comment_start(mm: mmap.mmap, pos: int) -> int:
+    '''Find the start of the comment lines directly above the header at pos.'''
+
+    start = pos
+    while start > 0:
+        prev = mm.rfind(b'\n', 0, start - 1) + 1
+        line = mm[prev:start]
+        if not line.startswith(b';') or b'=' in line:
+            break
+        start = prev
+
+    return start
+
+
+def read_eds_lazy(file_path: str, min_severity: Severity = Severity.INFO) -> \
+        (LazyEDS, Diagnostics):
+    '''
+    Read a EDS/DCF file, objects are only read in when they are first accessed.
+
+    Paramters
+    ---------
+    file_path: str
+        Path to EDS/DCF file
+    min_severity: Severity
+        Diagnostics below this severity are not recorded.
+
+    Returns
+    -------
+    LazyEDS:
+        The eds object.
+    Diagnostics:
+        List of diagnostics for the errors that occured when reading in the EDS/DCF. More
+        diagnostics will be added to the list as objects are read in.
+    '''
+
+    eds = LazyEDS(file_path, min_severity)
+
+    return eds, eds.errors
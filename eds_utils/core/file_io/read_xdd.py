@@ -0,0 +1,375 @@
+'''Everything to read a CiA 311 XDD/XDC (XML) file'''
+
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from .. import DataType, ObjectType, AccessType, BAUD_RATE, str2int
+from ..diagnostic import Severity, Diagnostics
+from ..eds import EDS, FileInfo, DeviceInfo, DeviceCommissioning
+from ..objects import Variable, Array, Record
+from .archive import open_eds
+
+_LIST_DATA_TYPES = [DataType.VISIBLE_STRING, DataType.OCTET_STRING, DataType.UNICODE_STRING,
+                    DataType.DOMAIN]
+
+_DEVICE_IDENTITY = {
+    'vendorName': 'vendor_name',
+    'vendorID': 'vendor_number',
+    'productName': 'product_name',
+    'productID': 'product_number',
+    'orderNumber': 'order_code',
+}
+'''DeviceIdentity elements and the DeviceInfo attributes they are read into'''
+
+
+def read_xdd(file_path, min_severity: Severity = Severity.INFO) -> (EDS, Diagnostics):
+    '''
+    Read a XDD/XDC file into the same model as `read_eds`.
+
+    The file is parsed incrementally and each CANopenObject is dropped from the XML tree once it
+    is read, so the whole XML document is never held in memory. Use `read_eds` (which also reads
+    XDD/XDC files) for the read modes and the PDO mapping checks.
+
+    Comments and CANopenNode storage locations are not part of XDD/XDC files.
+
+    Paramters
+    ---------
+    file_path: str or file object
+        Path to XDD/XDC file or an already opened (text) file object. Paths ending in ".gz",
+        ".xz", or ".bz2" are decompressed while reading and zip member paths (e.g.
+        "bundle.zip/device.xdd") are read directly from the archive.
+    min_severity: Severity
+        Diagnostics below this severity are not recorded.
+
+    Returns
+    -------
+    EDS:
+        The eds object.
+    Diagnostics:
+        List of diagnostics for the errors that occured when reading in the XDD/XDC.
+    '''
+
+    eds = EDS()
+    diags = Diagnostics(min_severity)
+    objects = {}
+    path = []  # tags of the elements the parser is in
+    object_list = None
+    baud_rates = None
+
+    with open_eds(file_path) as fptr:
+        for event, elem in ET.iterparse(fptr, events=('start', 'end')):
+            tag = elem.tag.rpartition('}')[2]  # drop the namespace
+
+            if event == 'start':
+                path.append(tag)
+                if tag == 'CANopenObjectList':
+                    object_list = elem
+                elif tag == 'baudRate':
+                    baud_rates = []
+                continue
+
+            path.pop()
+            attrs = elem.attrib
+
+            if tag == 'CANopenObject':
+                index, obj = _read_object(elem, diags)
+                if index is None:
+                    pass
+                elif index in objects:
+                    diags.add('duplicate-header', Severity.AUTO_FIXED, f'[{index:X}]')
+                else:
+                    objects[index] = obj
+
+                object_list.remove(elem)  # done with it, keep the tree small
+            elif tag == 'ProfileBody':
+                _read_file_info(attrs, eds.file_info, diags)
+            elif tag in _DEVICE_IDENTITY and path[-1:] == ['DeviceIdentity']:
+                _read_device_identity(tag, elem.text or '', eds.device_info, diags)
+            elif tag == 'description' and path[-2:] == ['DeviceIdentity', 'productText']:
+                eds.file_info.description = elem.text or ''
+            elif tag == 'supportedBaudRate':
+                baud_rates.append(_baud_rate(attrs.get('value', '')))
+            elif tag == 'baudRate':
+                eds.device_info.baud_rate = {i: i in baud_rates for i in BAUD_RATE}
+            elif tag == 'CANopenGeneralFeatures':
+                _read_general_features(attrs, eds.device_info, diags)
+            elif tag == 'CANopenMasterFeatures':
+                eds.device_info.simple_boot_up_master = _bool(attrs.get('bootUpMaster'))
+            elif tag == 'deviceCommissioning':  # only in XDCs
+                eds.device_commissioning = _read_device_commissioning(attrs, diags)
+
+    eds.add_objects(objects)  # only sort the OD once
+
+    return eds, diags
+
+
+def _bool(value: str) -> bool:
+    '''Convert a xs:boolean value, missing values are False.'''
+
+    return value in ['true', '1']
+
+
+def _baud_rate(value: str) -> int:
+    '''Convert a baud rate value (e.g. "125 Kbps") to kbps, or None if it is not one.'''
+
+    value = value.lower().replace(' ', '')
+    if not value.endswith('kbps'):
+        return None
+
+    try:
+        return int(value[:-4])
+    except ValueError:
+        return None
+
+
+def _read_int(attrs: dict, name: str, default: int, section: str, diags: Diagnostics) -> int:
+    '''Read a optional int attribute, misformatted values are reported and the default used.'''
+
+    if name not in attrs:
+        return default
+
+    try:
+        return str2int(attrs[name])
+    except ValueError:
+        diags.add('misformatted-entry', Severity.AUTO_FIXED, section, name)
+
+    return default
+
+
+def _read_datetime(attrs: dict, date_name: str, time_name: str, default: datetime,
+                   diags: Diagnostics) -> datetime:
+    '''Read a xs:date and xs:time attribute pair as a datetime.'''
+
+    if date_name not in attrs:
+        return default
+
+    try:
+        return datetime.strptime(f'{attrs[date_name]} {attrs.get(time_name, "00:00:00")[:8]}',
+                                 '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        diags.add('misformatted-entries', Severity.AUTO_FIXED, '<ProfileBody>', date_name,
+                  other_key=time_name)
+
+    return default
+
+
+def _read_file_info(attrs: dict, file_info: FileInfo, diags: Diagnostics):
+    '''
+    Read the file info from the attributes of a ProfileBody element.
+
+    Paramters
+    ---------
+    attrs: dict
+        The attributes of the element.
+    file_info: FileInfo
+        The file info to read into.
+    diags: Diagnostics
+        List to add diagnostics to.
+    '''
+
+    file_info.file_name = attrs.get('fileName', file_info.file_name)
+    file_info.created_by = attrs.get('fileCreator', file_info.created_by)
+    file_info.modified_by = attrs.get('fileModifiedBy', file_info.modified_by)
+    file_info.creation_dt = _read_datetime(attrs, 'fileCreationDate', 'fileCreationTime',
+                                           file_info.creation_dt, diags)
+    file_info.modification_dt = _read_datetime(attrs, 'fileModificationDate',
+                                               'fileModificationTime',
+                                               file_info.modification_dt, diags)
+
+    # fileVersion is a string, eds-utils writes it as "<FileVersion>.<FileRevision>"
+    version, _, revision = attrs.get('fileVersion', '').partition('.')
+    try:
+        if version:
+            file_info.file_version = int(version)
+        if revision:
+            file_info.file_revision = int(revision)
+    except ValueError:
+        diags.add('misformatted-entry', Severity.AUTO_FIXED, '<ProfileBody>', 'fileVersion')
+
+
+def _read_device_identity(tag: str, value: str, device_info: DeviceInfo, diags: Diagnostics):
+    '''Read a element of the DeviceIdentity element.'''
+
+    name = _DEVICE_IDENTITY[tag]
+
+    if isinstance(getattr(device_info, name), int):
+        try:
+            value = str2int(value.strip())
+        except ValueError:
+            diags.add('misformatted-entry', Severity.AUTO_FIXED, '<DeviceIdentity>', tag)
+            return
+
+    setattr(device_info, name, value)
+
+
+def _read_general_features(attrs: dict, device_info: DeviceInfo, diags: Diagnostics):
+    '''Read the attributes of the CANopenGeneralFeatures element.'''
+
+    args = ('<CANopenGeneralFeatures>', diags)
+
+    device_info.group_messaging = _bool(attrs.get('groupMessaging'))
+    device_info.dynamic_channel_supperted = _read_int(attrs, 'dynamicChannels', 0, *args) > 0
+    device_info.grandularity = _read_int(attrs, 'granularity', device_info.grandularity, *args)
+    device_info.num_of_rpdo = _read_int(attrs, 'nrOfRxPDO', device_info.num_of_rpdo, *args)
+    device_info.num_of_tpdo = _read_int(attrs, 'nrOfTxPDO', device_info.num_of_tpdo, *args)
+    device_info.simple_boot_up_slave = _bool(attrs.get('bootUpSlave'))
+    device_info.lss_supported = _bool(attrs.get('layerSettingServiceSlave'))
+
+
+def _read_device_commissioning(attrs: dict, diags: Diagnostics) -> DeviceCommissioning:
+    '''Read the attributes of the deviceCommissioning element.'''
+
+    device_comm = DeviceCommissioning()
+    args = ('<deviceCommissioning>', diags)
+
+    device_comm.node_id = _read_int(attrs, 'nodeID', device_comm.node_id, *args)
+    device_comm.node_name = attrs.get('nodeName', device_comm.node_name)
+    device_comm.net_number = _read_int(attrs, 'networkNumber', device_comm.net_number, *args)
+    device_comm.network_name = attrs.get('networkName', device_comm.network_name)
+    device_comm.canopen_manager = _bool(attrs.get('CANopenManager'))
+    device_comm.lss_serialnumber = _read_int(attrs, 'LSS_SerialNumber',
+                                             device_comm.lss_serialnumber, *args)
+
+    if 'actualBaudRate' in attrs:
+        baud_rate = _baud_rate(attrs['actualBaudRate'])
+        if baud_rate in BAUD_RATE:
+            device_comm.baud_rate = baud_rate
+        else:
+            diags.add('invalid-baud-rate', Severity.AUTO_FIXED, args[0], 'actualBaudRate')
+
+    return device_comm
+
+
+def _read_object(elem: ET.Element, diags: Diagnostics) -> (int, Variable):
+    '''
+    Read a CANopenObject element as a Variable, Array, or Record depending on its objectType.
+
+    Paramters
+    ---------
+    elem: Element
+        The CANopenObject element, with its CANopenSubObject elements.
+    diags: Diagnostics
+        List to add diagnostics to.
+
+    Returns
+    -------
+    int:
+        The index of the object or None if it could not be read.
+    Variable, Array, or Record:
+        The object pulled from the element.
+    '''
+
+    attrs = elem.attrib
+
+    try:
+        index = int(attrs['index'], 16)
+    except (KeyError, ValueError):
+        diags.add('invalid-value', Severity.ERROR, '<CANopenObject>', 'index',
+                  value=attrs.get('index'))
+        return None, None
+
+    header = f'[{index:X}]'
+
+    try:
+        object_type = ObjectType(str2int(attrs.get('objectType', '7')))
+    except ValueError:
+        diags.add('invalid-value', Severity.AUTO_FIXED, header, 'objectType',
+                  value=attrs['objectType'])
+        object_type = ObjectType.VAR
+
+    if object_type == ObjectType.VAR:
+        return index, _read_variable(attrs, header, diags)
+
+    if object_type == ObjectType.ARRAY:
+        obj = Array(attrs.get('name', 'Unknown array name'))
+    else:
+        obj = Record(attrs.get('name', 'Unknown record name'))
+
+    if 'name' not in attrs:
+        diags.add('missing-entry', Severity.AUTO_FIXED, header, 'name')
+    obj.denotation = attrs.get('denotation', '')
+
+    for sub_elem in elem:
+        if sub_elem.tag.rpartition('}')[2] != 'CANopenSubObject':
+            continue
+
+        try:
+            subindex = int(sub_elem.attrib['subIndex'], 16)
+        except (KeyError, ValueError):
+            diags.add('invalid-value', Severity.ERROR, header, 'subIndex',
+                      value=sub_elem.attrib.get('subIndex'))
+            continue
+
+        sub_header = f'[{index:X}sub{subindex:X}]'
+        var = _read_variable(sub_elem.attrib, sub_header, diags)
+
+        if subindex == 0 and var.data_type != DataType.UNSIGNED8:
+            diags.add('subindex-0-data-type', Severity.AUTO_FIXED, sub_header, 'dataType')
+            var.data_type = DataType.UNSIGNED8
+
+        if subindex != 0 and subindex in obj:
+            diags.add('duplicate-header', Severity.AUTO_FIXED, sub_header)
+            continue
+
+        obj[subindex] = var
+
+    return index, obj
+
+
+def _read_variable(attrs: dict, header: str, diags: Diagnostics) -> Variable:
+    '''
+    Read the attributes of a CANopenObject or CANopenSubObject element as a variable.
+
+    Paramters
+    ---------
+    attrs: dict
+        The attributes of the element.
+    header: str
+        The EDS-style header for the object (e.g. "[1018sub1]"), for diagnostics.
+    diags: Diagnostics
+        List to add diagnostics to.
+
+    Returns
+    -------
+    Variable:
+        The variable pulled from the attributes.
+    '''
+
+    var = Variable()
+
+    if 'name' in attrs:
+        var.parameter_name = attrs['name']
+    else:
+        diags.add('missing-entry', Severity.AUTO_FIXED, header, 'name')
+
+    var.denotation = attrs.get('denotation', '')
+
+    try:
+        var.data_type = DataType(int(attrs['dataType'], 16))
+    except KeyError:
+        diags.add('missing-entry', Severity.AUTO_FIXED, header, 'dataType')
+    except ValueError:
+        diags.add('invalid-value', Severity.AUTO_FIXED, header, 'dataType',
+                  value=attrs['dataType'])
+
+    try:
+        var.access_type = AccessType.from_str(attrs['accessType'])
+    except KeyError:
+        if 'accessType' in attrs:
+            diags.add('invalid-value', Severity.AUTO_FIXED, header, 'accessType',
+                      value=attrs['accessType'])
+        else:
+            diags.add('missing-entry', Severity.AUTO_FIXED, header, 'accessType')
+
+    if 'defaultValue' in attrs:  # optional
+        var.default_value = attrs['defaultValue']
+    elif var.data_type in _LIST_DATA_TYPES:
+        var.default_value = ''
+    else:
+        var.default_value = '0'
+
+    var.low_limit = attrs.get('lowLimit', '')
+    var.high_limit = attrs.get('highLimit', '')
+    var.pdo_mapping = attrs.get('PDOmapping', 'no') != 'no'
+
+    return var
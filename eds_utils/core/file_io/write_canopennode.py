@@ -6,6 +6,7 @@ from . import INDENT4, INDENT8, INDENT12
 from .. import ObjectType, DataType, AccessType
 from ..eds import EDS
 from ..objects import Variable
+from ..value import NodeIdValue, parse_value
 
 _SKIP_INDEXES = [0x1F81, 0x1F82, 0x1F89]
 '''CANopenNode skips the data (it just set to NULL) for these indexes for some reason'''
@@ -94,20 +95,52 @@ def write_canopennode(eds: EDS, dir_path=''):
 def remove_node_id(default_value: str) -> str:
     '''Remove "+$NODEID" or '$NODEID+" from the default value'''
 
-    temp = default_value.split('+')
+    return _c_value(default_value, parse_value(default_value, DataType.UNSIGNED32))
+
+
+def _c_value(default_value: str, value) -> str:
+    '''
+    Get the C value for a default value and its typed value, the original text without the
+    "+$NODEID" or "$NODEID+"
+    '''
 
     if default_value == '':
         return '0'
-    elif len(temp) == 1:
+    elif isinstance(value, NodeIdValue) and '+' not in default_value:  # just $NODEID
+        return f'0x{value.offset:X}'
+
+    temp = default_value.split('+')
+
+    if len(temp) != 2:
         return default_value  # does not include $NODEID
-    elif temp[0] == '$NODEID':
-        return temp[1].rsplit()[0]
-    elif temp[1] == '$NODEID':
-        return temp[0].rsplit()[0]
+    elif temp[0].strip() == '$NODEID':
+        return temp[1].strip()
+    elif temp[1].strip() == '$NODEID':
+        return temp[0].strip()
 
     return default_value  # does not include $NODEID
 
 
+def _c_bytes(var: Variable) -> str:
+    '''Get the C array values for a OCTET_STRING variable'''
+
+    value = var.value
+    if not isinstance(value, bytes):
+        value = b''  # not valid hex
+
+    return ', '.join(f'0x{i:02X}' for i in value)
+
+
+def _octet_string_len(var: Variable) -> int:
+    '''Get the number of bytes in the default value of a OCTET_STRING variable'''
+
+    value = var.value
+    if isinstance(value, bytes):
+        return len(value)
+
+    return m.ceil(len(var.default_value.replace(' ', '')) / 2)  # not valid hex
+
+
 def attr_lines(eds: EDS, index: int) -> list:
     '''Generate attr lines for OD.c for a sepecific index'''
 
@@ -115,7 +148,7 @@ def attr_lines(eds: EDS, index: int) -> list:
 
     obj = eds[index]
     if obj.object_type == ObjectType.VAR:
-        default_value = remove_node_id(obj.default_value)
+        default_value = _c_value(obj.default_value, obj.value)
         line = f'{INDENT4}.x{index:X}_{camel_case(obj.parameter_name)} = '
 
         if obj.data_type == DataType.VISIBLE_STRING:
@@ -124,12 +157,7 @@ def attr_lines(eds: EDS, index: int) -> list:
                 line += f'\'{i}\', '
             line += '0}, '
         elif obj.data_type == DataType.OCTET_STRING:
-            line += '{'
-            value = obj.default_value.replace('  ', ' ')
-            for i in value.split(' '):
-                line += f'0x{i}, '
-            line = line[:-2]  # remove last ', '
-            line += '},'
+            line += '{' + _c_bytes(obj) + '},'
         elif obj.data_type == DataType.UNICODE_STRING:
             line += '{'
             for i in obj.default_value:
@@ -150,7 +178,7 @@ def attr_lines(eds: EDS, index: int) -> list:
             return lines  # skip domains
 
         for i in obj.subindexes[1:]:
-            default_value = remove_node_id(obj[i].default_value)
+            default_value = _c_value(obj[i].default_value, obj[i].value)
 
             if obj[i].data_type == DataType.VISIBLE_STRING:
                 line += '{'
@@ -158,12 +186,7 @@ def attr_lines(eds: EDS, index: int) -> list:
                     line += f'\'{i}\', '
                 line += '0}, '
             elif obj[i].data_type == DataType.OCTET_STRING:
-                line += '{'
-                value = obj[i].default_value.replace('  ', ' ')
-                for i in value.split(' '):
-                    line += f'0x{i}, '
-                line = line[:-2]  # remove trailing ', '
-                line += '}, '
+                line += '{' + _c_bytes(obj[i]) + '}, '
             elif obj[i].data_type == DataType.UNICODE_STRING:
                 line += '{'
                 for i in obj[i].default_value:
@@ -183,7 +206,7 @@ def attr_lines(eds: EDS, index: int) -> list:
 
         for i in obj.subindexes:
             name = camel_case(obj[i].parameter_name)
-            default_value = remove_node_id(obj[i].default_value)
+            default_value = _c_value(obj[i].default_value, obj[i].value)
 
             if obj[i].data_type == DataType.DOMAIN:
                 continue  # skip domains
@@ -194,13 +217,7 @@ def attr_lines(eds: EDS, index: int) -> list:
                 line += '0}, '
                 lines.append(line)
             elif obj[i].data_type == DataType.OCTET_STRING:
-                value = obj[i].default_value.replace('  ', ' ')
-                line = f'{INDENT8}.{name} = ' + '{'
-                for i in value.split(' '):
-                    line += f'0x{i}, '
-                line = line[:-2]  # remove trailing ', '
-                line += '},'
-                lines.append(line)
+                lines.append(f'{INDENT8}.{name} = ' + '{' + _c_bytes(obj[i]) + '},')
             elif obj[i].data_type == DataType.UNICODE_STRING:
                 line = f'{INDENT8}.{name} = ' + '{'
                 for i in obj[i].default_value:
@@ -222,7 +239,7 @@ def _var_data_type_len(var: Variable) -> int:
     if var.data_type == DataType.VISIBLE_STRING:
         length = len(var.default_value)  # char
     elif var.data_type == DataType.OCTET_STRING:
-        length = len(var.default_value.replace(' ', '')) // 2
+        length = _octet_string_len(var)
     elif var.data_type == DataType.UNICODE_STRING:
         length = len(var.default_value) * 2  # uint16_t
     else:
@@ -303,7 +320,7 @@ def obj_lines(eds: EDS, index) -> list:
             sub_length = len(obj[1].default_value) + 1  # add 1 for '\0'
             lines.append(f'{INDENT8}.dataElementSizeof = sizeof({c_name}[{sub_length}]),')
         elif obj.data_type == DataType.OCTET_STRING:
-            sub_length = m.ceil(len(obj[1].default_value.replace(' ', '')) / 2)
+            sub_length = _octet_string_len(obj[1])
             lines.append(f'{INDENT8}.dataElementSizeof = sizeof({c_name}[{sub_length}]),')
         else:
             lines.append(f'{INDENT8}.dataElementSizeof = sizeof({c_name}),')
@@ -364,9 +381,8 @@ def write_canopennode_c(eds: EDS, dir_path=''):
     for i in eds.storage_locations:
         sl = i.upper().replace('-', '_')
         lines.append(f'OD_ATTR_{sl} OD_{sl}_t OD_{sl} = ' + '{')
-        for j in eds.indexes:
-            if eds[j].storage_location == i:
-                lines += attr_lines(eds, j)
+        for j in eds.objects_in(i):
+            lines += attr_lines(eds, j)
         lines.append('};')
         lines.append('')
 
@@ -437,7 +453,7 @@ def _canopennode_h_lines(eds: EDS, index: int) -> list:
             length = len(obj.default_value) + 1  # add 1 for '\0'
             lines.append(f'{INDENT4}{c_name} x{index:X}_{name}[{length}];')
         elif obj.data_type == DataType.OCTET_STRING:
-            length = len(obj.default_value.replace(' ', '')) // 2  # aka number of uint8s
+            length = _octet_string_len(obj)  # aka number of uint8s
             lines.append(f'{INDENT4}{c_name} x{index:X}_{name}[{length}];')
         else:
             lines.append(f'{INDENT4}{c_name} x{index:X}_{name};')
@@ -454,7 +470,7 @@ def _canopennode_h_lines(eds: EDS, index: int) -> list:
             sub_length = len(obj[1].default_value) + 1  # add 1 for '\0'
             lines.append(f'{INDENT4}{c_name} x{index:X}_{name}[{length}][{sub_length}];')
         elif obj.data_type == DataType.OCTET_STRING:
-            sub_length = m.ceil(len(obj[1].default_value.replace(' ', '')) / 2)
+            sub_length = _octet_string_len(obj[1])
             lines.append(f'{INDENT4}{c_name} x{index:X}_{name}[{length}][{sub_length}];')
         else:
             lines.append(f'{INDENT4}{c_name} x{index:X}_{name}[{length}];')
@@ -471,7 +487,7 @@ def _canopennode_h_lines(eds: EDS, index: int) -> list:
                 length = len(obj[i].default_value) + 1  # add 1 for '\0'
                 lines.append(f'{INDENT8}{c_name} {sub_name}[{length}];')
             elif data_type == DataType.OCTET_STRING:
-                sub_length = m.ceil(len(obj[1].default_value.replace(' ', '')) / 2)
+                sub_length = _octet_string_len(obj[1])
                 lines.append(f'{INDENT8}{c_name} {sub_name}[{sub_length}];')
             else:
                 lines.append(f'{INDENT8}{c_name} {sub_name};')
@@ -527,9 +543,8 @@ def write_canopennode_h(eds: EDS, dir_path=''):
     for i in eds.storage_locations:
         sl = i.upper().replace('-', '_')
         lines.append('typedef struct {')
-        for j in eds.indexes:
-            if eds[j].storage_location == i:
-                lines += _canopennode_h_lines(eds, j)
+        for j in eds.objects_in(i):
+            lines += _canopennode_h_lines(eds, j)
         lines.append('}' + f' OD_{sl}_t;')
         lines.append('')
 
@@ -547,13 +562,13 @@ def write_canopennode_h(eds: EDS, dir_path=''):
     lines.append('extern OD_ATTR_OD OD_t *OD;')
     lines.append('')
 
-    for i in eds.indexes:
-        lines.append(f'#define OD_ENTRY_H{i:X} &OD->list[{eds.indexes.index(i)}]')
+    for num, i in enumerate(eds.indexes):
+        lines.append(f'#define OD_ENTRY_H{i:X} &OD->list[{num}]')
     lines.append('')
 
-    for i in eds.indexes:
+    for num, i in enumerate(eds.indexes):
         name = camel_case(eds[i].parameter_name)
-        lines.append(f'#define OD_ENTRY_H{i:X}_{name} &OD->list[{eds.indexes.index(i)}]')
+        lines.append(f'#define OD_ENTRY_H{i:X}_{name} &OD->list[{num}]')
     lines.append('')
 
     lines.append('#endif /* OD_H */')
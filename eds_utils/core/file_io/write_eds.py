@@ -5,6 +5,9 @@ from os.path import basename, splitext
 from .. import BAUD_RATE, ObjectType, AccessType, DataType
 from ..objects import Variable, Array, Record
 from ..eds import EDS
+from ..value import format_bytes
+from .archive import open_eds, split_member, strip_compression, is_xdd
+from .write_xdd import write_xdd
 
 
 def write_eds(eds: EDS, file_path='', dcf=False):
@@ -15,7 +18,10 @@ def write_eds(eds: EDS, file_path='', dcf=False):
     eds: EDS
         eds data structure to save as file
     file_path: str
-        File path of eds/dcf to save. If empty the value from the eds data structure.
+        File path of eds/dcf to save. If empty the value from the eds data structure. Paths
+        ending in ".gz", ".xz", or ".bz2" are compressed while writing and zip member paths
+        (e.g. "bundle.zip/device.eds") are added to the archive. Paths to XDD/XDC files are
+        written with `write_xdd`.
     dcf: bool
         Force the file save to be to a dcf file reguardless if the file_path ends with ".dcf"
     '''
@@ -25,15 +31,24 @@ def write_eds(eds: EDS, file_path='', dcf=False):
     if not file_path:  # use value from file info
         file_path = eds.file_info.file_name
 
-    if not dcf and file_path.endswith('.dcf'):
+    if is_xdd(file_path):
+        write_xdd(eds, file_path, xdc=dcf)
+        return
+
+    # the eds/dcf file name without any compression extension or zip archive path
+    plain_path = strip_compression(split_member(file_path)[1] or file_path)
+    compression = file_path[len(strip_compression(file_path)):]
+
+    if not dcf and plain_path.endswith('.dcf'):
         dcf = True
-    elif dcf and file_path.endswith('.eds'):  # force eds to dcf
-        eds.file_info.last_eds = basename(file_path)
-        file_path = splitext(file_path)[0] + '.dcf'
+    elif dcf and plain_path.endswith('.eds'):  # force eds to dcf
+        eds.file_info.last_eds = basename(plain_path)
+        plain_path = splitext(plain_path)[0] + '.dcf'
+        file_path = splitext(strip_compression(file_path))[0] + '.dcf' + compression
 
     # file info seciton
     lines.append('[FileInfo]')
-    lines.append(f'FileName={basename(file_path)}')
+    lines.append(f'FileName={basename(plain_path)}')
     lines.append(f'FileVersion={eds.file_info.file_version}')
     lines.append(f'FileRevision={eds.file_info.file_revision}')
     if dcf:
@@ -93,37 +108,34 @@ def write_eds(eds: EDS, file_path='', dcf=False):
     lines.append('[MandatoryObjects]')
     mandatory_objs = eds.mandatory_objects
     lines.append(f'SupportedObjects={len(mandatory_objs)}')
-    for i in mandatory_objs:
-        num = mandatory_objs.index(i) + 1
+    for num, i in enumerate(mandatory_objs, 1):
         value = f'0x{i:04X}'
         lines.append(f'{num}={value}')
     lines.append('')
 
-    lines += _objects_lines(eds, mandatory_objs)
+    lines += _objects_lines(eds, mandatory_objs, dcf)
 
     lines.append('[OptionalObjects]')
     optional_objs = eds.optional_objects
     lines.append(f'SupportedObjects={len(optional_objs)}')
-    for i in optional_objs:
-        num = optional_objs.index(i) + 1
+    for num, i in enumerate(optional_objs, 1):
         value = f'0x{i:04X}'
         lines.append(f'{num}={value}')
     lines.append('')
 
-    lines += _objects_lines(eds, optional_objs)
+    lines += _objects_lines(eds, optional_objs, dcf)
 
     lines.append('[ManufacturerObjects]')
     manufacturer_objs = eds.manufacturer_objects
     lines.append(f'SupportedObjects={len(manufacturer_objs)}')
-    for i in manufacturer_objs:
-        num = manufacturer_objs.index(i) + 1
+    for num, i in enumerate(manufacturer_objs, 1):
         value = f'0x{i:04X}'
         lines.append(f'{num}={value}')
     lines.append('')
 
-    lines += _objects_lines(eds, manufacturer_objs)
+    lines += _objects_lines(eds, manufacturer_objs, dcf)
 
-    with open(file_path, 'w') as f:
+    with open_eds(file_path, 'w') as f:
         for i in lines:
             f.write(i + '\n')
 
@@ -169,8 +181,12 @@ def _variable_lines(variable: Variable, index: int, subindex=None, dcf=False,
         lines.append(f'AccessType={variable.access_type.to_str()}')
     if variable.default_value:  # optional
         if variable.data_type == DataType.OCTET_STRING:
-            value_ns = variable.default_value.replace(' ', '')
-            tmp = ' '.join([value_ns[i: i + 2] for i in range(0, len(value_ns), 2)])
+            value = variable.value
+            if isinstance(value, bytes):  # only formatted as hex text here
+                tmp = format_bytes(value)
+            else:
+                value_ns = variable.default_value.replace(' ', '')
+                tmp = ' '.join([value_ns[i: i + 2] for i in range(0, len(value_ns), 2)])
             lines.append(f'DefaultValue={tmp}')
         else:
             lines.append(f'DefaultValue={variable.default_value}')
@@ -0,0 +1,225 @@
+'''Everything to write a CiA 311 XDD/XDC (XML) file'''
+
+from os.path import basename, splitext
+from typing import Iterator
+from xml.sax.saxutils import escape, quoteattr
+
+from .. import BAUD_RATE, ObjectType, AccessType
+from ..objects import Variable
+from ..eds import EDS
+from . import INDENT4
+from .archive import open_eds, plain_path, strip_compression
+
+_NAMESPACE = 'http://www.canopen.org/xml/1.1'
+_XSI_NAMESPACE = 'http://www.w3.org/2001/XMLSchema-instance'
+
+
+def write_xdd(eds: EDS, file_path: str = '', xdc: bool = False):
+    '''
+    Save a XDD/XDC file.
+
+    The file is written while it is generated, the XML document is never held in memory.
+
+    Comments and CANopenNode storage locations are not part of XDD/XDC files and are not saved.
+    The optional dummyUsage element is not written, as the EDS does not keep the dummy usage of
+    the file it was read from.
+
+    Parameters
+    ----------
+    eds: EDS
+        eds data structure to save as file
+    file_path: str
+        File path of xdd/xdc to save. If empty the value from the eds data structure (with a
+        ".xdd" or ".xdc" file extension). Paths ending in ".gz", ".xz", or ".bz2" are compressed
+        while writing and zip member paths (e.g. "bundle.zip/device.xdd") are added to the
+        archive.
+    xdc: bool
+        Force the file save to be to a xdc file reguardless if the file_path ends with ".xdc"
+    '''
+
+    if not file_path:  # use value from file info
+        file_path = splitext(eds.file_info.file_name)[0] + ('.xdc' if xdc else '.xdd')
+
+    name = plain_path(file_path)
+    compression = file_path[len(strip_compression(file_path)):]
+
+    if not xdc and name.endswith('.xdc'):
+        xdc = True
+    elif xdc and name.endswith('.xdd'):  # force xdd to xdc
+        name = splitext(name)[0] + '.xdc'
+        file_path = splitext(strip_compression(file_path))[0] + '.xdc' + compression
+
+    with open_eds(file_path, 'w') as fptr:
+        for line in _xdd_lines(eds, basename(name), xdc):
+            fptr.write(line + '\n')
+
+
+def _attrs(**attrs) -> str:
+    '''Format element attributes, skipping the ones that are None.'''
+
+    return ''.join(f' {key}={quoteattr(str(value))}' for key, value in attrs.items()
+                   if value is not None)
+
+
+def _bool(value: bool) -> str:
+    return 'true' if value else 'false'
+
+
+def _profile_header(class_id: str) -> list:
+    indent = INDENT4 * 2
+
+    return [
+        f'{indent}<ProfileHeader>',
+        f'{indent}{INDENT4}<ProfileIdentification>CANopen {class_id} profile'
+        '</ProfileIdentification>',
+        f'{indent}{INDENT4}<ProfileRevision>1.1</ProfileRevision>',
+        f'{indent}{INDENT4}<ProfileName/>',
+        f'{indent}{INDENT4}<ProfileSource/>',
+        f'{indent}{INDENT4}<ProfileClassID>{class_id}</ProfileClassID>',
+        f'{indent}{INDENT4}<ISO15745Reference>',
+        f'{indent}{INDENT4 * 2}<ISO15745Part>1</ISO15745Part>',
+        f'{indent}{INDENT4 * 2}<ISO15745Edition>1</ISO15745Edition>',
+        f'{indent}{INDENT4 * 2}<ProfileTechnology>CANopen</ProfileTechnology>',
+        f'{indent}{INDENT4}</ISO15745Reference>',
+        f'{indent}</ProfileHeader>',
+    ]
+
+
+def _xdd_lines(eds: EDS, file_name: str, xdc: bool) -> Iterator[str]:
+    '''Generate the lines of a XDD/XDC file.'''
+
+    file_info = eds.file_info
+    device_info = eds.device_info
+    indent2 = INDENT4 * 2
+    indent3 = INDENT4 * 3
+    indent4 = INDENT4 * 4
+
+    file_attrs = _attrs(
+        fileName=file_name,
+        fileCreator=file_info.created_by,
+        fileCreationDate=file_info.creation_dt.strftime('%Y-%m-%d'),
+        fileCreationTime=file_info.creation_dt.strftime('%H:%M:%S'),
+        fileModificationDate=file_info.modification_dt.strftime('%Y-%m-%d'),
+        fileModificationTime=file_info.modification_dt.strftime('%H:%M:%S'),
+        fileModifiedBy=file_info.modified_by,
+        fileVersion=f'{file_info.file_version}.{file_info.file_revision}',
+    )
+
+    yield '<?xml version="1.0" encoding="utf-8"?>'
+    yield f'<ISO15745ProfileContainer xmlns="{_NAMESPACE}" xmlns:xsi="{_XSI_NAMESPACE}">'
+
+    # device profile
+    yield f'{INDENT4}<ISO15745Profile>'
+    yield from _profile_header('Device')
+    yield f'{indent2}<ProfileBody xsi:type="ProfileBody_Device_CANopen"{file_attrs}>'
+    yield f'{indent3}<DeviceIdentity>'
+    yield f'{indent4}<vendorName>{escape(device_info.vendor_name)}</vendorName>'
+    yield f'{indent4}<vendorID>0x{device_info.vendor_number:08X}</vendorID>'
+    yield f'{indent4}<productName>{escape(device_info.product_name)}</productName>'
+    yield f'{indent4}<productID>0x{device_info.product_number:08X}</productID>'
+    yield f'{indent4}<productText>'
+    yield f'{indent4}{INDENT4}<description lang="en">{escape(file_info.description)}' \
+        '</description>'
+    yield f'{indent4}</productText>'
+    if device_info.order_code:
+        yield f'{indent4}<orderNumber>{escape(str(device_info.order_code))}</orderNumber>'
+    yield f'{indent3}</DeviceIdentity>'
+    yield f'{indent3}<DeviceFunction>'
+    yield f'{indent4}<characteristicsList/>'
+    yield f'{indent3}</DeviceFunction>'
+    yield f'{indent2}</ProfileBody>'
+    yield f'{INDENT4}</ISO15745Profile>'
+
+    # communication network profile
+    yield f'{INDENT4}<ISO15745Profile>'
+    yield from _profile_header('CommunicationNetwork')
+    yield f'{indent2}<ProfileBody xsi:type="ProfileBody_CommunicationNetwork_CANopen"' \
+        f'{file_attrs}>'
+    yield f'{indent3}<ApplicationLayers>'
+    yield f'{indent4}<CANopenObjectList>'
+    for i in eds.indexes:
+        yield from _object_lines(eds[i], i, xdc)
+    yield f'{indent4}</CANopenObjectList>'
+    yield f'{indent3}</ApplicationLayers>'
+
+    yield f'{indent3}<TransportLayers>'
+    yield f'{indent4}<PhysicalLayer>'
+    default_baud_rate = eds.device_commissioning.baud_rate
+    yield f'{indent4}{INDENT4}<baudRate defaultValue="{default_baud_rate} Kbps">'
+    for i in BAUD_RATE:
+        if device_info.baud_rate[i]:
+            yield f'{indent4}{INDENT4 * 2}<supportedBaudRate value="{i} Kbps"/>'
+    yield f'{indent4}{INDENT4}</baudRate>'
+    yield f'{indent4}</PhysicalLayer>'
+    yield f'{indent3}</TransportLayers>'
+
+    yield f'{indent3}<NetworkManagement>'
+    general_attrs = _attrs(
+        groupMessaging=_bool(device_info.group_messaging),
+        dynamicChannels=int(device_info.dynamic_channel_supperted),
+        granularity=device_info.grandularity,
+        nrOfRxPDO=eds.rpdos,
+        nrOfTxPDO=eds.tpdos,
+        bootUpSlave=_bool(device_info.simple_boot_up_slave),
+        layerSettingServiceSlave=_bool(device_info.lss_supported),
+    )
+    yield f'{indent4}<CANopenGeneralFeatures{general_attrs}/>'
+    master_attrs = _attrs(bootUpMaster=_bool(device_info.simple_boot_up_master))
+    yield f'{indent4}<CANopenMasterFeatures{master_attrs}/>'
+    if xdc:
+        device_comm = eds.device_commissioning
+        comm_attrs = _attrs(
+            nodeID=device_comm.node_id,
+            nodeName=device_comm.node_name,
+            actualBaudRate=f'{device_comm.baud_rate} Kbps',
+            networkNumber=device_comm.net_number,
+            networkName=device_comm.network_name,
+            CANopenManager=_bool(device_comm.canopen_manager),
+            LSS_SerialNumber=int(device_comm.lss_serialnumber),
+        )
+        yield f'{indent4}<deviceCommissioning{comm_attrs}/>'
+    yield f'{indent3}</NetworkManagement>'
+    yield f'{indent2}</ProfileBody>'
+    yield f'{INDENT4}</ISO15745Profile>'
+
+    yield '</ISO15745ProfileContainer>'
+
+
+def _variable_attrs(variable: Variable, xdc: bool, subindex: int = None) -> str:
+    '''Format the attributes of a CANopenObject or CANopenSubObject for a variable.'''
+
+    access_type = AccessType.CONST if subindex == 0 else variable.access_type
+
+    return _attrs(
+        name=variable.parameter_name,
+        objectType=ObjectType.VAR.value,
+        dataType=f'{variable.data_type.value:04X}',
+        lowLimit=variable.low_limit or None,
+        highLimit=variable.high_limit or None,
+        accessType=access_type.to_str(),
+        defaultValue=variable.default_value or None,
+        denotation=variable.denotation if xdc and variable.denotation else None,
+        PDOmapping='optional' if variable.pdo_mapping else 'no',
+    )
+
+
+def _object_lines(obj, index: int, xdc: bool) -> Iterator[str]:
+    '''Generate the lines of a CANopenObject element.'''
+
+    indent = INDENT4 * 5
+
+    if isinstance(obj, Variable):
+        yield f'{indent}<CANopenObject index="{index:04X}"{_variable_attrs(obj, xdc)}/>'
+        return
+
+    attrs = _attrs(
+        name=obj.parameter_name,
+        objectType=obj.object_type.value,
+        denotation=obj.denotation if xdc and obj.denotation else None,
+        subNumber=len(obj),
+    )
+    yield f'{indent}<CANopenObject index="{index:04X}"{attrs}>'
+    for i in obj.subindexes:
+        attrs = _variable_attrs(obj[i], xdc, i)
+        yield f'{indent}{INDENT4}<CANopenSubObject subIndex="{i:02X}"{attrs}/>'
+    yield f'{indent}</CANopenObject>'
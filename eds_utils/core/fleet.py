@@ -0,0 +1,330 @@
+'''A read-only store of many object dictionaries in shared memory, for multi-process tools'''
+
+import pickle
+import struct
+from array import array
+from typing import Dict, List
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # python < 3.8
+    shared_memory = None
+
+from .eds import EDS
+from .columnar import ColumnarEDS, _STRINGS, _TYPECODES
+
+_MAGIC = b'EDSF'
+_HEADER = struct.Struct('4sIIIQQ')  # magic, ODs, rows, strings, string bytes, header bytes
+_ALIGN = 8
+
+
+class SharedStringTable:
+    '''
+    A read-only `StringTable` in a buffer. The strings are sorted, so the id of a string is found
+    with a binary search over the buffer instead of a per-process dict of all the strings.
+    '''
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        '''
+        Parameters
+        ----------
+        offsets: memoryview
+            The offset of each string in the data, plus the end of the data.
+        data: memoryview
+            The UTF-8 encoded strings.
+        '''
+
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, string_id: int) -> str:
+        if not 0 <= string_id < len(self):
+            raise IndexError(string_id)
+
+        return str(self._data[self._offsets[string_id]:self._offsets[string_id + 1]], 'utf-8')
+
+    def get_id(self, string: str) -> int:
+        '''Get the id of a string, or None if it is not in the table.'''
+
+        lo = 0
+        hi = len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self[mid] < string:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo if lo < len(self) and self[lo] == string else None
+
+
+class FleetOD(ColumnarEDS):
+    '''
+    A read-only `ColumnarEDS` of one object dictionary in a `FleetStore`. Its columns are views
+    of the shared memory, so it costs no copy of the OD.
+    '''
+
+    def __init__(self, columns: Dict[str, memoryview], strings: SharedStringTable,
+                 header: tuple):
+        '''
+        Parameters
+        ----------
+        columns: dict
+            The columns of the OD's rows, name: memoryview.
+        strings: SharedStringTable
+            The fleet's strings.
+        header: tuple
+            The file info, device info, device commissioning, comment, CANopenNode flag, and
+            storage locations of the OD.
+        '''
+
+        self._columns = columns
+        self.strings = strings
+        self.file_info, self.device_info, self.device_commissioning, self.comment, \
+            self.canopennode, self.storage_locations = header
+
+    def _set(self, name: str, row: int, value):
+        raise TypeError('a fleet store is read-only')
+
+
+class FleetStore:
+    '''
+    A read-only store of many object dictionaries (e.g. all the DCFs of a fleet of nodes) laid out
+    once in `multiprocessing.shared_memory`, for tools that analyze them in many worker
+    processes. Requires Python 3.8 or newer.
+
+    The rows of every OD are stored as the columns of a `ColumnarEDS`, with one string table for
+    the whole fleet. Workers attach to the store by its name (or get it pickled, which only
+    pickles the name) and query the ODs in place, so memory stays flat as the number of workers
+    grows.
+
+    Every process must `close` its store when done (or use it as a context manager). The process
+    that made the store owns the shared memory, closing the store there also frees the shared
+    memory, so it must be closed last.
+    '''
+
+    def __init__(self, shm, owner: bool):
+        '''
+        Use `create` or `attach` instead.
+
+        Parameters
+        ----------
+        shm: shared_memory.SharedMemory
+            The shared memory with the store.
+        owner: bool
+            This process made the shared memory.
+        '''
+
+        self._shm = shm
+        self._owner = owner
+        buf = shm.buf.toreadonly()
+        self._buf = buf
+
+        magic, ods, rows, strings, string_size, header_size = _HEADER.unpack_from(buf)
+        if magic != _MAGIC:
+            raise ValueError(f'{shm.name} is not a fleet store')
+
+        pos = _HEADER.size
+        views = []
+        for typecode, size in _layout(ods, rows, strings, string_size):
+            nbytes = array(typecode).itemsize * size
+            views.append(buf[pos:pos + nbytes].cast(typecode))
+            pos = _aligned(pos + nbytes)
+
+        self._od_rows, self._od_names, *columns, string_offsets, string_data = views
+        self._columns = dict(zip(_TYPECODES, columns))
+        self.strings = SharedStringTable(string_offsets, string_data)
+        self._names = {self.strings[i]: n for n, i in enumerate(self._od_names)}
+        self._header_data = buf[pos:pos + header_size]
+        self._headers = None  # unpickled on first use, see __getitem__
+
+    @classmethod
+    def create(cls, ods: Dict[str, EDS], name: str = None):
+        '''
+        Lay out object dictionaries in new shared memory.
+
+        Parameters
+        ----------
+        ods: dict
+            The name of each OD (e.g. the DCF's file name or the node id) and its EDS.
+        name: str
+            Optional name for the shared memory, a unique name is made if not set.
+
+        Raises
+        ------
+        ImportError
+            Python is older than 3.8.
+
+        Returns
+        -------
+        FleetStore
+            The store, owned by this process.
+        '''
+
+        if shared_memory is None:
+            raise ImportError('Python 3.8 or newer is required for a fleet store')
+
+        cedss = [ColumnarEDS.from_eds(i) for i in ods.values()]
+
+        # one sorted table of the strings of all the ODs (and their names)
+        tables = [[i.strings[j] for j in range(len(i.strings))] for i in cedss]
+        strings = sorted(set(ods).union(*tables))
+        string_ids = {j: i for i, j in enumerate(strings)}
+
+        od_rows = array('I', [0])
+        columns = {i: array(j) for i, j in _TYPECODES.items()}
+        for ceds, table in zip(cedss, tables):
+            remap = [string_ids[i] for i in table]
+            for i, column in columns.items():
+                column.extend(map(remap.__getitem__, ceds.column(i)) if i in _STRINGS
+                              else ceds.column(i))
+            od_rows.append(od_rows[-1] + ceds.rows)
+
+        encoded = [i.encode() for i in strings]
+        string_offsets = array('I', [0])
+        for i in encoded:
+            string_offsets.append(string_offsets[-1] + len(i))
+        string_data = b''.join(encoded)
+
+        header_data = pickle.dumps([(i.file_info, i.device_info, i.device_commissioning,
+                                     i.comment, i.canopennode, i.storage_locations)
+                                    for i in cedss])
+
+        parts = [od_rows, array('I', map(string_ids.__getitem__, ods))] + \
+            list(columns.values()) + [string_offsets, string_data]
+        size = sum(_aligned(len(memoryview(i).cast('B'))) for i in parts)
+        shm = shared_memory.SharedMemory(name, create=True,
+                                         size=_HEADER.size + size + len(header_data))
+
+        try:
+            _HEADER.pack_into(shm.buf, 0, _MAGIC, len(ods), od_rows[-1], len(strings),
+                              len(string_data), len(header_data))
+            pos = _HEADER.size
+            for part in parts + [header_data]:
+                data = memoryview(part).cast('B')
+                shm.buf[pos:pos + len(data)] = data
+                pos = _aligned(pos + len(data))
+            return cls(shm, True)
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name: str):
+        '''
+        Attach to a store made by another process.
+
+        Parameters
+        ----------
+        name: str
+            The name of the store's shared memory, see `name`.
+
+        Raises
+        ------
+        ImportError
+            Python is older than 3.8.
+        FileNotFoundError
+            There is no shared memory with the name.
+        ValueError
+            The shared memory is not a fleet store.
+
+        Returns
+        -------
+        FleetStore
+            The store.
+        '''
+
+        if shared_memory is None:
+            raise ImportError('Python 3.8 or newer is required for a fleet store')
+
+        shm = shared_memory.SharedMemory(name)
+        try:
+            return cls(shm, False)
+        except Exception:
+            shm.close()
+            raise
+
+    def __reduce__(self):
+        # workers attach to the shared memory instead of getting a copy
+        return self.attach, (self.name,)
+
+    @property
+    def name(self) -> str:
+        '''str: The name of the shared memory, to attach to the store from other processes'''
+
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        '''int: The size of the store in bytes'''
+
+        return self._shm.size
+
+    @property
+    def names(self) -> List[str]:
+        '''The list of the names of the ODs'''
+
+        return list(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __getitem__(self, name: str) -> FleetOD:
+        '''Get a read-only view of a OD by its name.'''
+
+        od = self._names[name]
+        if self._headers is None:
+            self._headers = pickle.loads(self._header_data)
+
+        lo, hi = self._od_rows[od], self._od_rows[od + 1]
+        columns = {i: j[lo:hi] for i, j in self._columns.items()}
+        return FleetOD(columns, self.strings, self._headers[od])
+
+    def close(self):
+        '''
+        Close this process's access to the store, and free the shared memory if this process made
+        it. All the ODs got from the store must be deleted first.
+        '''
+
+        if self._shm is None:
+            return
+
+        # the views must be released before the shared memory can be closed
+        self._od_rows = self._od_names = self._header_data = None
+        self._columns = {}
+        self.strings = None
+        self._buf.release()
+        self._shm.close()
+
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _aligned(pos: int) -> int:
+    '''Round up a position in the store to the alignment of the parts.'''
+
+    return -(-pos // _ALIGN) * _ALIGN
+
+
+def _layout(ods: int, rows: int, strings: int, string_size: int) -> list:
+    '''Get the typecode and length of the parts of a store, in order.'''
+
+    return [('I', ods + 1), ('I', ods)] + [(i, rows) for i in _TYPECODES.values()] + \
+        [('I', strings + 1), ('B', string_size)]
@@ -1,34 +1,273 @@
 '''All the object class for the object dictionary'''
 
-from dataclasses import dataclass
-from typing import List
+from array import array
+from bisect import bisect_left, insort
+from copy import deepcopy
+from hashlib import blake2b
+from itertools import chain, count
+from operator import attrgetter
+from typing import Dict, List, Tuple
 
 from . import DataType, AccessType, ObjectType
+from .changes import ChangeType
+from .value import _BYTES_DATA_TYPES, format_bytes, parse_value
+
+_object_setattr = object.__setattr__
+
+_CANONICAL = {False: 0, True: 1}
+_CANONICAL.update((i, i.value) for i in DataType)
+_CANONICAL.update((i, i.value) for i in ObjectType)
+'''Values that compare equal to a int (e.g. True or DataType.UNSIGNED8) and the int'''
+
+_ENUM_VALUES = {i: i.value for enum in (DataType, AccessType, ObjectType) for i in enum}
+_DATA_TYPES = {i.value: i for i in DataType}
+_ACCESS_TYPES = {i.value: i for i in AccessType}
+_OBJECT_TYPES = {i.value: i for i in ObjectType}
+'''The enums and their values, to pickle enums as small ints'''
+
+
+def _digest(values: tuple) -> bytes:
+    '''
+    Get a 128-bit digest of a tuple of (hashable) values.
+
+    Values that compare equal to a int have the same digest as the int (e.g. True and 1), so
+    equal values have equal digests.
+    '''
+
+    values = tuple(map(_CANONICAL.get, values, values))
+    return blake2b(repr(values).encode(), digest_size=16).digest()
 
 
-@dataclass
 class Variable:
-    '''Holds EDS variable data'''
-
-    comments: str = ''
-    parameter_name: str = 'New Variable'
-    denotation: str = ''
-    data_type: DataType = DataType.UNSIGNED32
-    low_limit: str = ''
-    high_limit: str = ''
-    default_value: str = ''
-    access_type: AccessType = AccessType.RW
-    pdo_mapping: bool = False
-    object_type: ObjectType = ObjectType.VAR
-    storage_location: str = ''  # for CANopenNode support
+    '''Holds EDS variable data
+
+    Uses `__slots__` instead of a per-instance `__dict__` as a OD can have a lot of variables.
+
+    The `default_value`, `low_limit`, and `high_limit` strings are kept as is (for saving) and
+    are only parsed into typed values (`value`, `low_limit_value`, and `high_limit_value`) once,
+    the first time one is used after a change.
+
+    A binary `default_value` (e.g. for a OCTET_STRING) can also be set as bytes, it is then kept
+    as bytes and only formatted as hex text when `default_value` is read or the variable is
+    saved.
+    '''
+
+    __slots__ = ('comments', 'parameter_name', 'denotation', 'data_type', '_low_limit',
+                 '_high_limit', '_default_value', 'access_type', 'pdo_mapping', 'object_type',
+                 'storage_location', '_values', '_owner', '_key')
+
+    _FIELDS = ('comments', 'parameter_name', 'denotation', 'data_type', 'low_limit',
+               'high_limit', 'default_value', 'access_type', 'pdo_mapping', 'object_type',
+               'storage_location')
+
+    _UNTRACKED = frozenset(('_low_limit', '_high_limit', '_default_value', '_values', '_owner',
+                            '_key', '__class__'))
+    '''Slots that do not change the variable's data, see `_Owned`'''
+
+    def __init__(self, comments: str = '', parameter_name: str = 'New Variable',
+                 denotation: str = '', data_type: DataType = DataType.UNSIGNED32,
+                 low_limit: str = '', high_limit: str = '', default_value: str = '',
+                 access_type: AccessType = AccessType.RW, pdo_mapping: bool = False,
+                 object_type: ObjectType = ObjectType.VAR, storage_location: str = ''):
+
+        self._values = None  # (data_type, value, low_limit_value, high_limit_value)
+        self._owner = None  # the record/array or EDS the variable is in, see `_Owned`
+        self._key = None  # the subindex or index of the variable in its owner
+        self.comments = comments
+        self.parameter_name = parameter_name
+        self.denotation = denotation
+        self.data_type = data_type
+        self.low_limit = low_limit
+        self.high_limit = high_limit
+        self.default_value = default_value
+        self.access_type = access_type
+        self.pdo_mapping = pdo_mapping
+        self.object_type = object_type
+        self.storage_location = storage_location  # for CANopenNode support
+
+    def __getstate__(self) -> tuple:
+        # the enums as ints, for compact pickles
+        fields = _variable_fields(self)
+        return fields[:3] + (_ENUM_VALUES.get(fields[3], fields[3]),) + fields[4:7] + \
+            (_ENUM_VALUES.get(fields[7], fields[7]), fields[8],
+             _ENUM_VALUES.get(fields[9], fields[9]), fields[10])
+
+    def __setstate__(self, state: tuple):
+        fields = state[:3] + (_DATA_TYPES.get(state[3], state[3]),) + state[4:7] + \
+            (_ACCESS_TYPES.get(state[7], state[7]), state[8],
+             _OBJECT_TYPES.get(state[9], state[9]), state[10])
+        self._set_fields(fields)
+
+    def _set_fields(self, fields: tuple):
+        '''Set all the fields of a new variable (from `_fields`) at once.'''
+
+        self._values = None
+        self._owner = None
+        self._key = None
+        self.comments, self.parameter_name, self.denotation, self.data_type, self._low_limit, \
+            self._high_limit, self._default_value, self.access_type, self.pdo_mapping, \
+            self.object_type, self.storage_location = fields
+
+    def __deepcopy__(self, memo: dict):
+        # all fields are immutable, so this is a lot faster than the pickle protocol
+        copy = self._BASE.__new__(self._BASE)
+        copy._set_fields(_variable_fields(self))
+        copy._values = self._values
+        return copy
+
+    def _fields(self) -> tuple:
+        return _variable_fields(self)
+
+    def _canonical_fields(self) -> tuple:
+        '''Get the fields to compare, a OCTET_STRING value as bytes and other bytes as hex text.'''
+
+        fields = _variable_fields(self)
+
+        default_value = self._default_value
+        if default_value.__class__ is bytes:
+            if self.data_type is not DataType.OCTET_STRING:
+                fields = fields[:6] + (format_bytes(default_value),) + fields[7:]
+        elif default_value and self.data_type is DataType.OCTET_STRING:
+            # the format of the hex text does not matter
+            value = self.value
+            if value.__class__ is bytes:
+                fields = fields[:6] + (value,) + fields[7:]
+
+        return fields
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Variable):
+            return NotImplemented
+
+        return self._canonical_fields() == other._canonical_fields()
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{i}={getattr(self, i)!r}' for i in self._FIELDS)
+        return f'{self._BASE.__name__}({fields})'
 
     def __hash__(self):
         return hash((self.parameter_name, self.data_type, self.comments))
 
+    def digest(self) -> bytes:
+        '''Get a 128-bit digest of all the fields, equal variables have equal digests.'''
+
+        return _digest(self._canonical_fields())
+
+    def _own(self, owner, key: int):
+        '''Make a record/array or EDS the owner of the variable, see `_Owned`.'''
+
+        self.__class__ = self._OWNED
+        self._owner = owner
+        self._key = key
+
+    def _disown(self):
+        '''Remove the variable's owner.'''
+
+        self.__class__ = self._BASE
+        self._owner = None
+        self._key = None
+
+    @property
+    def default_value(self) -> str:
+        '''
+        str: The default value, as it is in the EDS/DCF. Can also be set to bytes, bytearray, or
+        memoryview for a binary value, which is read back as space-separated hex text.
+        '''
+
+        default_value = self._default_value
+        if default_value.__class__ is bytes:
+            return format_bytes(default_value)
+
+        return default_value
+
+    @default_value.setter
+    def default_value(self, default_value: str):
+        if isinstance(default_value, (bytes, bytearray, memoryview)):
+            default_value = bytes(default_value)  # a immutable copy, if not already bytes
+        self._default_value = default_value
+        self._values = None
+
+    @property
+    def low_limit(self) -> str:
+        '''str: The low limit, as it is in the EDS/DCF'''
+
+        return self._low_limit
+
+    @low_limit.setter
+    def low_limit(self, low_limit: str):
+        self._low_limit = low_limit
+        self._values = None
+
+    @property
+    def high_limit(self) -> str:
+        '''str: The high limit, as it is in the EDS/DCF'''
+
+        return self._high_limit
+
+    @high_limit.setter
+    def high_limit(self, high_limit: str):
+        self._high_limit = high_limit
+        self._values = None
+
+    def _typed_values(self) -> tuple:
+        '''Get the cached typed values, parsing them if a value or the data type changed.'''
+
+        values = self._values
+        if values is None or values[0] is not self.data_type:
+            data_type = self.data_type
+            default_value = self._default_value
+            if default_value.__class__ is bytes:
+                # the value is the bytes themselves for a binary data type, not a copy
+                default_value = default_value if data_type in _BYTES_DATA_TYPES else \
+                    parse_value(format_bytes(default_value), data_type)
+            else:
+                default_value = parse_value(default_value, data_type)
+            values = (
+                data_type,
+                default_value,
+                parse_value(self._low_limit, data_type),
+                parse_value(self._high_limit, data_type),
+            )
+            self._values = values
+
+        return values
+
+    @property
+    def value(self):
+        '''
+        None, int, float, bytes, str, or NodeIdValue: The default value parsed for the data
+        type, see `parse_value`
+        '''
+
+        return self._typed_values()[1]
+
+    @property
+    def low_limit_value(self):
+        '''None, int, float, bytes, str, or NodeIdValue: The low limit parsed for the data type'''
+
+        return self._typed_values()[2]
+
+    @property
+    def high_limit_value(self):
+        '''None, int, float, bytes, str, or NodeIdValue: The high limit parsed for the data type'''
+
+        return self._typed_values()[3]
+
 
 class Record:
     '''Holds EDS record data'''
 
+    __slots__ = ('parameter_name', 'denotation', 'comments', 'object_type', '_storage_location',
+                 '_data', '_subindexes', '_owner', '_key')
+
+    _STATE = ('parameter_name', 'denotation', 'comments', 'object_type', '_storage_location',
+              '_data')
+    '''The slots to pickle / copy'''
+
+    _UNTRACKED = frozenset(('_storage_location', '_data', '_subindexes', '_owner', '_key',
+                            '__class__'))
+    '''Slots that are not changed directly (or do not change the record's data), see `_Owned`'''
+
     def __init__(self, parameter_name='New Record'):
         '''
         Parameters
@@ -37,6 +276,8 @@ class Record:
             Name of the new record.
         '''
 
+        self._owner = None  # the EDS the record is in, see `_Owned`
+        self._key = None  # the index of the record in its EDS
         self.parameter_name = parameter_name
         self.denotation = ''
         self.comments = ''
@@ -50,6 +291,27 @@ class Record:
                 default_value='0x00'
             )
         }
+        self._subindexes = [0]  # sorted keys of _data
+
+    def __getstate__(self) -> tuple:
+        # the object type as a int, for compact pickles
+        state = [getattr(self, i) for i in self._STATE]
+        state[3] = _ENUM_VALUES.get(state[3], state[3])
+        return tuple(state)
+
+    def __setstate__(self, state: tuple):
+        self._owner = None
+        self._key = None
+        state = state[:3] + (_OBJECT_TYPES.get(state[3], state[3]),) + state[4:]
+        for name, value in zip(self._STATE, state):
+            setattr(self, name, value)
+        self._subindexes = sorted(self._data)
+
+    def __deepcopy__(self, memo: dict):
+        copy = self._BASE.__new__(self._BASE)
+        copy.__setstate__(self.__getstate__())
+        copy._data = {i: deepcopy(j, memo) for i, j in self._data.items()}
+        return copy
 
     def __eq__(self, other) -> bool:
 
@@ -72,9 +334,56 @@ class Record:
 
         return True
 
+    def digest(self) -> bytes:
+        '''
+        Get a 128-bit digest of the record and its subindexes, equal records have equal
+        digests.
+        '''
+
+        values = tuple(getattr(self, i) for i in self._STATE if i != '_data')
+        values += tuple((i, self._data[i].digest()) for i in self._subindexes)
+
+        return _digest(values)
+
+    def _own(self, owner, key: int):
+        '''Make a EDS the owner of the record and the record the owner of its subindexes.'''
+
+        self.__class__ = self._OWNED
+        self._owner = owner
+        self._key = key
+
+        for subindex, variable in self._data.items():
+            variable._own(self, subindex)
+
+    def _disown(self):
+        '''Remove the record's owner.'''
+
+        self.__class__ = self._BASE
+        self._owner = None
+        self._key = None
+
+        for variable in self._data.values():
+            variable._disown()
+
+    def _will_change(self, subindex: int):
+        '''Called by a owned subindex before it is changed, passes it on to the EDS.'''
+
+        if self._owner is not None:
+            self._owner._will_change(self._key)
+
+    def _changed(self, subindex: int, change_type: ChangeType, field: str = None, old=None,
+                 new=None):
+        '''Called by a owned subindex when it is changed, passes the change on to the EDS.'''
+
+        if self._owner is not None:
+            self._owner._changed(self._key, change_type, field, old, new, subindex)
+
     def __len__(self) -> int:
         return len(self._data)
 
+    def __contains__(self, subindex: int) -> bool:
+        return subindex in self._data
+
     def __getitem__(self, subindex: int) -> Variable:
         return self._data[subindex]
 
@@ -88,13 +397,26 @@ class Record:
             raise ValueError('Subindex already exists')
         else:
             variable.storage_location = self.storage_location
-            self._data[subindex] = variable
+            self._add(subindex, variable)
+
+    def _add(self, subindex: int, variable: Variable):
+        '''Add a new subindex, keeping the subindexes ordered and subindex 0 up to date'''
+
+        if self._owner is not None:
+            self._owner._will_change(self._key)
+
+        self._data[subindex] = variable
+
+        if subindex > self._subindexes[-1]:
+            self._subindexes.append(subindex)
+        else:
+            insort(self._subindexes, subindex)
 
-            # make sure the subindexes are ordered
-            self._data = dict(sorted(self._data.items()))
+        if self._owner is not None:
+            variable._own(self, subindex)
+            self._owner._changed(self._key, ChangeType.INSERT, new=variable, subindex=subindex)
 
-            # update record highest subindex
-            self._data[0].default_value = f'0x{list(self._data)[-1]:02X}'
+        self._update('subindex 0', Record._set_highest_subindex)
 
     def __delitem__(self, subindex: int):
         '''Remove a subindex from the record'''
@@ -104,16 +426,57 @@ class Record:
         if subindex not in self._data:
             raise ValueError('Subindex does not exist')
 
-        del self._data[subindex]
+        if self._owner is not None:
+            self._owner._will_change(self._key)
+
+        variable = self._data.pop(subindex)
+        variable._disown()
+        del self._subindexes[bisect_left(self._subindexes, subindex)]
+
+        if self._owner is not None:
+            self._owner._changed(self._key, ChangeType.REMOVE, old=variable, subindex=subindex)
+
+        self._update('subindex 0', Record._set_subindex_count)
+
+    def _update(self, group: str, update):
+        '''
+        Update the subindexes now, or at the end of the EDS's batch if in one (see `EDS.batch`).
+
+        Paramters
+        ---------
+        group: str
+            The group of the update, only the last update in each group is done.
+        update: Callable[[Record], None]
+            The update.
+        '''
+
+        owner = self._owner
+        if owner is not None and owner._batch_depth:
+            owner._deferred[(id(self), group)] = (self, update)
+        else:
+            update(self)
+
+    def _set_highest_subindex(self):
+        '''Set subindex 0 to the highest subindex.'''
+
+        self._data[0].default_value = f'0x{self._subindexes[-1]:02X}'
+
+    def _set_subindex_count(self):
+        '''Set subindex 0 to the number of subindexes.'''
 
-        # update record size subindex
         self._data[0].default_value = f'0x{len(self._data) - 1:02X}'
 
+    def _set_subindexes_storage_location(self):
+        '''Set all the subindexes to the record's storage location.'''
+
+        for i in self._data:
+            self._data[i].storage_location = self._storage_location
+
     @property
     def subindexes(self) -> List[int]:
-        '''Get the list of subindexes'''
+        '''Get the sorted list of subindexes (do not modify, it is not a copy)'''
 
-        return list(self._data.keys())
+        return self._subindexes
 
     @property
     def storage_location(self) -> str:
@@ -124,15 +487,19 @@ class Record:
     @storage_location.setter
     def storage_location(self, storage_location: str):
 
-        for i in self._data:
-            self._data[i].storage_location = storage_location
-
         self._storage_location = storage_location
+        self._update('storage location', Record._set_subindexes_storage_location)
 
 
 class Array(Record):
     '''Holds EDS array data'''
 
+    __slots__ = ('_data_type',)
+
+    _STATE = Record._STATE + ('_data_type',)
+
+    _UNTRACKED = Record._UNTRACKED | {'_data_type'}
+
     def __init__(self, parameter_name='New Array', data_type: DataType = None):
         '''
         Parameters
@@ -147,6 +514,14 @@ class Array(Record):
         self.object_type = ObjectType.ARRAY
         self._data_type = data_type
 
+    def __getstate__(self) -> tuple:
+        # the data type as a int, for compact pickles
+        state = super().__getstate__()
+        return state[:-1] + (_ENUM_VALUES.get(state[-1], state[-1]),)
+
+    def __setstate__(self, state: tuple):
+        super().__setstate__(state[:-1] + (_DATA_TYPES.get(state[-1], state[-1]),))
+
     def __eq__(self, other) -> bool:
 
         if not super().__eq__(other):
@@ -169,17 +544,12 @@ class Array(Record):
             raise ValueError('Variable\'s data type does not match array\'s data type')
         else:
             variable.storage_location = self.storage_location
-            self._data[subindex] = variable
 
             # set the data_type if not set
             if not self._data_type:
-                self._data_type = variable.data_type
+                self.data_type = variable.data_type
 
-            # make sure the subindexes are ordered
-            self._data = dict(sorted(self._data.items()))
-
-            # update record highest subindex
-            self._data[0].default_value = f'0x{list(self._data)[-1]:02X}'
+            self._add(subindex, variable)
 
     @property
     def data_type(self) -> DataType:
@@ -189,7 +559,219 @@ class Array(Record):
     @data_type.setter
     def data_type(self, data_type: DataType):
         self._data_type = data_type
+        self._update('data type', Array._set_subindexes_data_type)
+
+    def _set_subindexes_data_type(self):
+        '''Set all the subindexes (except subindex 0) to the array's data type.'''
 
         for i in self._data:
             if i != 0:
-                self._data[i].data_type = data_type
+                self._data[i].data_type = self._data_type
+
+
+class _Owned:
+    '''
+    Mixin for the objects in a EDS (directly or as a subindex) that tells the owner (the EDS or
+    record/array) when the object is changed, so the EDS can keep its fingerprint up to date
+    (see `EDS.fingerprint`), tell its subscribers (see `EDS.subscribe`), and copy the object for
+    its snapshots first (see `EDS.snapshot`).
+
+    An object's class is only swapped to the owned version of it while it is in a EDS, so
+    setting attributes of all other objects (e.g. while reading a file) is not slowed down.
+    An object can only be in one EDS at a time.
+    '''
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value):
+        if name in self._UNTRACKED:
+            _object_setattr(self, name, value)
+            return
+
+        self._owner._will_change(self._key)
+        old = getattr(self, name, None)
+        _object_setattr(self, name, value)
+        self._owner._changed(self._key, ChangeType.SET, name, old, value)
+
+    def __reduce_ex__(self, protocol):
+        # copies and pickles are not in a EDS
+        return self._BASE.__new__, (self._BASE,), self.__getstate__()
+
+
+class _OwnedVariable(_Owned, Variable):
+    __slots__ = ()
+    _BASE = Variable
+
+
+class _OwnedRecord(_Owned, Record):
+    __slots__ = ()
+    _BASE = Record
+
+
+class _OwnedArray(_Owned, Array):
+    __slots__ = ()
+    _BASE = Array
+
+
+_VARIABLE_SLOTS = tuple(f'_{i}' if i in ('low_limit', 'high_limit', 'default_value') else i
+                        for i in Variable._FIELDS)
+'''The slots of the fields, in `_FIELDS` order'''
+
+_variable_fields = attrgetter(*_VARIABLE_SLOTS)
+
+Variable._BASE, Variable._OWNED = Variable, _OwnedVariable
+Record._BASE, Record._OWNED = Record, _OwnedRecord
+Array._BASE, Array._OWNED = Array, _OwnedArray
+
+
+_VARIABLE, _RECORD, _ARRAY = range(3)
+_KINDS = {Variable: _VARIABLE, Record: _RECORD, Array: _ARRAY}
+'''The kinds of objects, see `pack_objects`'''
+
+_get_base = attrgetter('_BASE')
+
+_RECORD_FIELDS = ('parameter_name', 'denotation', 'comments', 'object_type',
+                  '_storage_location', '_data_type')
+_RECORD_STRING_FIELDS = (0, 1, 2, 4)
+_STRING_FIELDS = (0, 1, 2, 4, 5, 6, 10)
+_ENUM_FIELDS = (3, 7, 9)
+_FIELD_GETTERS = tuple(attrgetter(i) for i in _VARIABLE_SLOTS)
+_get_enum_value = attrgetter('_value_')
+_FIELD_DECODERS = (None, None, None, _DATA_TYPES.__getitem__, None, None, None,
+                   _ACCESS_TYPES.__getitem__, bool, _OBJECT_TYPES.__getitem__, None)
+'''How the packed Variable fields (in `_FIELDS` order) are stored, see `pack_objects`'''
+
+
+def pack_objects(objects: Dict[int, Variable]) -> Tuple[tuple, array]:
+    '''
+    Pack objects into a flat array of small ints and a table of the unique strings, for compact
+    and fast pickles of a whole OD (e.g. to send a EDS to worker processes).
+
+    Each string is only stored once and is referenced by its position in the table, enums are
+    stored as their values, and the fields of all the objects are stored as columns, so most of
+    the work is done by builtins instead of per object.
+
+    Paramters
+    ---------
+    objects: dict
+        index: Variable, Record, or Array.
+
+    Returns
+    -------
+    Tuple[tuple, array]
+        The strings and the ints, see `unpack_objects`.
+    '''
+
+    values = list(objects.values())
+    kinds = list(map(_KINDS.__getitem__, map(_get_base, values)))
+    sizes = []  # the number of variables in each object
+    subindexes = []  # for each variable, 0 for a VAR
+    variables = []
+    records = []  # the fields of each record and array
+
+    for obj, kind in zip(values, kinds):
+        if kind == _VARIABLE:
+            sizes.append(1)
+            subindexes.append(0)
+            variables.append(obj)
+            continue
+
+        data = obj._data
+        data_type = obj._data_type if kind == _ARRAY else None
+        sizes.append(len(data))
+        subindexes += data
+        variables += data.values()
+        records.append((obj.parameter_name, obj.denotation, obj.comments, obj.object_type,
+                        obj._storage_location, 0 if data_type is None else data_type))
+
+    columns = [list(map(i, variables)) for i in _FIELD_GETTERS]
+    records = list(zip(*records)) or [()] * len(_RECORD_FIELDS)
+
+    strings = dict.fromkeys(chain.from_iterable(
+        [columns[i] for i in _STRING_FIELDS] + [records[i] for i in _RECORD_STRING_FIELDS]))
+    string_id = dict(zip(strings, count())).__getitem__
+
+    ints = [len(values), len(variables), len(records[0])]
+    ints += objects
+    ints += kinds
+    ints += sizes
+    ints += subindexes
+    for i, column in enumerate(columns):
+        ints += map(string_id if i in _STRING_FIELDS else _get_enum_value
+                    if i in _ENUM_FIELDS else int, column)
+    for i, column in enumerate(records):
+        ints += map(string_id, column) if i in _RECORD_STRING_FIELDS else column
+
+    # the smallest ints that fit
+    largest = max(ints)
+    typecode = 'B' if largest < 0x100 else 'H' if largest < 0x10000 else 'I'
+    return tuple(strings), array(typecode, ints)
+
+
+def unpack_objects(strings: tuple, ints: array) -> Dict[int, Variable]:
+    '''
+    Unpack objects packed with `pack_objects`.
+
+    Paramters
+    ---------
+    strings: tuple
+        The table of strings.
+    ints: array
+        The packed objects.
+
+    Returns
+    -------
+    dict
+        index: Variable, Record, or Array.
+    '''
+
+    pos = 3
+
+    def take(size: int):
+        nonlocal pos
+        pos += size
+        return ints[pos - size:pos]
+
+    number_of_objects, number_of_variables, number_of_records = ints[:3]
+    indexes = take(number_of_objects)
+    kinds = take(number_of_objects)
+    sizes = take(number_of_objects)
+    subindexes = take(number_of_variables)
+    columns = [map(strings.__getitem__ if i in _STRING_FIELDS else decode,
+                   take(number_of_variables))
+               for i, decode in enumerate(_FIELD_DECODERS)]
+    records = zip(*[take(number_of_records) for _ in _RECORD_FIELDS])
+
+    new = object.__new__
+    variables = []
+    for fields in zip(*columns):
+        var = new(Variable)
+        var._set_fields(fields)
+        variables.append(var)
+
+    objects = {}
+    start = 0
+    for index, kind, size in zip(indexes, kinds, sizes):
+        if kind == _VARIABLE:
+            objects[index] = variables[start]
+            start += 1
+            continue
+
+        parameter_name, denotation, comments, object_type, storage_location, data_type = \
+            next(records)
+        obj = new(Array if kind == _ARRAY else Record)
+        obj._owner = None
+        obj._key = None
+        obj.parameter_name = strings[parameter_name]
+        obj.denotation = strings[denotation]
+        obj.comments = strings[comments]
+        obj.object_type = _OBJECT_TYPES[object_type]
+        obj._storage_location = strings[storage_location]
+        if kind == _ARRAY:
+            obj._data_type = _DATA_TYPES.get(data_type)  # 0 for None
+        obj._data = dict(zip(subindexes[start:start + size], variables[start:start + size]))
+        obj._subindexes = sorted(obj._data)
+        objects[index] = obj
+        start += size
+
+    return objects
@@ -0,0 +1,76 @@
+'''Secondary indexes on the objects in a EDS, see `EDS.find` and the other EDS queries'''
+
+from typing import Dict, List, Set, Tuple
+
+from . import DataType
+from .objects import Variable
+
+
+def normalize_name(name: str) -> str:
+    '''Normalize a parameter name for searching, ignores case and repeated whitespace.'''
+
+    return ' '.join(name.casefold().split())
+
+
+class ODIndex:
+    '''
+    Secondary indexes on the objects in a EDS, by storage location, by data type, by
+    PDO-mappable bit size, and by normalized parameter name.
+
+    The indexes are kept up to date by the EDS marking the indexes of changed objects dirty,
+    only the dirty objects are re-indexed before the next query. Objects are keyed by
+    (index, subindex) with a subindex of None for the objects themselves.
+    '''
+
+    def __init__(self):
+        self.dirty = set()  # indexes to re-index before the next query
+        self._entries = {}  # index: [(dict, key, item)] for every entry the object added
+        self.storage_locations: Dict[str, Set[int]] = {}
+        self.data_types: Dict[DataType, Set[Tuple[int, int]]] = {}
+        self.pdo_mappable: Dict[int, Set[Tuple[int, int]]] = {}  # size in bits: objects
+        self.names: Dict[str, Set[Tuple[int, int]]] = {}
+
+    def update(self, data: dict):
+        '''Re-index the dirty objects.'''
+
+        for index in self.dirty:
+            for table, key, item in self._entries.pop(index, ()):
+                items = table[key]
+                items.discard(item)
+                if not items:
+                    del table[key]
+
+            if index in data:
+                self._add(index, data[index])
+
+        self.dirty.clear()
+
+    def _add(self, index: int, obj):
+        entries = []
+
+        def add(table: dict, key, item):
+            table.setdefault(key, set()).add(item)
+            entries.append((table, key, item))
+
+        add(self.storage_locations, obj.storage_location, index)
+        add(self.names, normalize_name(obj.parameter_name), (index, None))
+
+        if isinstance(obj, Variable):
+            variables = [((index, None), obj)]
+        else:
+            variables = [((index, i), obj[i]) for i in obj.subindexes]
+
+        for key, var in variables:
+            if key[1] is not None:
+                add(self.names, normalize_name(var.parameter_name), key)
+            add(self.data_types, var.data_type, key)
+            if var.pdo_mapping:
+                add(self.pdo_mappable, var.data_type.size, key)
+
+        self._entries[index] = entries
+
+
+def sorted_keys(keys) -> List[Tuple[int, int]]:
+    '''Sort (index, subindex) keys, a subindex of None (the object itself) sorts first.'''
+
+    return sorted(keys, key=lambda i: (i[0], -1 if i[1] is None else i[1]))
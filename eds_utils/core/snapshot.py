@@ -0,0 +1,110 @@
+'''Immutable snapshots of a EDS, see `EDS.snapshot`'''
+
+from typing import List
+
+
+class EDSSnapshot:
+    '''
+    A immutable snapshot of a EDS, made with `EDS.snapshot()`.
+
+    A snapshot shares every object with the EDS (and with other snapshots) until the object is
+    changed in the EDS, only then is a copy of the object made for the snapshot. So a snapshot
+    costs O(objects) references to make and a copy of each object changed afterwards, instead of
+    a copy of the whole OD.
+
+    The objects in a snapshot must not be changed.
+    '''
+
+    __slots__ = ('_data', 'file_info', 'device_info', 'device_commissioning', 'comment',
+                 'canopennode', 'storage_locations', '_fingerprint', '__weakref__')
+
+    def __init__(self, data: dict, file_info, device_info, device_commissioning, comment: str,
+                 canopennode: bool, storage_locations: tuple, fingerprint: str):
+        '''
+        Parameters
+        ----------
+        data: dict
+            The objects, index: object. Owned by the snapshot.
+        file_info: FileInfo
+            A copy of the EDS's file info.
+        device_info: DeviceInfo
+            A copy of the EDS's device info.
+        device_commissioning: DeviceCommissioning
+            A copy of the EDS's device commissioning.
+        comment: str
+            The EDS's comment.
+        canopennode: bool
+            The EDS's CANopenNode flag.
+        storage_locations: tuple
+            The EDS's storage locations.
+        fingerprint: str
+            The EDS's fingerprint.
+        '''
+
+        self._data = data
+        self.file_info = file_info
+        self.device_info = device_info
+        self.device_commissioning = device_commissioning
+        self.comment = comment
+        self.canopennode = canopennode
+        self.storage_locations = storage_locations
+        self._fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._data
+
+    def __getitem__(self, index: int):
+        return self._data[index]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    @property
+    def indexes(self) -> List[int]:
+        '''The list of indexes in the OD'''
+
+        return list(self._data)
+
+    def fingerprint(self) -> str:
+        '''Get the fingerprint the EDS had when the snapshot was made, see `EDS.fingerprint`.'''
+
+        return self._fingerprint
+
+    def __eq__(self, other) -> bool:
+        if not hasattr(other, 'fingerprint'):
+            return NotImplemented
+
+        return self._fingerprint == other.fingerprint()
+
+    def diff(self, other) -> List[int]:
+        '''
+        Get the indexes of the objects that differ between the snapshot and a EDS or another
+        snapshot of it.
+
+        Only objects that are not shared are compared, so this costs O(objects) identity checks
+        and a comparison for each object changed since the snapshot.
+
+        Paramters
+        ---------
+        other: EDS or EDSSnapshot
+            The EDS or snapshot to compare to.
+
+        Returns
+        -------
+        List[int]
+            The sorted list of indexes that were added, removed, or changed.
+        '''
+
+        data = self._data
+        other_data = other._data
+
+        indexes = [i for i in data if i not in other_data]
+        for index, obj in other_data.items():
+            old = data.get(index)
+            if old is not obj and (old is None or old._BASE is not obj._BASE or old != obj):
+                indexes.append(index)
+
+        return sorted(indexes)
@@ -0,0 +1,121 @@
+'''Typed values for the DefaultValue, LowLimit, and HighLimit strings from EDS/DCF files'''
+
+from functools import lru_cache
+
+from . import DataType, str2int
+
+_STRING_DATA_TYPES = (DataType.VISIBLE_STRING, DataType.UNICODE_STRING)
+_BYTES_DATA_TYPES = (DataType.OCTET_STRING, DataType.DOMAIN)
+_FLOAT_DATA_TYPES = (DataType.REAL32, DataType.REAL64)
+
+NODE_ID = '$NODEID'
+'''The node id placeholder allowed in EDS values'''
+
+
+class NodeIdValue:
+    '''A value relative to the node id (e.g. "$NODEID+0x180"), it is immutable'''
+
+    __slots__ = ('_offset',)
+
+    def __init__(self, offset: int = 0):
+        '''
+        Parameters
+        ----------
+        offset: int
+            The value added to the node id.
+        '''
+
+        self._offset = offset
+
+    @property
+    def offset(self) -> int:
+        '''int: The value added to the node id'''
+
+        return self._offset
+
+    def resolve(self, node_id: int) -> int:
+        '''Get the value for a specific node id.'''
+
+        return node_id + self._offset
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+
+        return self._offset == other._offset
+
+    def __hash__(self):
+        return hash((NODE_ID, self._offset))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(0x{self._offset:X})'
+
+    def __str__(self) -> str:
+        return f'{NODE_ID}+0x{self._offset:X}'
+
+    def __reduce__(self):
+        return self.__class__, (self._offset,)
+
+
+def _parse_node_id(text: str):
+    '''Parse a "$NODEID+<value>" or "<value>+$NODEID" value, or return the text if invalid.'''
+
+    parts = text.replace(' ', '').split('+')
+
+    try:
+        if parts == [NODE_ID]:
+            return NodeIdValue()
+        if len(parts) == 2 and parts[0] == NODE_ID:
+            return NodeIdValue(str2int(parts[1]))
+        if len(parts) == 2 and parts[1] == NODE_ID:
+            return NodeIdValue(str2int(parts[0]))
+    except ValueError:
+        pass
+
+    return text
+
+
+def format_bytes(value: bytes) -> str:
+    '''Format a binary value as the space-separated hex text used in EDS/DCF files.'''
+
+    text = value.hex().upper()
+    return ' '.join([text[i:i + 2] for i in range(0, len(text), 2)])
+
+
+@lru_cache(maxsize=4096)
+def parse_value(text: str, data_type: DataType):
+    '''
+    Parse a DefaultValue, LowLimit, or HighLimit string into a typed value.
+
+    The text of a value that is not valid for the data type is returned as is.
+
+    Paramters
+    ---------
+    text: str
+        The raw value, as it is in the EDS/DCF.
+    data_type: DataType
+        The data type of the value.
+
+    Returns
+    -------
+    None, int, float, bytes, str, or NodeIdValue
+        None for a empty value; bytes for OCTET_STRING and DOMAIN values; str for
+        VISIBLE_STRING and UNICODE_STRING values; float for REAL32 and REAL64 values;
+        NodeIdValue for values with "$NODEID" in them; int for everything else.
+    '''
+
+    if not text:
+        return None
+    if data_type in _STRING_DATA_TYPES:
+        return text
+    if NODE_ID in text:
+        return _parse_node_id(text)
+
+    try:
+        if data_type in _BYTES_DATA_TYPES:
+            return bytes.fromhex(text)
+        if data_type in _FLOAT_DATA_TYPES:
+            return float(text)
+        return str2int(text.strip())
+    except ValueError:
+        return text
@@ -2,7 +2,7 @@ import os
 import sys
 import argparse
 
-from .core.file_io.read_eds import read_eds
+from .core.file_io.eds_cache import read_eds_cached
 from .core.file_io.write_md import write_md
 
 EDS2MD_DESCRIPTION = 'Convert a EDS/DCF file to a md (Markdown) file'
@@ -18,7 +18,7 @@ def eds2md(sys_args=None):
     args = parser.parse_args(sys_args)
 
     try:
-        eds, errors = read_eds(args.filepath)
+        eds, errors = read_eds_cached(args.filepath)
     except FileNotFoundError as exc:
         print(exc)
         sys.exit(1)
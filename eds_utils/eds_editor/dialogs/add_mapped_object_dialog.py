@@ -1,6 +1,5 @@
 from gi.repository import Gtk
 
-from ...core.objects import Variable
 from ...core.eds import EDS
 
 
@@ -40,19 +39,15 @@ class AddMappedObjectDialog(Gtk.Dialog):
         free = 64 - mapped
 
         self._mappable_objs = {}
-        for i in self._eds.indexes:
+        for i, j in self._eds.pdo_mappable(free):
             index = self._eds[i]
-            if isinstance(index, Variable):
-                if index.pdo_mapping and index.data_type.size <= free:
-                    name = f'{index.parameter_name} - {i:X}'
-                    self._mappable_objs[name] = index
+            if j is None:
+                name = f'{index.parameter_name} - {i:X}'
+                self._mappable_objs[name] = index
             else:
-                for j in index.subindexes:
-                    subindex = index[j]
-                    if subindex.pdo_mapping and subindex.data_type.size <= free:
-                        name = f'{index.parameter_name} - {subindex.parameter_name} - ' \
-                               f'{i:4X}sub{j:02X}'
-                        self._mappable_objs[name] = subindex
+                subindex = index[j]
+                name = f'{index.parameter_name} - {subindex.parameter_name} - {i:4X}sub{j:02X}'
+                self._mappable_objs[name] = subindex
 
         label = Gtk.Label.new('Object to Map')
         label.set_halign(Gtk.Align.START)
@@ -45,4 +45,4 @@ class ErrorsDialog(Gtk.Dialog):
     @errors.setter
     def errors(self, errors: list):
 
-        self._errors_text.set_text('\n'.join(errors))
+        self._errors_text.set_text('\n'.join(str(i) for i in errors))
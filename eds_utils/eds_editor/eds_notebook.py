@@ -1,6 +1,5 @@
 from os import remove
 from os.path import basename
-from copy import deepcopy
 
 from gi.repository import Gtk, GLib
 
@@ -34,7 +33,7 @@ class EDSNotebook(Gtk.Notebook):
         self.tmp_file_path = file_path + '.tmp'
         self.eds, errors = read_eds(self.file_path)
 
-        self.eds_bak = deepcopy(self.eds)
+        self.eds_bak = self.eds.snapshot()
 
         if errors:
             errors_dialog = ErrorsDialog(self.parent_window)
@@ -71,7 +70,7 @@ class EDSNotebook(Gtk.Notebook):
 
         write_eds(self.eds, file_path)
 
-        self.eds_bak = deepcopy(self.eds)
+        self.eds_bak = self.eds.snapshot()
 
         # remove temp
         try:
@@ -85,7 +84,7 @@ class EDSNotebook(Gtk.Notebook):
         if self.eds != self.eds_bak:  # only save a temp if something has changed
             write_eds(self.eds, self.tmp_file_path)
 
-            self.eds_bak = deepcopy(self.eds)
+            self.eds_bak = self.eds.snapshot()
 
         return True
 
@@ -34,6 +34,8 @@ class ObjectDictionaryPage(Page):
         box_tree.append(box_search)
 
         self._search_filter_text = ''
+        self._search_matches = set()  # (index, subindex) of the objects that match the search
+        self._search_indexes = set()  # indexes with a object or subindex that match the search
         self._search_entry = Gtk.SearchEntry()
         self._search_entry.set_hexpand(True)
         self._search_entry.connect('changed', self.on_search_entry)
@@ -124,7 +126,9 @@ class ObjectDictionaryPage(Page):
         '''Callback on search filter entry for parameter names'''
 
         if self._tree_filter:
-            self._search_filter_text = self._search_entry.get_text().lower()
+            self._search_filter_text = self._search_entry.get_text()
+            self._search_matches = set(self._eds.find(self._search_filter_text, partial=True))
+            self._search_indexes = {i for i, _ in self._search_matches}
             self._tree_filter.refilter()
 
     def tree_filter_func(self, model: Gtk.TreeStore, iter: Gtk.TreeIter, data) -> bool:
@@ -137,13 +141,12 @@ class ObjectDictionaryPage(Page):
         '''
 
         if self._search_filter_text:
-            # check parent row's children rows for match
-            for i in range(model.iter_n_children(iter)):
-                subindex_iter = model.iter_nth_child(iter, i)
-                if self._search_filter_text in model[subindex_iter][1].lower():
-                    return True  # a subindex row contains search string
+            parent_iter = model.iter_parent(iter)
+            if parent_iter is None:  # a index row, show if it or a subindex row contains it
+                return str2int(model[iter][0]) in self._search_indexes
 
-            return self._search_filter_text in model[iter][1].lower()
+            index = str2int(model[parent_iter][0])
+            return (index, str2int(model[iter][0])) in self._search_matches
 
         return True  # no filter (show all)
 
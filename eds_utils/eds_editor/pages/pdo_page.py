@@ -1,8 +1,9 @@
 from gi.repository import Gtk, Pango
 
-from ...core import str2int, TPDO_TRANSMISSION_TYPES, RPDO_TRANSMISSION_TYPES, pdo_mapping_fields
+from ...core import TPDO_TRANSMISSION_TYPES, RPDO_TRANSMISSION_TYPES, pdo_mapping_fields
 from ...core.eds import EDS
 from ...core.objects import Variable
+from ...core.value import NodeIdValue
 from ..dialogs.add_mapped_object_dialog import AddMappedObjectDialog
 from .page import Page
 
@@ -153,14 +154,14 @@ class PDOPage(Page):
 
         pdo = 1
         for i in range(self._comm_start, self._comm_end):
-            cob_id_raw = self._eds[i][1].default_value.replace(' ', '').split('+')
-            cob_id_int = str2int(cob_id_raw[0])
+            cob_id_value = self._eds[i][1].value
+            cob_id_nodeid = isinstance(cob_id_value, NodeIdValue)
+            cob_id_int = cob_id_value.offset if cob_id_nodeid else cob_id_value
             cob_id = cob_id_int & 0xFFF
-            cob_id_nodeid = len(cob_id_raw) == 2
             valid = not bool(cob_id_int & 0x80000000)
             rtr = not bool(cob_id_int & 0x40000000)
-            trans_time = str2int(self._eds[i][2].default_value)
-            event_time = str2int(self._eds[i][5].default_value)
+            trans_time = self._eds[i][2].value
+            event_time = self._eds[i][5].value
 
             self._grid.get_child_at(self._COB_I, pdo).set_value(cob_id)
             self._grid.get_child_at(self._PLUS_I, pdo).set_active(cob_id_nodeid)
@@ -170,8 +171,8 @@ class PDOPage(Page):
             self._grid.get_child_at(self._EVENT_I, pdo).set_value(event_time)
 
             if self._pdo == 'TPDO':
-                inhibit_time = str2int(self._eds[i][3].default_value)
-                sync_start = str2int(self._eds[i][6].default_value)
+                inhibit_time = self._eds[i][3].value
+                sync_start = self._eds[i][6].value
 
                 self._grid.get_child_at(self._INBIT_I, pdo).set_value(inhibit_time)
                 self._grid.get_child_at(self._SYNC_I, pdo).set_value(sync_start)
@@ -192,8 +193,8 @@ class PDOPage(Page):
                 button = Gtk.Button.new()
                 button.set_child(label)
 
-                value = self._eds[index][subindex].default_value
-                if value == '0x00000000':
+                value = self._eds[index][subindex].value
+                if not value:
                     break
 
                 obj_index, obj_subindex, obj_size = pdo_mapping_fields(value)
@@ -2,8 +2,10 @@ import sys
 import argparse
 
 from .core import ObjectType
-from .core.file_io.read_eds import read_eds
+from .core.eds import EDS
+from .core.file_io.read_eds import read_many
 from .core.file_io.write_eds import write_eds
+from .core.file_io.archive import expand_archives, strip_compression
 
 EDS_MERGE_DESCRIPTION = 'Merge a EDS/DCF into another EDS/DCF'
 
@@ -13,37 +15,65 @@ def eds_merge(sys_args=None):
         sys_args = sys.argv[1:]
 
     parser = argparse.ArgumentParser(description=EDS_MERGE_DESCRIPTION, prog='eds-merge')
-    parser.add_argument('filepath1', metavar='FILEPATH1',
-                        help='file path to EDS/DCF file to merge from')
+    parser.add_argument('filepaths1', metavar='FILEPATH1', nargs='+',
+                        help='file path(s) to EDS/DCF file(s) to merge from, merged in order, '
+                        'zip archives are expanded to all EDS/DCF files in them')
     parser.add_argument('filepath2', metavar='FILEPATH2',
                         help='file path to EDS/DCF file to merge into')
     parser.add_argument('-s', '--strategy', default='diff',
                         help='merge strategy (e.g. diff [default], override)')
     parser.add_argument('-t', '--tpdo', action='store_false', help='don\'t skip TPDOs')
     parser.add_argument('-r', '--rpdo', action='store_false', help='don\'t skip RPDOs')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of files to read in parallel, 0 for the number of CPUs '
+                        '(default: 1, a merge is usually of a few small files)')
     args = parser.parse_args(sys_args)
 
     strategy = args.strategy.lower()
 
     try:
-        eds1, errors1 = read_eds(args.filepath1)
-        eds2, errors2 = read_eds(args.filepath2)
+        sources = expand_archives(args.filepaths1)
+        file_paths = sources + [args.filepath2]
+        files = {path: eds for path, eds, _ in read_many(file_paths, args.jobs or None)}
     except FileNotFoundError as e:
         print(e)
         sys.exit(1)
 
+    eds2 = files[args.filepath2]
+
+    for filepath1 in sources:
+        eds1 = files[filepath1]
+
+        _merge(eds1, eds2, strategy, args.rpdo, args.tpdo)
+
+        # when merging an EDS into a DCF, update the LastEDS field
+        if strip_compression(filepath1).endswith('.eds') \
+                and strip_compression(args.filepath2).endswith('.dcf'):
+            eds2.file_info.last_eds = eds1.file_info.file_name
+
+    write_eds(eds2)
+
+
+def _merge(eds1: EDS, eds2: EDS, strategy: str, skip_rpdo: bool, skip_tpdo: bool):
+    '''Merge eds1 into eds2'''
+
+    eds2_indexes = set(eds2.indexes)
+    new_objects = {}
+
     for index in eds1.indexes:
-        if (args.rpdo and index >= eds1.RPDO_COMM_START and index <= eds1.RPDO_COMM_END) or \
-                (args.tpdo and index >= eds1.TPDO_COMM_START and index <= eds1.TPDO_COMM_END):
+        if (skip_rpdo and index >= eds1.RPDO_COMM_START and index <= eds1.RPDO_COMM_END) or \
+                (skip_tpdo and index >= eds1.TPDO_COMM_START and index <= eds1.TPDO_COMM_END):
             continue
 
         index_obj = eds1[index]
 
-        if strategy == 'override' and index in eds2.indexes:
+        if strategy == 'override' and index in eds2_indexes:
             del eds2[index]
-        if index not in eds2.indexes:
+            eds2_indexes.remove(index)
+        if index not in eds2_indexes:
             print(f'0x{index:04X}')
-            eds2[index] = eds1[index]
+            new_objects[index] = index_obj
+            continue  # the full index is being added
         if strategy == 'override':
             continue  # no need to subindex after doing the full index
 
@@ -55,8 +85,4 @@ def eds_merge(sys_args=None):
                     print(f'0x{index:04X} sub 0x{subindex:02X}')
                     eds2[index][subindex] = eds1[index][subindex]
 
-    # when merging an EDS into a DCF, update the LastEDS field
-    if args.filepath1.endswith('.eds') and args.filepath2.endswith('.dcf'):
-        eds2.file_info.last_eds = eds1.file_info.file_name
-
-    write_eds(eds2)
+    eds2.add_objects(new_objects)  # only sort the OD once
@@ -1,7 +1,12 @@
 import sys
+import json
 import argparse
+from functools import partial
 
-from .core.file_io.read_eds import read_eds
+from .core.diagnostic import Severity
+from .core.file_io.read_eds import ReadMode, read_many
+from .core.file_io.archive import expand_archives
+from .core.file_io.eds_cache import read_eds_cached
 
 EDS_VALIDATE_DESCRIPTION = 'Validate a EDS/DCF file'
 
@@ -11,19 +16,42 @@ def eds_validate(sys_args=None):
         sys_args = sys.argv[1:]
 
     parser = argparse.ArgumentParser(description=EDS_VALIDATE_DESCRIPTION, prog='eds-validate')
-    parser.add_argument('filepath', metavar='FILEPATH', help='file path to EDS/DCF file')
+    parser.add_argument('filepaths', metavar='FILEPATH', nargs='+',
+                        help='file path to EDS/DCF file ("-" for stdin), can be compressed '
+                        '(.gz, .xz, .bz2) or a zip archive of them')
     parser.add_argument('-s', '--silence', action='store_true', help='silence prints to stderr')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of files to read in parallel (default: number of CPUs)')
+    parser.add_argument('-l', '--level', default='info',
+                        choices=[i.to_str().lower() for i in Severity],
+                        help='minimum severity of errors to report (default: info)')
+    parser.add_argument('--json', action='store_true',
+                        help='print errors to stdout as a JSON list')
     args = parser.parse_args(sys_args)
 
+    file_paths = expand_archives(args.filepaths)
+    min_severity = Severity.from_str(args.level)
+    reader = partial(read_eds_cached, min_severity=min_severity, mode=ReadMode.VALIDATE)
+    failed = False
+    records = []
+
     try:
-        _, errors = read_eds(args.filepath)
+        for file_path, _, errors in read_many(file_paths, args.jobs, reader):
+            if errors:
+                failed = True
+
+            if args.json:
+                records += [dict(file=file_path, **i.to_dict()) for i in errors]
+            elif not args.silence:
+                prefix = f'{file_path}: ' if len(file_paths) > 1 else ''
+                for i in errors:
+                    print(prefix + str(i), file=sys.stderr)
     except FileNotFoundError as exc:
         print(exc)
         sys.exit(1)
 
-    if not args.silence:
-        for i in errors:
-            print(i, file=sys.stderr)
+    if args.json:
+        print(json.dumps(records, indent=2))
 
-    if len(errors) > 0:
+    if failed:
         sys.exit(1)
@@ -0,0 +1,98 @@
+import unittest
+
+from eds_utils.core import DataType, AccessType
+from eds_utils.core import columnar
+from eds_utils.core.columnar import ColumnarEDS
+from eds_utils.core.objects import Variable, Record, Array
+from eds_utils.core.eds import EDS
+
+
+def _make_eds() -> EDS:
+    '''Make a eds with a bit of everything'''
+
+    eds = EDS()
+    eds[0x1000] = Variable(parameter_name='Device type')
+    eds[0x1001] = Variable(parameter_name='Error register', data_type=DataType.UNSIGNED8)
+    eds.add_rpdo()
+    eds.add_tpdo()
+    eds.add_tpdo()
+
+    rec = Record('Identity')
+    rec[1] = Variable(parameter_name='Vendor-ID')
+    eds[0x1018] = rec
+
+    arr = Array('Values', DataType.UNSIGNED16)
+    for i in range(1, 5):
+        arr[i] = Variable(parameter_name=f'Value {i}', data_type=DataType.UNSIGNED16,
+                          pdo_mapping=i % 2 == 0)
+    eds[0x2000] = arr
+
+    eds[0x2001] = Variable(parameter_name='Mapped', data_type=DataType.UNSIGNED16,
+                           pdo_mapping=True, default_value='0x10')
+    eds[0x6000] = Variable(parameter_name='Profile', access_type=AccessType.RO)
+
+    return eds
+
+
+class TestColumnarEDS(unittest.TestCase):
+
+    def setUp(self):
+        self.eds = _make_eds()
+        self.ceds = ColumnarEDS.from_eds(self.eds)
+
+    def test_round_trip(self):
+        self.assertEqual(self.ceds.to_eds(), self.eds)
+        self.assertEqual(len(self.ceds), len(self.eds))
+        self.assertEqual(self.ceds.indexes, self.eds.indexes)
+        self.assertEqual(self.ceds.subindexes(0x2000), self.eds[0x2000].subindexes)
+
+    def test_views(self):
+        view = self.ceds.view(0x2000, 2)
+        self.assertEqual(view, self.eds[0x2000][2])
+        self.assertEqual(view.to_variable(), self.eds[0x2000][2])
+        self.assertEqual((view.index, view.subindex), (0x2000, 2))
+        self.assertIsNone(self.ceds.view(0x2001).subindex)
+        with self.assertRaises(KeyError):
+            self.ceds.view(0x2000, 9)
+
+        view.parameter_name = 'Renamed'
+        view.pdo_mapping = False
+        self.assertEqual(self.ceds.view(0x2000, 2).parameter_name, 'Renamed')
+        self.assertEqual(self.ceds.to_eds()[0x2000][2].pdo_mapping, False)
+
+    def test_queries(self):
+        self.assertEqual(self.ceds.mandatory_objects, self.eds.mandatory_objects)
+        self.assertEqual(self.ceds.optional_objects, self.eds.optional_objects)
+        self.assertEqual(self.ceds.manufacturer_objects, self.eds.manufacturer_objects)
+        self.assertEqual(self.ceds.rpdos, self.eds.rpdos)
+        self.assertEqual(self.ceds.tpdos, self.eds.tpdos)
+
+        expected = [(0x2000, 2), (0x2000, 4), (0x2001, None)]
+        self.assertEqual(self.ceds.select(pdo_mapping=True, data_type=DataType.UNSIGNED16),
+                         expected)
+        self.assertEqual(self.ceds.count(pdo_mapping=True, data_type=DataType.UNSIGNED16), 3)
+        self.assertEqual(self.ceds.select(0x2001, pdo_mapping=True), [(0x2001, None)])
+        self.assertEqual(self.ceds.select(default_value='0x10'), [(0x2001, None)])
+        self.assertEqual(self.ceds.select(default_value='not a value'), [])
+
+        # the same with and without numpy
+        if columnar.np is not None:
+            mask = self.ceds.mask(pdo_mapping=True, data_type=DataType.UNSIGNED16)
+            self.assertEqual(int(mask.sum()), 3)
+
+            np = columnar.np
+            columnar.np = None
+            try:
+                self.assertEqual(self.ceds.select(pdo_mapping=True,
+                                                  data_type=DataType.UNSIGNED16), expected)
+            finally:
+                columnar.np = np
+        else:
+            with self.assertRaises(ImportError):
+                self.ceds.mask(pdo_mapping=True)
+
+    def test_strings(self):
+        # every unique string is only stored once
+        names = [self.ceds.view(0x2000, i).default_value for i in range(1, 5)]
+        self.assertEqual(len(set(names)), 1)
+        self.assertLess(len(self.ceds.strings), self.ceds.rows * 3)
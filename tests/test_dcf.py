@@ -0,0 +1,135 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from eds_utils.core import DataType
+from eds_utils.core.objects import Variable, Record
+from eds_utils.core.eds import EDS
+from eds_utils.core.dcf import DCFOverlay
+from eds_utils.core.file_io.read_eds import read_eds
+from eds_utils.core.file_io.write_eds import write_eds
+from eds_utils.core.file_io.dcf_overlay import read_dcf_overlay, write_dcf_overlay
+
+
+def _make_eds() -> EDS:
+    '''Make a small eds with variables and a record'''
+
+    eds = EDS()
+    eds[0x1000] = Variable(parameter_name='Device type')
+    eds[0x1001] = Variable(parameter_name='Error register', data_type=DataType.UNSIGNED8)
+    rec = Record('Identity')
+    rec[1] = Variable(parameter_name='Vendor-ID')
+    eds[0x1018] = rec
+    eds[0x2000] = Variable(parameter_name='Gain', data_type=DataType.UNSIGNED16,
+                           default_value='0x10')
+
+    return eds
+
+
+class TestDCFOverlay(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.eds_path = os.path.join(self.tmp_dir.name, 'device.eds')
+        write_eds(_make_eds(), self.eds_path)
+        self.base = read_eds(self.eds_path)[0].snapshot()
+
+        # a node's dcf made from the eds
+        node, _ = read_eds(self.eds_path)
+        node.device_commissioning.node_id = 0x12
+        node.device_commissioning.node_name = 'node'
+        node[0x2000].default_value = '0x20'
+        node[0x2000].denotation = 'Left gain'
+        node[0x1018].denotation = 'Identity of the node'
+        self.node = node
+        self.dcf_path = os.path.join(self.tmp_dir.name, 'node.dcf')
+        write_eds(node, self.dcf_path, dcf=True)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_write(self):
+        dcf, errors = read_dcf_overlay(self.dcf_path, self.base)
+
+        self.assertEqual(errors, read_eds(self.dcf_path)[1])
+        self.assertEqual(dcf.overrides, {
+            (0x1018, None): {'denotation': 'Identity of the node'},
+            (0x2000, None): {'default_value': '0x20', 'denotation': 'Left gain'},
+        })
+        self.assertEqual(dcf.device_commissioning.node_id, 0x12)
+        self.assertEqual(dcf.to_eds(), read_eds(self.dcf_path)[0])
+
+        # objects without overrides are the base objects
+        self.assertIs(dcf[0x1000], self.base[0x1000])
+        self.assertEqual(dcf[0x2000].default_value, '0x20')
+        self.assertEqual(self.base[0x2000].default_value, '0x10')
+
+        # writes a normal dcf
+        file_path = os.path.join(self.tmp_dir.name, 'copy.dcf')
+        write_dcf_overlay(dcf, file_path)
+        self.assertEqual(read_eds(file_path)[0], read_eds(self.dcf_path)[0])
+        self.assertEqual(read_dcf_overlay(file_path, self.base)[0], dcf)
+
+    def test_header(self):
+        # the dcf's own device info, comment, and storage locations are kept
+        self.node.device_info.product_name = 'Node product'
+        self.node.comment = 'node comment'
+        self.node.canopennode = True
+        self.node.add_storage_location('PERSIST_COMM')
+        self.node.add_storage_location('RAM')
+        for i in self.node.indexes:
+            self.node[i].storage_location = 'RAM'
+        self.node[0x2000].storage_location = 'PERSIST_COMM'
+        write_eds(self.node, self.dcf_path, dcf=True)
+        expected = read_eds(self.dcf_path)[0]
+
+        dcf, _ = read_dcf_overlay(self.dcf_path, self.base)
+        self.assertEqual(dcf.device_info.product_name, 'Node product')
+        self.assertEqual(dcf.storage_locations, expected.storage_locations)
+        self.assertEqual(dcf.overrides[(0x1018, None)]['storage_location'], 'RAM')
+        self.assertEqual(dcf.to_eds(), expected)
+        self.assertNotEqual(dcf, DCFOverlay.from_eds(self.base, read_eds(self.eds_path)[0]))
+
+        file_path = os.path.join(self.tmp_dir.name, 'copy.dcf')
+        write_dcf_overlay(dcf, file_path)
+        self.assertEqual(read_eds(file_path)[0], expected)
+
+        # the comment is not part of the file
+        dcf = DCFOverlay.from_eds(self.base, self.node)
+        self.assertEqual(dcf.comment, 'node comment')
+        self.assertEqual(dcf.to_eds(), self.node)
+
+    def test_overrides(self):
+        dcf = DCFOverlay.from_eds(self.base, self.node)
+        other = DCFOverlay(self.base, device_commissioning=dcf.device_commissioning)
+
+        self.assertNotEqual(dcf, other)
+        self.assertEqual(dcf.diff(other), [(0x1018, None, 'denotation'),
+                                           (0x2000, None, 'default_value'),
+                                           (0x2000, None, 'denotation')])
+
+        other.set(0x2000, None, 'default_value', '0x20')
+        other.set(0x1018, 1, 'default_value', '0x5')
+        self.assertEqual(other.get(0x2000, None, 'default_value'), '0x20')
+        self.assertEqual(other[0x1018][1].default_value, '0x5')
+        self.assertEqual(dcf.diff(other), [(0x1018, None, 'denotation'),
+                                           (0x1018, 1, 'default_value'),
+                                           (0x2000, None, 'denotation')])
+
+        # setting the base value removes the override
+        other.set(0x1018, 1, 'default_value', self.base[0x1018][1].default_value)
+        other.set(0x1018, None, 'denotation', 'Identity of the node')
+        other.set(0x2000, None, 'denotation', 'Left gain')
+        self.assertEqual(dcf.diff(other), [])
+        self.assertEqual(dcf, other)
+        self.assertEqual(dcf.overrides, other.overrides)
+
+        with self.assertRaises(ValueError):
+            other.set(0x1018, None, 'default_value', '0x1')
+        with self.assertRaises(KeyError):
+            other.set(0x3000, None, 'denotation', 'Missing')
+
+    def test_mismatch(self):
+        self.node[0x3000] = Variable()
+        with self.assertRaises(ValueError):
+            DCFOverlay.from_eds(self.base, self.node)
@@ -1,7 +1,11 @@
+import pickle
 import unittest
+from copy import deepcopy
 
-from eds_utils.core.objects import Variable, Record
+from eds_utils.core import DataType
+from eds_utils.core.objects import Variable, Record, Array
 from eds_utils.core.eds import EDS, EDSError
+from eds_utils.core.changes import ChangeType, Change
 
 
 class TestEDS(unittest.TestCase):
@@ -105,3 +109,336 @@ class TestEDS(unittest.TestCase):
         eds[0x1801]
         eds[0x1A01]
         self.assertEqual(eds.tpdos, 2)
+
+    def test_from_objects(self):
+        indexes = [0x2005, 0x1000, 0x2001, 0x1018]
+
+        eds = EDS.from_objects({i: Variable() for i in indexes})
+        self.assertEqual(eds.indexes, sorted(indexes))
+
+        # add more out of order
+        eds.add_objects([(0x1001, Variable()), (0x3000, Record())])
+        self.assertEqual(eds.indexes, sorted(indexes + [0x1001, 0x3000]))
+
+        # index already exist
+        with self.assertRaises(EDSError):
+            eds.add_objects({0x1000: Variable()})
+
+        # unless replacing
+        var = Variable()
+        eds.add_objects({0x1000: var, 0x1004: Variable()}, replace=True)
+        self.assertIs(eds[0x1000], var)
+        self.assertEqual(eds.indexes, sorted(indexes + [0x1001, 0x1004, 0x3000]))
+
+        # OD stays sorted on appends and inserts
+        eds[0x4000] = Variable()
+        eds.insert(0x1002, None, Variable())
+        eds.copy_object(0x1000, None, 0x1003, None)
+        self.assertEqual(eds.indexes, sorted(eds.indexes))
+
+    def test_fingerprint(self):
+        eds = EDS()
+        eds.add_tpdo()
+        eds[0x2000] = Variable(parameter_name='Var')
+        eds[0x2001] = Array('Values', DataType.UNSIGNED8)
+        eds[0x2001][1] = Variable(data_type=DataType.UNSIGNED8)
+        fingerprint = eds.fingerprint()
+
+        other = deepcopy(eds)
+        self.assertEqual(other.fingerprint(), fingerprint)
+        self.assertEqual(pickle.loads(pickle.dumps(eds)).fingerprint(), fingerprint)
+        self.assertEqual(other, eds)
+
+        # changes in objects, subindexes, and the header all change the fingerprint
+        changes = [
+            lambda e: setattr(e[0x2000], 'default_value', '1'),
+            lambda e: setattr(e[0x2001][1], 'pdo_mapping', True),
+            lambda e: setattr(e[0x2001], 'data_type', DataType.UNSIGNED16),
+            lambda e: e[0x1800].__setitem__(4, Variable()),
+            lambda e: e.remove(0x1A00, 8),
+            lambda e: e.remove(0x2000),
+            lambda e: e.copy_object(0x2000, None, 0x2002, None, move=True),
+            lambda e: setattr(e.device_info, 'vendor_name', 'Vendor'),
+            lambda e: setattr(e, 'comment', 'Comment'),
+        ]
+        for change in changes:
+            other = deepcopy(eds)
+            change(other)
+            self.assertNotEqual(other.fingerprint(), fingerprint)
+            self.assertNotEqual(other, eds)
+
+            # same as a fingerprint from scratch
+            self.assertEqual(other.fingerprint(), deepcopy(other).fingerprint())
+
+        # a removed object is no longer tracked and changing back restores the fingerprint
+        var = eds[0x2000]
+        eds.remove(0x2000)
+        var.parameter_name = 'Changed'
+        eds[0x2000] = Variable(parameter_name='Var')
+        self.assertEqual(eds.fingerprint(), fingerprint)
+
+        # values that compare equal have equal fingerprints
+        eds[0x2000].pdo_mapping = 0
+        self.assertEqual(eds.fingerprint(), fingerprint)
+
+    def test_changes(self):
+        eds = EDS()
+        eds[0x2000] = Variable(parameter_name='Var')
+        rec = Record('Rec')
+        rec[1] = Variable(parameter_name='Sub')
+        eds[0x2001] = rec
+
+        changes = []
+        eds.subscribe(changes.append)
+        checkpoint = eds.checkpoint()
+
+        # field set
+        eds[0x2000].parameter_name = 'Renamed'
+        eds[0x2001][1].default_value = '0x10'
+        self.assertEqual(changes, [
+            Change(ChangeType.SET, 0x2000, None, 'parameter_name', 'Var', 'Renamed'),
+            Change(ChangeType.SET, 0x2001, 1, 'default_value', '', '0x10'),
+        ])
+
+        # insert and remove, sub0 of the record is updated too
+        changes.clear()
+        var = Variable(parameter_name='Sub2')
+        eds.insert(0x2001, 2, var)
+        self.assertEqual(changes[0], Change(ChangeType.INSERT, 0x2001, 2, new=var))
+        self.assertEqual([(c.type, c.subindex, c.field) for c in changes[1:]],
+                         [(ChangeType.SET, 0, 'default_value')])
+        changes.clear()
+        eds.remove(0x2001, 2)
+        self.assertEqual(changes[0], Change(ChangeType.REMOVE, 0x2001, 2, old=var))
+        changes.clear()
+        var = eds[0x2000]
+        eds.remove(0x2000)
+        self.assertEqual(changes, [Change(ChangeType.REMOVE, 0x2000, old=var)])
+
+        # a move is one change and the object is moved, not copied
+        changes.clear()
+        sub = eds[0x2001][1]
+        eds.copy_object(0x2001, 1, 0x2002, None, move=True)
+        self.assertEqual(changes, [Change(ChangeType.MOVE, 0x2002, None, old=(0x2001, 1),
+                                          new=sub)])
+        self.assertIs(eds[0x2002], sub)
+        changes.clear()
+        sub.parameter_name = 'Moved'
+        self.assertEqual(changes[0].index, 0x2002)
+        self.assertIsNone(changes[0].subindex)
+
+        # the journal has everything since the checkpoint
+        self.assertEqual(len(eds.changes_since(checkpoint)), 9)
+        self.assertEqual(eds.changes_since(eds.checkpoint()), [])
+
+        # copies do not share observers or the journal
+        other = deepcopy(eds)
+        self.assertEqual(other.changes_since(checkpoint), [])
+        changes.clear()
+        other[0x2002].parameter_name = 'Copy'
+        self.assertEqual(changes, [])
+        self.assertEqual(other.fingerprint(), deepcopy(other).fingerprint())
+
+        eds.unsubscribe(changes.append)
+        eds.clear_journal()
+        eds[0x2002].parameter_name = 'Unobserved'
+        self.assertEqual(changes, [])
+        with self.assertRaises(ValueError):
+            eds.changes_since(checkpoint)
+
+    def test_snapshot(self):
+        eds = EDS()
+        eds[0x2000] = Variable(parameter_name='Var')
+        rec = Record('Rec')
+        rec[1] = Variable(parameter_name='Sub')
+        eds[0x2001] = rec
+        eds[0x2002] = Variable(parameter_name='Other')
+
+        snapshot = eds.snapshot()
+        self.assertEqual(snapshot, eds)
+        self.assertEqual(snapshot.diff(eds), [])
+
+        # objects are shared until changed
+        self.assertIs(snapshot[0x2002], eds[0x2002])
+        eds[0x2000].parameter_name = 'Renamed'
+        eds[0x2001][1].default_value = '0x10'
+        eds.insert(0x2001, 2, Variable())
+        var = eds[0x2002]
+        eds.remove(0x2002)
+        var.parameter_name = 'Removed'
+        eds[0x2003] = Variable()
+        self.assertEqual(snapshot[0x2000].parameter_name, 'Var')
+        self.assertEqual(snapshot[0x2001][1].default_value, '')
+        self.assertEqual(snapshot[0x2001].subindexes, [0, 1])
+        self.assertEqual(snapshot[0x2002].parameter_name, 'Other')
+        self.assertNotIn(0x2003, snapshot)
+        self.assertNotEqual(snapshot, eds)
+        self.assertEqual(snapshot.diff(eds), [0x2000, 0x2001, 0x2002, 0x2003])
+
+        # a second snapshot only differs in what changed since
+        second = eds.snapshot()
+        eds[0x2000].parameter_name = 'Renamed again'
+        self.assertEqual(second.diff(eds), [0x2000])
+        self.assertEqual(second[0x2000].parameter_name, 'Renamed')
+        self.assertEqual(snapshot[0x2000].parameter_name, 'Var')
+
+        # restore only replaces what changed and does not change the snapshot
+        fingerprint = snapshot.fingerprint()
+        eds.restore(snapshot)
+        self.assertEqual(eds, snapshot)
+        self.assertEqual(eds.fingerprint(), deepcopy(eds).fingerprint())
+        self.assertEqual(snapshot.diff(eds), [])
+        eds[0x2000].parameter_name = 'Changed'
+        self.assertEqual(snapshot.fingerprint(), fingerprint)
+        self.assertEqual(snapshot[0x2000].parameter_name, 'Var')
+
+    def test_queries(self):
+        eds = EDS()
+        eds.add_storage_location('RAM')
+        eds.add_storage_location('ROM')
+        eds[0x2000] = Variable(parameter_name='Temperature', data_type=DataType.INTEGER16,
+                               pdo_mapping=True)
+        rec = Record('Battery  Status')
+        rec[1] = Variable(parameter_name='Voltage', data_type=DataType.UNSIGNED16,
+                          pdo_mapping=True)
+        rec[2] = Variable(parameter_name='Battery Temperature', data_type=DataType.INTEGER32,
+                          pdo_mapping=True)
+        rec.storage_location = 'ROM'
+        eds[0x2001] = rec
+
+        self.assertEqual(eds.objects_in('RAM'), [0x2000])
+        self.assertEqual(eds.objects_in('ROM'), [0x2001])
+        self.assertEqual(eds.of_data_type(DataType.UNSIGNED8), [(0x2001, 0)])
+        self.assertEqual(eds.pdo_mappable(), [(0x2000, None), (0x2001, 1), (0x2001, 2)])
+        self.assertEqual(eds.pdo_mappable(16), [(0x2000, None), (0x2001, 1)])
+        self.assertEqual(eds.find('battery status'), [(0x2001, None)])
+        self.assertEqual(eds.find('TEMPERATURE', partial=True), [(0x2000, None), (0x2001, 2)])
+
+        # the indexes are kept up to date
+        eds[0x2001][1].pdo_mapping = False
+        eds[0x2000].storage_location = 'ROM'
+        eds.insert(0x2001, 3, Variable(parameter_name='Current', data_type=DataType.INTEGER16))
+        eds.remove(0x2001, 2)
+        eds.copy_object(0x2001, 3, 0x2002, None)
+        self.assertEqual(eds.objects_in('RAM'), [])
+        self.assertEqual(eds.objects_in('ROM'), [0x2000, 0x2001, 0x2002])
+        self.assertEqual(eds.pdo_mappable(), [(0x2000, None)])
+        self.assertEqual(eds.of_data_type(DataType.INTEGER16),
+                         [(0x2000, None), (0x2001, 3), (0x2002, None)])
+        self.assertEqual(eds.find('temperature', partial=True), [(0x2000, None)])
+        self.assertEqual(eds.find('current'), [(0x2001, 3), (0x2002, None)])
+
+        # copies make their own indexes
+        other = deepcopy(eds)
+        other.remove(0x2002)
+        self.assertEqual(other.find('current'), [(0x2001, 3)])
+        self.assertEqual(eds.find('current'), [(0x2001, 3), (0x2002, None)])
+
+    def test_range(self):
+        eds = EDS()
+        for index in [0x1000, 0x1001, 0x1008, 0x2000, 0x2100, 0x6000]:
+            eds[index] = Variable()
+        eds.add_rpdo()
+        eds.add_tpdo()
+
+        self.assertEqual(eds.range(0x1400, 0x1600), [0x1400])
+        self.assertEqual(eds.range(0x2000, 0x2100), [0x2000])
+        self.assertEqual(eds.range(0x2001), [0x2100, 0x6000])
+        self.assertEqual(eds.range(0x7000), [])
+        self.assertEqual(eds.mandatory_objects, [0x1000, 0x1001])
+        self.assertEqual(eds.optional_objects, [0x1008, 0x1400, 0x1600, 0x1800, 0x1A00, 0x6000])
+        self.assertEqual(eds.manufacturer_objects, [0x2000, 0x2100])
+        self.assertEqual((eds.rpdos, eds.tpdos), (1, 1))
+
+        # inserts and removes reset the cached lists
+        eds.add_rpdo()
+        eds.remove(0x2000)
+        eds[0x1018] = Record('Identity')
+        eds.copy_object(0x2100, None, 0x3000, None, move=True)
+        self.assertEqual(eds.range(0x1400, 0x1600), [0x1400, 0x1401])
+        self.assertEqual(eds.mandatory_objects, [0x1000, 0x1001, 0x1018])
+        self.assertEqual(eds.manufacturer_objects, [0x3000])
+        self.assertEqual((eds.rpdos, eds.tpdos), (2, 1))
+
+    def test_batch(self):
+        eds = EDS()
+        eds.add_storage_location('RAM')
+        eds.add_storage_location('ROM')
+        arr = Array('Values', DataType.UNSIGNED8)
+        arr[1] = Variable(data_type=DataType.UNSIGNED8)
+        eds[0x3000] = arr
+        fingerprint = eds.fingerprint()
+
+        with eds.batch():
+            for index in range(0x2FFF, 0x2000, -1):
+                eds[index] = Variable()
+            for subindex in range(2, 10):
+                arr[subindex] = Variable(data_type=DataType.UNSIGNED8)
+            del arr[9]
+            arr.data_type = DataType.UNSIGNED16
+            arr.storage_location = 'ROM'
+
+            # deferred to the end of the batch
+            self.assertEqual(arr[0].default_value, '0x01')
+            self.assertEqual(arr[1].data_type, DataType.UNSIGNED8)
+            self.assertEqual(eds.range(0x2000, 0x2003), [0x2001, 0x2002])
+
+        self.assertEqual(eds.indexes, sorted(eds.indexes))
+        self.assertEqual(len(eds), 0x1000)
+        self.assertEqual(arr[0].default_value, '0x08')
+        self.assertEqual({arr[i].data_type for i in arr.subindexes[1:]}, {DataType.UNSIGNED16})
+        self.assertEqual({arr[i].storage_location for i in arr.subindexes}, {'ROM'})
+        self.assertEqual(eds.fingerprint(), deepcopy(eds).fingerprint())
+
+        # everything is undone on a exception
+        before = deepcopy(eds)
+        with self.assertRaises(KeyError):
+            with eds.batch():
+                eds[0x1000] = Variable()
+                eds.remove(0x2001)
+                arr[10] = Variable(data_type=DataType.UNSIGNED16)
+                arr.data_type = DataType.UNSIGNED32
+                with eds.batch():
+                    eds[0x3000][1].parameter_name = 'Changed'
+                    eds[0x9999]
+        self.assertEqual(eds, before)
+        self.assertEqual(eds.indexes, before.indexes)
+        self.assertEqual(eds[0x3000][0].default_value, '0x08')
+        self.assertEqual(eds[0x3000][1].data_type, DataType.UNSIGNED16)
+        self.assertEqual(eds.fingerprint(), deepcopy(eds).fingerprint())
+        self.assertNotEqual(eds.fingerprint(), fingerprint)
+
+    def test_pickle(self):
+        eds = EDS()
+        eds.add_storage_location('ROM')
+        eds.add_tpdo()
+        eds[0x2000] = Variable(parameter_name='Var', denotation='Node 5', pdo_mapping=True,
+                               data_type=DataType.OCTET_STRING, default_value=b'\x01\x02')
+        eds[0x2001] = Array('Values', DataType.UNSIGNED8)
+        eds[0x2001][1] = Variable(data_type=DataType.UNSIGNED8, default_value='0x10')
+        eds[0x2002] = Array('Empty')
+        eds[0x2001].storage_location = 'ROM'
+        fingerprint = eds.fingerprint()
+
+        copy = pickle.loads(pickle.dumps(eds))
+        self.assertEqual(copy, eds)
+        self.assertEqual(copy.indexes, eds.indexes)
+        self.assertEqual(copy.fingerprint(), fingerprint)
+        self.assertEqual(copy.storage_locations, eds.storage_locations)
+        self.assertEqual(copy[0x2000].value, b'\x01\x02')
+        self.assertIsNone(copy[0x2002].data_type)
+        self.assertEqual(copy.tpdos, eds.tpdos)
+
+        # the objects are owned by the copy
+        changes = []
+        copy.subscribe(changes.append)
+        copy[0x2001][1].default_value = '0x20'
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(eds[0x2001][1].default_value, '0x10')
+        self.assertNotEqual(copy.fingerprint(), fingerprint)
+
+        # the enums are pickled as ints
+        state = eds[0x2000].__getstate__()
+        self.assertEqual(state[3], DataType.OCTET_STRING.value)
+        self.assertNotIsInstance(state[3], DataType)
+        self.assertEqual(pickle.loads(pickle.dumps(eds[0x2001])), eds[0x2001])
@@ -0,0 +1,85 @@
+import pickle
+import unittest
+from copy import deepcopy
+
+from eds_utils.core import DataType
+from eds_utils.core.objects import Variable, Array
+from eds_utils.core.eds import EDS
+from eds_utils.core.fleet import FleetStore, shared_memory
+
+
+def _make_eds() -> EDS:
+    '''Make a small eds with variables and a array'''
+
+    eds = EDS()
+    eds[0x1000] = Variable(parameter_name='Device type')
+    eds[0x1001] = Variable(parameter_name='Error register', data_type=DataType.UNSIGNED8)
+    eds.add_tpdo()
+
+    arr = Array('Values', DataType.UNSIGNED16)
+    for i in range(1, 4):
+        arr[i] = Variable(parameter_name=f'Value {i}', data_type=DataType.UNSIGNED16,
+                          pdo_mapping=True)
+    eds[0x2000] = arr
+
+    return eds
+
+
+@unittest.skipIf(shared_memory is None, 'requires Python 3.8 or newer')
+class TestFleetStore(unittest.TestCase):
+
+    def setUp(self):
+        self.base = _make_eds()
+        self.node = deepcopy(self.base)
+        self.node.device_commissioning.node_id = 5
+        self.node[0x2000][1].default_value = '0x10'
+        self.node[0x2001] = Variable(parameter_name='Extra ünïcode')
+
+        self.fleet = FleetStore.create({'base': self.base, 'node 5': self.node})
+
+    def tearDown(self):
+        self.fleet.close()
+
+    def test_queries(self):
+        fleet = self.fleet
+        self.assertEqual(fleet.names, ['base', 'node 5'])
+        self.assertEqual(len(fleet), 2)
+        self.assertIn('node 5', fleet)
+        with self.assertRaises(KeyError):
+            fleet['node 6']
+
+        for name, eds in (('base', self.base), ('node 5', self.node)):
+            od = fleet[name]
+            self.assertEqual(od.indexes, eds.indexes)
+            self.assertEqual(od.subindexes(0x2000), eds[0x2000].subindexes)
+            self.assertEqual(od.to_eds(), eds)
+            self.assertEqual(od.device_commissioning, eds.device_commissioning)
+
+        node = fleet['node 5']
+        self.assertEqual(node.view(0x2000, 1).default_value, '0x10')
+        self.assertEqual(node.select(parameter_name='Extra ünïcode'), [(0x2001, None)])
+        self.assertEqual(node.select(parameter_name='Missing'), [])
+        self.assertEqual(node.count(pdo_mapping=True, data_type=DataType.UNSIGNED16), 3)
+        self.assertEqual(node.tpdos, 1)
+
+        # the strings are shared by the ODs
+        self.assertEqual(len(fleet.strings), len(set(fleet.strings)))
+
+        # read-only
+        with self.assertRaises(TypeError):
+            node.view(0x2000, 1).default_value = '0x20'
+
+    def test_attach(self):
+        other = FleetStore.attach(self.fleet.name)
+        self.assertEqual(other['node 5'].to_eds(), self.node)
+        other.close()
+
+        # a pickle only has the name and attaches to the shared memory
+        data = pickle.dumps(self.fleet)
+        self.assertLess(len(data), 200)
+        other = pickle.loads(data)
+        self.assertEqual(other.names, self.fleet.names)
+        other.close()
+
+        with self.assertRaises(FileNotFoundError):
+            FleetStore.attach(self.fleet.name + 'x')
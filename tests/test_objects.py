@@ -1,7 +1,88 @@
+import pickle
 import unittest
+import tracemalloc
+from copy import deepcopy
 
-from eds_utils.core import DataType
+from eds_utils.core import DataType, pdo_mapping_fields
 from eds_utils.core.objects import Variable, Record, Array
+from eds_utils.core.value import NodeIdValue, parse_value
+
+
+class TestVariable(unittest.TestCase):
+
+    def test_typed_values(self):
+
+        var = Variable(default_value='0x10', low_limit='1', high_limit='0x7F')
+        self.assertEqual((var.value, var.low_limit_value, var.high_limit_value), (16, 1, 127))
+
+        # the text is kept as is
+        self.assertEqual(var.default_value, '0x10')
+
+        # changing a value or the data type invalidates the cached values
+        var.default_value = '$NODEID + 0x180'
+        self.assertEqual(var.value, NodeIdValue(0x180))
+        self.assertEqual(var.value.resolve(5), 0x185)
+        var.default_value = '01 02 AB'
+        var.data_type = DataType.OCTET_STRING
+        self.assertEqual(var.value, b'\x01\x02\xab')
+        self.assertEqual(var.low_limit_value, '1')  # not valid hex
+        var.data_type = DataType.VISIBLE_STRING
+        self.assertEqual(var.value, '01 02 AB')
+
+        # the cached values are not part of equality
+        other = Variable(default_value='01 02 AB', low_limit='1', high_limit='0x7F',
+                         data_type=DataType.VISIBLE_STRING)
+        self.assertEqual(var, other)
+        self.assertEqual(pickle.loads(pickle.dumps(var)).value, '01 02 AB')
+
+    def test_binary_values(self):
+
+        data = bytearray(b'\x01\x02\xab')
+        var = Variable(data_type=DataType.OCTET_STRING, default_value=memoryview(data))
+        data[0] = 0xFF  # a copy is stored
+
+        # kept as bytes, only formatted as hex text when read
+        self.assertEqual(var.default_value, '01 02 AB')
+        value = var.value
+        self.assertEqual(value, b'\x01\x02\xab')
+        self.assertIs(deepcopy(var).value, value)
+
+        # the format of the hex text does not matter
+        other = Variable(data_type=DataType.OCTET_STRING, default_value='0102ab')
+        self.assertEqual(var, other)
+        self.assertEqual(var.digest(), other.digest())
+        self.assertEqual(pickle.loads(pickle.dumps(var)), var)
+
+        # other data types get the hex text
+        var.data_type = DataType.DOMAIN
+        self.assertIs(var.value, value)
+        self.assertEqual(var, Variable(data_type=DataType.DOMAIN, default_value='01 02 AB'))
+        var.data_type = DataType.VISIBLE_STRING
+        self.assertEqual(var.value, '01 02 AB')
+
+    def test_parse_value(self):
+
+        self.assertIsNone(parse_value('', DataType.UNSIGNED8))
+        self.assertEqual(parse_value('-12', DataType.INTEGER8), -12)
+        self.assertEqual(parse_value('1.5', DataType.REAL32), 1.5)
+        self.assertEqual(parse_value('', DataType.DOMAIN), None)
+        self.assertEqual(parse_value('0x180+$NODEID', DataType.UNSIGNED32), NodeIdValue(0x180))
+        self.assertEqual(parse_value('$NODEID', DataType.UNSIGNED8), NodeIdValue(0))
+        self.assertEqual(str(NodeIdValue(0x180)), '$NODEID+0x180')
+        self.assertEqual(parse_value('$NODEID', DataType.VISIBLE_STRING), '$NODEID')
+
+        # invalid values are kept as text
+        self.assertEqual(parse_value('abc', DataType.UNSIGNED8), 'abc')
+        self.assertEqual(parse_value('0xZZ', DataType.OCTET_STRING), '0xZZ')
+        self.assertEqual(parse_value('$NODEID+abc', DataType.UNSIGNED8), '$NODEID+abc')
+
+    def test_pdo_mapping_fields(self):
+
+        self.assertEqual(pdo_mapping_fields('0x60000108'), (0x6000, 1, 8))
+        self.assertEqual(pdo_mapping_fields(0x60000108), (0x6000, 1, 8))
+        for value in ['0x6000108', 0x100000000, -1, None, b'\x00', True]:
+            with self.assertRaises(ValueError):
+                pdo_mapping_fields(value)
 
 
 class TestRecord(unittest.TestCase):
@@ -35,6 +116,14 @@ class TestRecord(unittest.TestCase):
         self.assertEqual(len(rec), 4)
         self.assertEqual(rec[0].default_value, '0x04')
 
+        # fill in the empty space, subindexes stay ordered
+        rec[3] = Variable()
+        self.assertEqual(rec.subindexes, [0, 1, 2, 3, 4])
+        self.assertEqual(rec[0].default_value, '0x04')
+        self.assertIs(rec.subindexes, rec.subindexes)
+        self.assertIn(3, rec)
+        self.assertNotIn(5, rec)
+
     def test_remove(self):
 
         rec = Record()
@@ -122,3 +211,38 @@ class TestArray(unittest.TestCase):
                 self.assertEqual(arr[i].data_type, DataType.UNSIGNED8)
             else:
                 self.assertEqual(arr[i].data_type, arr.data_type)
+
+
+class TestMemory(unittest.TestCase):
+
+    COUNT = 1000
+
+    def _bytes_per_object(self, make) -> float:
+        tracemalloc.start()
+        try:
+            objs = [make() for _ in range(self.COUNT)]
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(len(objs), self.COUNT)
+        return size / self.COUNT
+
+    def test_variable(self):
+        # the fields, the typed value cache, and the owner (for change tracking)
+        self.assertLessEqual(self._bytes_per_object(Variable), 160)
+
+        var = Variable(parameter_name='Var', data_type=DataType.UNSIGNED8)
+        with self.assertRaises(AttributeError):
+            var.foo = 1
+        self.assertEqual(deepcopy(var), var)
+        self.assertEqual(pickle.loads(pickle.dumps(var)), var)
+        self.assertNotEqual(var, Variable(parameter_name='Var'))
+
+    def test_record(self):
+        self.assertLessEqual(self._bytes_per_object(Record), 560)
+        self.assertLessEqual(self._bytes_per_object(Array), 568)
+
+        rec = Record()
+        rec[1] = Variable()
+        self.assertEqual(pickle.loads(pickle.dumps(rec)), rec)
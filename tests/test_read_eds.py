@@ -0,0 +1,570 @@
+import io
+import os
+import asyncio
+import pickle
+import zipfile
+import unittest
+from copy import deepcopy
+from tempfile import TemporaryDirectory
+
+from eds_utils.core import DataType
+from eds_utils.core.diagnostic import Severity, Diagnostic
+from eds_utils.core.objects import Variable, Record
+from eds_utils.core.eds import EDS
+from eds_utils.core.file_io.read_eds import ReadMode, read_eds, read_many
+from eds_utils.core.file_io.read_eds_lazy import read_eds_lazy
+from eds_utils.core.file_io.read_eds_incremental import IncrementalReader
+from eds_utils.core.file_io.eds_cache import EDSCache, read_eds_cached
+from eds_utils.core.file_io.write_eds import write_eds
+from eds_utils.core.file_io.archive import expand_archives
+from eds_utils.core.file_io.async_io import AsyncEDSIO, aread_eds, awrite_eds
+from eds_utils.core.file_io.read_xdd import read_xdd
+
+
+def _make_eds() -> EDS:
+    '''Make a small eds with a variable, a record, and a octet string'''
+
+    eds = EDS()
+    eds[0x1000] = Variable(parameter_name='Device type')
+    eds[0x1001] = Variable(parameter_name='Error register', data_type=DataType.UNSIGNED8)
+    rec = Record('Identity')
+    rec[1] = Variable(parameter_name='Vendor-ID')
+    eds[0x1018] = rec
+    eds[0x2000] = Variable(parameter_name='Octets', data_type=DataType.OCTET_STRING,
+                           default_value='01 02 AB')
+    eds[0x2001] = Variable(parameter_name='Equation', data_type=DataType.VISIBLE_STRING,
+                           default_value='a=b')
+    eds[0x2001].comments = 'a comment\nanother comment'
+
+    return eds
+
+
+class TestReadEDS(unittest.TestCase):
+
+    def setUp(self):
+        self.eds = _make_eds()
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'test.eds')
+        write_eds(self.eds, self.file_path)
+
+        with open(self.file_path, 'r') as fptr:
+            self.raw = fptr.read()
+
+        self.expected, self.expected_errors = read_eds(self.file_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_path(self):
+        self.assertEqual(self.expected.indexes, self.eds.indexes)
+        self.assertEqual(self.expected[0x1018].subindexes, self.eds[0x1018].subindexes)
+        self.assertEqual(self.expected[0x2000].default_value, '01 02 AB')
+        self.assertEqual(self.expected[0x2001].default_value, 'a=b')
+        self.assertEqual(self.expected[0x2001].comments, 'a comment\nanother comment')
+
+    def test_file_object(self):
+        eds, errors = read_eds(io.StringIO(self.raw))
+        self.assertEqual(eds, self.expected)
+        self.assertEqual(errors, self.expected_errors)
+
+    def test_crlf(self):
+        eds, errors = read_eds(io.StringIO(self.raw.replace('\n', '\r\n'), newline=''))
+        self.assertEqual(eds, self.expected)
+        self.assertEqual(errors, self.expected_errors)
+
+    def test_single_newline_sections(self):
+        eds, errors = read_eds(io.StringIO(self.raw.replace('\n\n', '\n')))
+        self.assertEqual(eds, self.expected)
+        self.assertEqual(errors, self.expected_errors)
+
+    def test_orphan_subindex(self):
+        raw = self.raw + '[3000sub1]\nParameterName=Orphan\nDataType=0x0007\nAccessType=rw\n'
+        eds, errors = read_eds(io.StringIO(raw))
+        self.assertEqual(eds, self.expected)
+        self.assertEqual(len(errors), len(self.expected_errors) + 1)
+
+    def test_diagnostics(self):
+        raw = self.raw + '[3000]\nParameterName=Bad\nAccessType=rw\nDataType=0x0099\n' \
+            'Foo=1\n'
+        line = raw.count('\n', 0, raw.index('[3000]')) + 1
+        _, errors = read_eds(io.StringIO(raw))
+
+        new = [i for i in errors if i.section == '[3000]']
+        self.assertEqual(new, [
+            Diagnostic('invalid-value', Severity.AUTO_FIXED, '[3000]', 'DataType', line + 3, 10,
+                       value='0x0099'),
+            Diagnostic('unknown-entry', Severity.AUTO_FIXED, '[3000]', 'Foo', line + 4, 1),
+        ])
+        self.assertEqual(str(new[1]), 'AUTO-FIXED: Unknown entry "Foo" in [3000]')
+        self.assertEqual(new[0].to_dict()['line'], line + 3)
+
+        # lazy reader finds the same lines
+        file_path = os.path.join(self.tmp_dir.name, 'bad.eds')
+        with open(file_path, 'w') as fptr:
+            fptr.write(raw)
+        eds, lazy_errors = read_eds_lazy(file_path)
+        eds[0x3000]
+        self.assertEqual([i for i in lazy_errors if i.section == '[3000]'], new)
+
+    def test_default_storage_location(self):
+        # only 0x1000 has a storage location, so it's the default for the rest
+        raw = self.raw.replace('[1000]\n', '[1000]\n;StorageLocation=RAM\n')
+        eds, errors = read_eds(io.StringIO(raw))
+
+        self.assertTrue(eds.canopennode)
+        self.assertEqual(eds[0x1018].storage_location, 'RAM')
+        self.assertEqual(eds[0x1018][1].storage_location, 'RAM')
+        self.assertEqual([i.section for i in errors if i.code == 'storage-location-mismatch'],
+                         ['[1018sub0]', '[1018sub1]'])
+
+    def test_pdo_mapping_missing_object(self):
+        self.eds.add_tpdo()
+        self.eds[0x1A00][1].default_value = '0x30000020'  # no 0x3000
+        self.eds[0x1A00][2].default_value = '0x10180520'  # no 0x1018 sub 5
+        self.eds[0x1A00][3].default_value = '0x10180120'
+        write_eds(self.eds, self.file_path)
+
+        eds, errors = read_eds(self.file_path)
+        errors = [i for i in errors if i.code == 'pdo-mapping-missing-object']
+        self.assertEqual([i.args['subindex'] for i in errors], [1, 2])
+        self.assertEqual(errors[0].severity, Severity.ERROR)
+        self.assertEqual(str(errors[0]), 'ERROR: TPDO 0 mapping value at subindex 0x01 maps '
+                         '0x30000020, which does not exist')
+        self.assertEqual(eds[0x1A00][1].default_value, '0x30000020')
+
+    def test_min_severity(self):
+        raw = self.raw.replace('DefaultValue=01 02 AB', 'DefaultValue=XYZ')
+        _, errors = read_eds(io.StringIO(raw), Severity.ERROR)
+        self.assertEqual([i.code for i in errors], ['invalid-value'])
+        self.assertEqual(errors[0].severity, Severity.ERROR)
+
+    def test_modes(self):
+        eds, errors = read_eds(io.StringIO(self.raw), mode='raw')
+        self.assertEqual(eds, self.expected)
+        self.assertEqual(errors, [])
+
+        raw = self.raw.replace('DefaultValue=01 02 AB', 'DefaultValue=0102AB') + \
+            '[3000]\nParameterName=Bad\nDataType=0x0007\nAccessType=rw\nFoo=1\n'
+        fixed, fix_errors = read_eds(io.StringIO(raw), mode=ReadMode.FIX)
+        self.assertEqual(fixed[0x2000].default_value, '01 02 AB')
+        self.assertIn('unknown-entry', [i.code for i in fix_errors])
+
+        # validate reports the same, but does not fix anything
+        eds, errors = read_eds(io.StringIO(raw), mode=ReadMode.VALIDATE)
+        self.assertEqual(eds[0x2000].default_value, '0102AB')
+        self.assertEqual(errors, fix_errors)
+
+        # raw just loads it
+        eds, errors = read_eds(io.StringIO(raw), mode=ReadMode.RAW)
+        self.assertEqual(eds[0x2000].default_value, '0102AB')
+        self.assertEqual(eds[0x3000].parameter_name, 'Bad')
+        self.assertEqual(errors, [])
+
+
+class TestReadEDSLazy(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'test.eds')
+        write_eds(_make_eds(), self.file_path)
+
+        self.expected, _ = read_eds(self.file_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_lazy_load(self):
+        eds, errors = read_eds_lazy(self.file_path)
+
+        self.assertEqual(eds.indexes, self.expected.indexes)
+        self.assertEqual(len(eds), len(self.expected))
+        self.assertEqual(eds.file_info, self.expected.file_info)
+        self.assertEqual(eds.device_info, self.expected.device_info)
+
+        # only the accessed objects are read in
+        self.assertEqual(eds[0x2001], self.expected[0x2001])
+        self.assertEqual(eds[0x2001].comments, 'a comment\nanother comment')
+        self.assertEqual(eds[0x1018], self.expected[0x1018])
+        self.assertIn(0x2000, eds._pending)
+        self.assertNotIn(0x1018, eds._pending)
+
+        # the object lists only need the indexes
+        self.assertEqual(eds.manufacturer_objects, self.expected.manufacturer_objects)
+        self.assertEqual(eds.range(0x1000, 0x2000), self.expected.range(0x1000, 0x2000))
+        self.assertIn(0x2000, eds._pending)
+
+        # anything needing the whole OD reads in the rest
+        self.assertEqual(eds.fingerprint(), self.expected.fingerprint())
+        self.assertEqual(eds._pending, {})
+        self.assertEqual(eds, self.expected)
+        self.assertEqual(errors, [])
+
+    def test_deepcopy(self):
+        eds, _ = read_eds_lazy(self.file_path)
+        eds[0x2001]
+
+        # reads in everything, the file is not copied
+        copy = deepcopy(eds)
+        self.assertEqual(copy, self.expected)
+        self.assertEqual(eds._pending, {})
+        self.assertIsNone(copy._fptr)
+        copy[0x2001].parameter_name = 'Changed'
+        self.assertEqual(eds[0x2001], self.expected[0x2001])
+
+    def test_default_storage_location(self):
+        with open(self.file_path) as fptr:
+            raw = fptr.read()
+        with open(self.file_path, 'w') as fptr:
+            fptr.write(raw.replace('[1000]\n', '[1000]\n;StorageLocation=RAM\n'))
+
+        expected, expected_errors = read_eds(self.file_path)
+        eds, errors = read_eds_lazy(self.file_path)
+        self.assertEqual(eds[0x1018], expected[0x1018])
+        self.assertEqual([i for i in errors if i.code == 'storage-location-mismatch'],
+                         [i for i in expected_errors if i.code == 'storage-location-mismatch'])
+        self.assertEqual(len(errors), 2)
+
+    def test_insert(self):
+        eds, _ = read_eds_lazy(self.file_path)
+        eds.load_all()
+
+        # the OD stays sorted after everything is read in
+        eds[0x1800] = Variable(parameter_name='Inserted')
+        self.expected[0x1800] = Variable(parameter_name='Inserted')
+        self.assertEqual(eds.indexes, self.expected.indexes)
+        self.assertEqual(eds.indexes, sorted(eds.indexes))
+        self.assertEqual(eds, self.expected)
+
+    def test_pickle(self):
+        eds, _ = read_eds_lazy(self.file_path)
+        eds[0x2001]
+
+        copy = pickle.loads(pickle.dumps(eds))
+        self.assertIsInstance(copy, type(eds))
+        self.assertEqual(copy, self.expected)
+        self.assertEqual(copy[0x1018][1].parameter_name, 'Vendor-ID')
+        self.assertIsNone(copy._fptr)
+
+    def test_duplicate_header(self):
+        with open(self.file_path) as fptr:
+            raw = fptr.read()
+        raw += '[2001]\nParameterName=Duplicate\nDataType=0x0007\nAccessType=rw\n'
+        with open(self.file_path, 'w') as fptr:
+            fptr.write(raw)
+
+        # the first one is kept, like read_eds
+        expected, expected_errors = read_eds(self.file_path)
+        eds, errors = read_eds_lazy(self.file_path)
+        self.assertEqual(eds[0x2001], expected[0x2001])
+        self.assertEqual(eds, expected)
+        self.assertEqual([i for i in errors if i.code == 'duplicate-header'],
+                         [i for i in expected_errors if i.code == 'duplicate-header'])
+        self.assertEqual(len(errors), 1)
+
+
+class TestIncrementalReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'test.eds')
+
+        eds = _make_eds()
+        eds.add_tpdo()
+        eds[0x1A00][1].default_value = '0x20000120'  # map 0x2000, wrong size
+        write_eds(eds, self.file_path)
+
+        with open(self.file_path, 'r') as fptr:
+            self.raw = fptr.read()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, raw: str):
+        with open(self.file_path, 'w') as fptr:
+            fptr.write(raw)
+
+    def _check(self, reader: IncrementalReader) -> tuple:
+        eds, errors = reader.read()
+        expected, expected_errors = read_eds(self.file_path)
+
+        self.assertEqual(eds, expected)
+        self.assertEqual([(i, i.line) for i in errors],
+                         [(i, i.line) for i in expected_errors])
+
+        return eds, errors
+
+    def test_reread(self):
+        reader = IncrementalReader(self.file_path)
+        eds, _ = self._check(reader)
+        rec = eds[0x1018]
+        var = eds[0x2001]
+
+        # one changed object, the rest are left as is
+        self._write(self.raw.replace('ParameterName=Equation', 'ParameterName=Formula'))
+        eds2, _ = self._check(reader)
+        self.assertIs(eds2, eds)
+        self.assertIs(eds[0x1018], rec)
+        self.assertIsNot(eds[0x2001], var)
+        self.assertEqual(eds[0x2001].parameter_name, 'Formula')
+
+        # lines added above move the diagnostics of unchanged sections
+        raw = self.raw.replace('[1000]', '[3000]\nParameterName=New\nDataType=0x0007\n'
+                               'AccessType=rw\n\n[1000]')
+        self._write(raw.replace('[1018]\n', '[1018]\nFoo=1\n'))
+        self._check(reader)
+        self._write(raw.replace('[1018]\n', '\n[1018]\nFoo=1\n'))
+        self._check(reader)
+        self.assertIs(eds[0x3000], reader.read()[0][0x3000])
+
+        # removed objects
+        self._write(self.raw.replace('[2001]', '[2002]'))
+        self._check(reader)
+
+    def test_default_storage_location(self):
+        # only 0x1000 has a storage location, so it's the default for the objects below it
+        self._write(self.raw.replace('[1000]\n', '[1000]\n;StorageLocation=RAM\n'))
+        reader = IncrementalReader(self.file_path)
+        _, errors = self._check(reader)
+        self.assertIn('[1018sub1]',
+                      [i.section for i in errors if i.code == 'storage-location-mismatch'])
+
+        # 0x1018 is above the first storage location, so it has no default when it's read
+        self._write(self.raw.replace('[2000]\n', '[2000]\n;StorageLocation=RAM\n'))
+        _, errors = self._check(reader)
+        self.assertNotIn('storage-location-mismatch', [i.code for i in errors])
+
+        # and then below it again, with the same storage locations
+        self._write(self.raw.replace('[1000]\n', '[1000]\n;StorageLocation=RAM\n')
+                    .replace('[2000]\n', '[2000]\n;StorageLocation=RAM\n'))
+        _, errors = self._check(reader)
+        self.assertIn('storage-location-mismatch', [i.code for i in errors])
+
+    def test_pdo_mapping(self):
+        reader = IncrementalReader(self.file_path)
+        eds, errors = self._check(reader)
+        self.assertEqual(eds[0x1A00][1].default_value, '0x20000100')
+        self.assertIn('pdo-mapping-size', [i.code for i in errors])
+
+        # a mapped object changing size re-does the fix on the unchanged mapping
+        lines = self.raw.split('\n')
+        i = lines.index('[2000]') + 1
+        while not lines[i].startswith('DataType='):
+            i += 1
+        lines[i] = 'DataType=0x0007'
+        self._write('\n'.join(lines))
+        eds, _ = self._check(reader)
+        self.assertEqual(eds[0x1A00][1].default_value, '0x20000120')
+
+
+class TestEDSCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'test.eds')
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        write_eds(_make_eds(), self.file_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_cache(self):
+        cache = EDSCache(self.cache_dir)
+        expected = read_eds(self.file_path)
+
+        self.assertEqual(cache.read_eds(self.file_path), expected)  # cold
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertEqual(cache.read_eds(self.file_path), expected)  # warm
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        # a changed file is a new entry
+        with open(self.file_path, 'a') as fptr:
+            fptr.write('\n[2002]\nParameterName=New\nDataType=0x0007\nAccessType=rw\n')
+        eds, _ = cache.read_eds(self.file_path)
+        self.assertIn(0x2002, eds.indexes)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_eviction(self):
+        cache = EDSCache(self.cache_dir, max_size=0)
+        cache.read_eds(self.file_path)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_opt_in(self):
+        self.assertEqual(read_eds_cached(self.file_path), read_eds(self.file_path))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+        read_eds_cached(self.file_path, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+
+class TestReadMany(unittest.TestCase):
+
+    def test_read_many(self):
+        with TemporaryDirectory() as tmp_dir:
+            file_paths = []
+            for i in range(3):
+                file_path = os.path.join(tmp_dir, f'test{i}.eds')
+                eds = _make_eds()
+                eds[0x3000 + i] = Variable()
+                write_eds(eds, file_path)
+                file_paths.append(file_path)
+
+            for workers in [1, 2]:
+                results = list(read_many(file_paths, workers))
+                self.assertEqual(sorted(i[0] for i in results), file_paths)
+
+                for file_path, eds, errors in results:
+                    self.assertEqual((eds, errors), read_eds(file_path))
+
+
+class TestAsyncIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'test.eds')
+        self.eds = _make_eds()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_write(self):
+        async def main():
+            await awrite_eds(self.eds, self.file_path)
+            return await asyncio.gather(*[aread_eds(self.file_path) for _ in range(8)])
+
+        for eds, errors in asyncio.run(main()):
+            self.assertEqual((eds, errors), read_eds(self.file_path))
+
+    def test_cancel(self):
+        write_eds(self.eds, self.file_path)
+        with open(self.file_path) as fptr:
+            raw = fptr.read()
+        big = raw + ''.join(f'[{i:X}]\nParameterName=Var\nDataType=0x0007\nAccessType=rw\n\n'
+                            for i in range(0x3000, 0x9000))
+
+        async def main(eds_io):
+            running = asyncio.ensure_future(eds_io.read_eds(io.StringIO(big)))
+            waiting = asyncio.ensure_future(eds_io.read_eds(self.file_path))
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiting.done())  # backpressure, only 1 at a time
+
+            for task in [waiting, running]:
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+            return await eds_io.read_eds(self.file_path)  # the cancelled ones let go
+
+        with AsyncEDSIO(max_workers=1) as eds_io:
+            self.assertEqual(asyncio.run(main(eds_io)), read_eds(self.file_path))
+
+
+class TestXDD(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        file_path = os.path.join(self.tmp_dir.name, 'test.eds')
+        write_eds(_make_eds(), file_path)
+        self.eds, _ = read_eds(file_path)
+
+        # comments are not part of XDD/XDC files
+        self.eds[0x2001].comments = ''
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_xdd(self):
+        file_path = os.path.join(self.tmp_dir.name, 'test.xdd')
+        write_eds(self.eds, file_path)
+
+        eds, errors = read_xdd(file_path)
+        self.assertEqual(eds, self.eds)
+        self.assertEqual(errors, [])
+        self.assertEqual((eds, errors), read_eds(file_path))
+        self.assertEqual(eds.file_info.file_name, 'test.xdd')
+
+    def test_xdc(self):
+        self.eds[0x1000].denotation = 'Node 5 & co'
+        self.eds.device_commissioning.node_id = 5
+        file_path = os.path.join(self.tmp_dir.name, 'test.xdd.gz')
+        write_eds(self.eds, file_path, dcf=True)  # forced to a xdc
+
+        file_path = os.path.join(self.tmp_dir.name, 'test.xdc.gz')
+        eds, errors = read_eds(file_path)
+        self.assertEqual(eds, self.eds)
+        self.assertEqual(eds[0x1000].denotation, 'Node 5 & co')
+        self.assertEqual(eds.device_commissioning.node_id, 5)
+
+    def test_async(self):
+        file_path = os.path.join(self.tmp_dir.name, 'test.xdd')
+
+        async def main():
+            await awrite_eds(self.eds, file_path)
+            return await aread_eds(file_path)
+
+        eds, errors = asyncio.run(main())
+        self.assertEqual(eds, self.eds)
+        self.assertEqual(errors, [])
+        self.assertEqual((eds, errors), read_xdd(file_path))
+
+    def test_diagnostics(self):
+        raw = '<ISO15745ProfileContainer><CANopenObjectList>' \
+            '<CANopenObject index="1000" name="A" dataType="0099" accessType="ro"/>' \
+            '<CANopenObject index="1000" name="B" dataType="0007" accessType="ro"/>' \
+            '</CANopenObjectList></ISO15745ProfileContainer>'
+        eds, errors = read_xdd(io.StringIO(raw))
+        self.assertEqual(eds[0x1000].parameter_name, 'A')
+        self.assertEqual([i.code for i in errors], ['invalid-value', 'duplicate-header'])
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'test.eds')
+        write_eds(_make_eds(), self.file_path)
+
+        self.expected, self.expected_errors = read_eds(self.file_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_compressed(self):
+        for ext in ['.gz', '.xz', '.bz2']:
+            file_path = self.file_path + ext
+            write_eds(self.expected, file_path)
+
+            with open(file_path, 'rb') as fptr:
+                self.assertNotIn(b'[FileInfo]', fptr.read())
+
+            eds, errors = read_eds(file_path)
+            self.assertEqual(eds, self.expected)
+            self.assertEqual(errors, self.expected_errors)
+            self.assertEqual(eds.file_info.file_name, 'test.eds')
+
+    def test_compressed_dcf(self):
+        write_eds(self.expected, self.file_path + '.gz', dcf=True)
+
+        eds, _ = read_eds(os.path.join(self.tmp_dir.name, 'test.dcf.gz'))
+        self.assertEqual(eds.file_info.file_name, 'test.dcf')
+        self.assertEqual(eds.file_info.last_eds, 'test.eds')
+
+    def test_zip(self):
+        zip_path = os.path.join(self.tmp_dir.name, 'bundle.zip')
+        for name in ['a.eds', 'b/c.dcf']:
+            write_eds(self.expected, f'{zip_path}/{name}')
+
+        with zipfile.ZipFile(zip_path, 'a') as archive:
+            archive.writestr('README.txt', 'not a eds')
+
+        with self.assertRaises(FileExistsError):
+            write_eds(self.expected, f'{zip_path}/a.eds')
+
+        file_paths = expand_archives([zip_path, self.file_path])
+        self.assertEqual(file_paths, [f'{zip_path}/a.eds', f'{zip_path}/b/c.dcf',
+                                      self.file_path])
+
+        for workers in [1, 2]:
+            results = {path: eds for path, eds, _ in read_many([zip_path], workers)}
+            self.assertEqual(sorted(results), file_paths[:2])
+            self.assertEqual(results[file_paths[0]], self.expected)
+            self.assertEqual(results[file_paths[1]].file_info.file_name, 'c.dcf')